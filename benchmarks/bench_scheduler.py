@@ -0,0 +1,236 @@
+"""
+Benchmarks for Event and Recurring schedulers.
+
+Measures, per scheduler, mode and number of jobs:
+    - latency : actual start of the target - scheduled fire time (ms),
+                as percentiles, and jitter (standard deviation)
+    - rss_per_job_kb : resident memory of the scheduler (and its child
+                       processes) divided by the number of jobs
+    - idle_cpu_percent : CPU used by the scheduler while no job is due
+                         (recurring: the same jobs every hour, once they
+                         have all fired)
+    - run_seconds : time taken by run() to bring all jobs up
+    - all_fired_seconds : time from run() until every job has fired once
+                          (for events this includes waiting for the minute)
+    - throughput_per_second : runs completed per second while the
+                              dispatcher drains a backlog of --runs
+                              run_job_now() runs of short jobs
+
+Linux only (reads /proc). Results are written as JSON, eg.
+
+    python benchmarks/bench_scheduler.py --sizes 10,1000,10000 \\
+                                         --output bench_results.json
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+from time import time, sleep, monotonic
+from functools import partial
+from statistics import pstdev, quantiles
+
+from multiprocess import Queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from simple_scheduler.event import Event
+from simple_scheduler.recurring import Recurring
+from simple_scheduler.executors import ThreadPoolExecutor
+
+def probe(queue, job_name, scheduled, *args, **kwargs):
+    queue.put((job_name, scheduled, monotonic()))
+
+def noop():
+    pass
+
+def _tree(pid):
+    """ pid and all of its descendants """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                pass
+    pids, stack = [], [pid]
+    while stack:
+        pids.append(stack.pop())
+        stack.extend(children.get(pids[-1], []))
+    return pids
+
+def rss_kb(pid):
+    total = 0
+    for p in _tree(pid):
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return total
+
+def cpu_seconds(pid):
+    total, ticks = 0, os.sysconf("SC_CLK_TCK")
+    for p in _tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / ticks
+        except (OSError, IndexError):
+            pass
+    return total
+
+def _probed(scheduler_class, queue):
+    """ A scheduler whose fires report (job_name, scheduled, started)."""
+
+    class Probed(scheduler_class):
+        def _fire(self, job, at):
+            job.function = partial(probe, queue, job.name, at)
+            super()._fire(job, at)
+
+    return Probed
+
+def _latency(samples):
+    latency = sorted((started - scheduled) * 1000
+                     for _, scheduled, started in samples)
+    if len(latency) < 2:
+        return {"count":len(latency)}
+    cuts = quantiles(latency, n=100)
+    return {
+        "count":len(latency),
+        "p50_ms":cuts[49],
+        "p90_ms":cuts[89],
+        "p99_ms":cuts[98],
+        "max_ms":latency[-1],
+        "jitter_ms":pstdev(latency)
+        }
+
+def _drain(queue, until, expected=None):
+    samples = []
+    while monotonic() < until and (expected is None or len(samples) < expected):
+        try:
+            samples.append(queue.get(timeout=max(0, until - monotonic())))
+        except Exception:
+            break
+    return samples
+
+def _scheduler(scheduler_class, mode):
+    if mode == "dispatcher":
+        return scheduler_class(dispatcher=True,
+                               executor=ThreadPoolExecutor(size=32))
+    return scheduler_class()
+
+def _idle_cpu(pid, seconds):
+    cpu, idle = cpu_seconds(pid), monotonic()
+    sleep(seconds)
+    return (cpu_seconds(pid) - cpu) / (monotonic() - idle) * 100
+
+def bench(kind, mode, n, seconds):
+    queue = Queue()
+    scheduler_class = _probed(Event if kind == "event" else Recurring, queue)
+    scheduler = _scheduler(scheduler_class, mode)
+    pid = os.getpid()
+    rss_before = rss_kb(pid)
+    # events fire at the start of the next minute (at least 5 seconds away)
+    minute = (int(time()) // 60 + (2 if time() % 60 > 55 else 1)) * 60
+    when = [f"*|{(minute // 3600) % 24:02}:{(minute // 60) % 60:02}"]
+    for i in range(n):
+        if kind == "event":
+            scheduler.add_job(target=noop, when=when, job_name=f"job-{i}")
+        else:
+            scheduler.add_job(target=noop, period_in_seconds=1, job_name=f"job-{i}")
+    began = monotonic()
+    scheduler.run()
+    run_seconds = monotonic() - began
+    first = _drain(queue, began + 150, expected=n)
+    all_fired = monotonic() - began
+    samples = list(first)
+    if kind == "recurring":
+        samples += _drain(queue, monotonic() + seconds)
+    rss = rss_kb(pid) - rss_before
+    if kind == "recurring":
+        # the same jobs every hour: nothing is due once they have all fired
+        scheduler.verbose = False
+        scheduler.clear()
+        scheduler = _scheduler(scheduler_class, mode)
+        for i in range(n):
+            scheduler.add_job(target=noop, period_in_seconds=3600, job_name=f"job-{i}")
+        scheduler.run()
+        _drain(queue, monotonic() + 150, expected=n)
+    # events: nothing is due until the same minute tomorrow
+    idle_cpu = _idle_cpu(pid, min(seconds, 20))
+    scheduler.verbose = False
+    scheduler.clear()
+    return {
+        "scheduler":kind,
+        "mode":mode,
+        "jobs":n,
+        "latency":_latency(samples),
+        "rss_per_job_kb":rss / n,
+        "idle_cpu_percent":idle_cpu,
+        "run_seconds":run_seconds,
+        "all_fired_seconds":all_fired,
+        "fired_once":len(first)
+        }
+
+def bench_throughput(runs):
+    """ Time to drain a backlog: all runs are requested at once, so the
+        result is bounded by the scheduler, not by the load offered."""
+    queue = Queue()
+    scheduler = Recurring(dispatcher=True, executor=ThreadPoolExecutor(size=8))
+    for i in range(100):
+        scheduler.add_job(target=probe,
+                          args=(queue, f"job-{i}", 0),
+                          period_in_seconds=3600,
+                          job_name=f"job-{i}")
+    scheduler.run()
+    # the first fires
+    _drain(queue, monotonic() + 150, expected=100)
+    began = monotonic()
+    for i in range(runs):
+        scheduler.run_job_now(f"job-{i % 100}")
+    done = _drain(queue, began + 600, expected=runs)
+    elapsed = monotonic() - began
+    scheduler.clear()
+    return {"runs":runs,
+            "completed":len(done),
+            "drain_seconds":elapsed,
+            "throughput_per_second":len(done) / elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default="10,1000,10000")
+    parser.add_argument("--seconds", type=float, default=10,
+                        help="how long recurring jobs are observed")
+    parser.add_argument("--max-processes", type=int, default=100,
+                        help="largest job count benchmarked in process mode")
+    parser.add_argument("--schedulers", default="recurring,event")
+    parser.add_argument("--runs", type=int, default=20000,
+                        help="backlog of short runs drained for throughput")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+    results = {
+        "python":platform.python_version(),
+        "platform":platform.platform(),
+        "cpus":os.cpu_count(),
+        "started":time(),
+        "runs":[]
+        }
+    for kind in args.schedulers.split(","):
+        for n in [int(n) for n in args.sizes.split(",")]:
+            for mode in ("dispatcher", "process"):
+                if mode == "process" and n > args.max_processes:
+                    continue
+                result = bench(kind, mode, n, args.seconds)
+                print(json.dumps(result), flush=True)
+                results["runs"].append(result)
+    results["short_jobs"] = bench_throughput(args.runs)
+    print(json.dumps(results["short_jobs"]))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmarks for import time and time zone conversions.
+
+Measures:
+    - import_ms : time to import simple_scheduler.event and
+                  simple_scheduler.recurring in a fresh interpreter, less
+                  the start-up of the bare interpreter (median of --repeat)
+    - next_fire_us : cost of computing the next fire of an event job in a
+                     time zone, per fire (wall clock <-> local time, DST)
+    - to_epoch_us / to_local_us : the conversions on their own
+
+Results are written as JSON, eg.
+
+    python benchmarks/bench_timezones.py --output bench_timezones.json
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+from time import time, perf_counter, monotonic
+from statistics import median
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from simple_scheduler.event import Event
+from simple_scheduler.timezones import get_timezone, to_epoch, to_local
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def _interpreter_ms(code):
+    began = perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    return (perf_counter() - began) * 1000
+
+def bench_import(repeat):
+    bare = median(_interpreter_ms("pass") for _ in range(repeat))
+    full = median(_interpreter_ms("import simple_scheduler.event, "+\
+                                  "simple_scheduler.recurring")
+                  for _ in range(repeat))
+    return {"import_ms":full - bare, "interpreter_ms":bare}
+
+def _per_call_us(function, n):
+    began = perf_counter()
+    for i in range(n):
+        function(i)
+    return (perf_counter() - began) / n * 1e6
+
+def bench_conversions(n, tz):
+    scheduler = Event(dispatcher=True)
+    scheduler.add_job(target=lambda: None,
+                      when=["*|**:**", "mon|09:30"],
+                      job_name="job",
+                      tz=tz)
+    job = scheduler._specs["job"]
+    zone = get_timezone(tz)
+    now, at = time(), monotonic()
+    locals_ = [to_local(now + 3600 * i, zone) for i in range(n)]
+    return {
+        "tz":tz,
+        "next_fire_us":_per_call_us(
+            lambda i: scheduler._next_fire(job, at + 60 * i), n),
+        "to_epoch_us":_per_call_us(lambda i: to_epoch(locals_[i], zone), n),
+        "to_local_us":_per_call_us(lambda i: to_local(now + 3600 * i, zone), n)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--fires", type=int, default=100000)
+    parser.add_argument("--timezones", default="GMT,Europe/Berlin,Asia/Kolkata")
+    parser.add_argument("--output", default="bench_timezones.json")
+    args = parser.parse_args()
+    results = {
+        "python":platform.python_version(),
+        "platform":platform.platform(),
+        "started":time(),
+        "import":bench_import(args.repeat),
+        "conversions":[bench_conversions(args.fires, tz)
+                       for tz in args.timezones.split(",")]
+        }
+    print(json.dumps(results, indent=2))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+from time import time
+from traceback import format_exc
+
+from simple_scheduler.base import Schedule
+
+async def _acall(
+        function,
+        capture=False
+        ):
+    """
+    Awaits the coroutine and translates the outcome into an exit code.
+
+    Parameters
+    ----------
+    function : callable function
+        an "async def" target loaded with its own parameters
+    capture : bool, optional
+        also return what the coroutine produced
+        the default is False
+
+    Returns
+    -------
+    tuple(int, type)
+        0 on success, else 1; and the type of the exception raised
+    with capture a third element is added, as by executors._call
+
+    """
+    from asyncio import CancelledError
+    started, value, traceback = time(), None, None
+    try:
+        value = await function()
+        outcome = 0, None
+    except CancelledError:
+        raise
+    except BaseException as e:
+        outcome = 1, type(e)
+        traceback = format_exc()
+    if not capture:
+        return outcome
+    return outcome + ((value, traceback, started, time()),)
+
+class _AsyncTask():
+    """ Gives an asyncio.Task the part of the multiprocess.Process
+        interface that the scheduler relies on."""
+
+    def __init__(
+            self,
+            task
+            ):
+        self._task = task
+
+    @property
+    def exitcode(self):
+        if not self._task.done():
+            return None
+        return 1 if self._task.cancelled() else self._task.result()[0]
+
+    @property
+    def exception(self):
+        if not self._task.done() or self._task.cancelled():
+            return None
+        return self._task.result()[1]
+
+    @property
+    def result(self):
+        if not self._task.done() or self._task.cancelled() or \
+           (len(self._task.result()) < 3):
+            return None
+        return self._task.result()[2]
+
+    def is_alive(self):
+        return not self._task.done()
+
+    def join(
+            self,
+            timeout=None
+            ):
+        pass
+
+    def terminate(self):
+        self._task.cancel()
+
+class AsyncSchedule(Schedule):
+    """ Runs the timer queue on an existing asyncio event loop (loop.call_at),
+        so thousands of coroutine jobs share one loop; no process or thread
+        per job."""
+
+    def __init__(
+            self,
+            *args,
+            **kwargs
+            ):
+        # the event loop is the dispatcher (a job store requires one)
+        kwargs["dispatcher"] = True
+        super().__init__(*args, **kwargs)
+        self._loop = None
+        self._handles = {}
+        self._flushing = False
+        self._wall_clock_handle = None
+
+    def _push(
+            self,
+            at,
+            action,
+            job,
+            *args
+            ):
+        """
+        Adds an action to the event loop's timer queue.
+
+        Parameters
+        ----------
+        at : float
+            time.monotonic() at which the action is due
+        action : callable
+            called as action(job, at, *args)
+        job : _Job
+
+        Returns
+        -------
+        key : int
+            identifies the entry
+
+        """
+        key = next(self._sequence)
+        when = self._loop.time() + at - self.clock.monotonic()
+        self._handles[key] = self._loop.call_at(when,
+                                                self._call_action,
+                                                key,
+                                                at,
+                                                action,
+                                                job,
+                                                args)
+        return key
+
+    def _unschedule(
+            self,
+            job
+            ):
+        """ Cancels the queued fire of the job on the loop."""
+        if job.fire is None:
+            return
+        key, job.fire = job.fire, None
+        self._discard(key)
+
+    def _discard(
+            self,
+            key
+            ):
+        """ Cancels the entry on the loop."""
+        handle = self._handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _shift_fires(
+            self,
+            shift
+            ):
+        """ Queues the fires on the loop again, shift seconds apart."""
+        for job in self._specs.values():
+            handle = self._handles.get(job.fire)
+            if handle is None:
+                continue
+            at = handle.when() - self._loop.time() + self.clock.monotonic()
+            self._discard(job.fire)
+            job.fire = self._push(at + shift, self._fire, job)
+
+    def _check_wall_clock(self):
+        """ Looks at the wall clock every wall_clock_check seconds, see
+            Schedule._follow_wall_clock()."""
+        self._follow_wall_clock()
+        self._wall_clock_handle = self._loop.call_later(self.wall_clock_check,
+                                                        self._check_wall_clock)
+
+    def _start_dispatcher(self):
+        """ The event loop is the dispatcher."""
+        pass
+
+    def _call_action(
+            self,
+            key,
+            at,
+            action,
+            job,
+            args
+            ):
+        """
+        Runs an entry of the timer queue, called by the loop when due
+        (see _push()).
+
+        Parameters
+        ----------
+        key : int
+            of the entry
+        at : float
+            time.monotonic() at which the entry was due
+        action : callable
+            called as action(job, at, *args), unless the entry is stale
+        job : _Job
+        args : tuple
+
+        Returns
+        -------
+        None.
+
+        """
+        self._handles.pop(key, None)
+        if self._is_stale((at, key, action, job, args)):
+            return
+        try:
+            action(job, at, *args)
+        except Exception as e:
+            self._print(str(e))
+        if self.store and not self._flushing:
+            # one write per loop iteration, however many jobs fired
+            self._flushing = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        """
+        Writes the changes to the job store, once per loop iteration.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._flushing = False
+        self.store.flush()
+
+    def _spawn(
+            self,
+            job
+            ):
+        """
+        Coroutine targets become tasks on the loop, anything else is
+        handed to the executor.
+
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        p : _AsyncTask (or a handle with the same interface)
+
+        """
+        from inspect import iscoroutinefunction
+        if not iscoroutinefunction(job.function.func):
+            return super()._spawn(job)
+        p = _AsyncTask(self._loop.create_task(_acall(job.function,
+                                                     job.capture)))
+        p._task.add_done_callback(lambda _: self._done(p))
+        return p
+
+    def _done(
+            self,
+            p
+            ):
+        """
+        Called as soon as a worker has finished (by executors, from their
+        own threads); accounts for it on the loop.
+
+        Parameters
+        ----------
+        p : _AsyncTask (or a handle with the same interface)
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._loop.is_closed():
+            # nothing left to account for it
+            return
+        self._loop.call_soon_threadsafe(self._finish, p)
+
+    def _finish(
+            self,
+            p
+            ):
+        """
+        Accounts for a finished worker, on the loop (see _done()).
+
+        Parameters
+        ----------
+        p : _AsyncTask (or a handle with the same interface)
+
+        Returns
+        -------
+        None.
+
+        """
+        self._finished.append(p)
+        self._reap()
+        self._drain_pending()
+
+    def run(
+            self,
+            loop=None
+            ):
+        """
+        Starts all jobs on the event loop; returns immediately.
+        Jobs are to be added, removed, paused, resumed, modified and run
+        now from the loop's thread.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop, optional
+            the default is the running loop
+
+        Returns
+        -------
+        None.
+
+        """
+        # asyncio is only imported by schedulers that use it
+        from asyncio import get_running_loop
+        self._loop = loop if loop else get_running_loop()
+        next_fires = self._recover()
+        self._validate_upstreams()
+        if not self._started:
+            self._offset = self.clock.time() - self.clock.monotonic()
+        for job in self._specs.values():
+            if job.paused or (job.fire is not None) or job.depends_on:
+                continue
+            self._schedule_fire(job, self._first_fire(job, next_fires.get(job.name)))
+        if self.wall_clock_check:
+            if self._wall_clock_handle:
+                self._wall_clock_handle.cancel()
+            self._wall_clock_handle = self._loop.call_later(
+                self.wall_clock_check, self._check_wall_clock)
+        self._started = True
+
+    def simulate(
+            self,
+            seconds
+            ):
+        """ Not available: the event loop keeps its own time."""
+        raise Exception("simulate() requires a Schedule with dispatcher=True, "+\
+                        "not one on an event loop")
+
+    def clear(self):
+        """
+        Stops all jobs as well as clears them from the schedule.
+
+        Returns
+        -------
+        None.
+
+        """
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles = {}
+        if self._wall_clock_handle:
+            self._wall_clock_handle.cancel()
+            self._wall_clock_handle = None
+        super().clear()
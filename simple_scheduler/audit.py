@@ -0,0 +1,226 @@
+import os
+import json
+from collections import deque
+from threading import Event, Lock, Thread
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:
+    # no cross-process lock (Windows): keep to one writing process
+    flock = None
+
+class AuditLog():
+    """ A JSON-lines record of what the scheduler did with every job:
+        "scheduled", "dispatched", "started", "finished", "failed",
+        "retried" and "skipped", eg.
+
+            {"ts":1767225600.0,"event":"finished","job":"backup",
+             "kind":"Event","pid":4242,"exitcode":0,"duration":1.52}
+
+        record() only appends to an in-memory buffer; a background
+        thread turns it into JSON and writes it in batches, so the
+        dispatcher never waits on the disk. The file is rotated by size
+        (path, path.1, ..., path.<backups>); job processes share it,
+        taking turns through a lock file (path.lock) to write and
+        rotate."""
+
+    def __init__(
+            self,
+            path="simple_scheduler.jsonl",
+            max_bytes=64 << 20,
+            backups=5,
+            flush_seconds=1.0,
+            batch_size=1000,
+            max_buffered=100000
+            ):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            the default is "simple_scheduler.jsonl"
+        max_bytes : int, optional
+            the file is rotated before it grows beyond this size
+            the default is 64 MiB
+        backups : int, optional
+            rotated files kept, 0 truncates the file instead
+            the default is 5
+        flush_seconds : float, optional
+            the buffer is written at least this often
+            the default is 1.0
+        batch_size : int, optional
+            the buffer is written as soon as it holds these many records
+            the default is 1000
+        max_buffered : int, optional
+            records beyond this (the disk not keeping up) are dropped and
+            counted in .dropped
+            the default is 100000
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+        self.dropped = 0
+        self._buffer = deque()
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._writer = None
+        self._file = None
+        self._lockfile = None
+        self._pid = os.getpid()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_buffer=deque(), _lock=None, _wakeup=None, _writer=None,
+                     _file=None, _lockfile=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._pid = os.getpid()
+
+    def _after_fork(self):
+        """ The files and the lock of a forked process are its parent's
+            (possibly held by the parent's writer thread): start afresh."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = Lock()
+            self._file = self._lockfile = None
+
+    def record(
+            self,
+            event,
+            job_name,
+            ts,
+            **fields
+            ):
+        """
+        Parameters
+        ----------
+        event : str
+            eg. "dispatched"
+        job_name : str
+        ts : float
+            epoch of the event
+        **fields
+            anything else to record, eg. exitcode=0
+
+        Returns
+        -------
+        None.
+
+        """
+        self._after_fork()
+        if len(self._buffer) >= self.max_buffered:
+            self.dropped += 1
+            return
+        self._buffer.append({"ts":ts, "event":event, "job":job_name, **fields})
+        if self._writer != os.getpid():
+            # the writer of this process (threads do not survive a fork)
+            self._writer = os.getpid()
+            Thread(target=self._write_loop,
+                   name="simple_scheduler_audit",
+                   daemon=True).start()
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _write_loop(self):
+        pid = os.getpid()
+        while self._writer == pid:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Audit log {self.path}: {e}")
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            open(self.path, "wb").close()
+        # appending, as other processes may write to it as well
+        self._file = open(self.path, "ab", buffering=0)
+
+    def _write(
+            self,
+            data
+            ):
+        """ Appends data, rotating the file first if it would grow beyond
+            max_bytes, while holding the lock file; the size is that of
+            the file, whichever process wrote it."""
+        if flock and (self._lockfile is None):
+            self._lockfile = open(f"{self.path}.lock", "ab")
+        if flock:
+            flock(self._lockfile, LOCK_EX)
+        try:
+            if self._file is not None:
+                try:
+                    rotated = os.stat(self.path).st_ino != \
+                              os.fstat(self._file.fileno()).st_ino
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    # another process rotated the file
+                    self._file.close()
+                    self._file = None
+            if self._file is None:
+                # unbuffered: every batch is a single append
+                self._file = open(self.path, "ab", buffering=0)
+            size = os.fstat(self._file.fileno()).st_size
+            if size and (size + len(data) > self.max_bytes):
+                self._rotate()
+            self._file.write(data)
+        finally:
+            if flock:
+                flock(self._lockfile, LOCK_UN)
+
+    def flush(self):
+        """
+        Writes out whatever is buffered.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._after_fork()
+        with self._lock:
+            while self._buffer:
+                lines = []
+                while self._buffer and (len(lines) < self.batch_size):
+                    lines.append(json.dumps(self._buffer.popleft(),
+                                            separators=(",", ":"),
+                                            default=str))
+                self._write(("\n".join(lines) + "\n").encode())
+
+    def close(self):
+        """
+        Writes out whatever is buffered and stops the writer.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._writer = None
+        self._wakeup.set()
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lockfile is not None:
+                self._lockfile.close()
+                self._lockfile = None
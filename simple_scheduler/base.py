@@ -1,17 +1,303 @@
-from time import time, sleep
-from pytz import all_timezones, timezone
+import os
+from random import uniform
+from hashlib import md5
+from heapq import heapify, heappush, heappop
 from datetime import datetime
 from functools import partial
-from multiprocess import Process
+from itertools import count
+from threading import Condition, Thread
+
+from simple_scheduler.clock import Clock, VirtualClock
+from simple_scheduler.retry import RetryPolicy
+from simple_scheduler.metrics import Metrics
+from simple_scheduler.fairqueue import FairQueue
+from simple_scheduler.results import Result, Results
+from simple_scheduler.executors import ForkExecutor, ProcessPoolExecutor
+from simple_scheduler.timezones import all_timezones, get_timezone, to_epoch
+
+class _Job():
+    """ Everything needed to fire a job, independent of how it is triggered;
+        the only part of the scheduler a job process receives."""
+
+    __slots__ = ("name", "function", "tz", "start", "stop",
+                 "number_of_reattempts", "reattempt_duration_in_seconds",
+                 "when", "when_crons", "period_in_seconds", "executor",
+                 "misfire_policy", "max_instances", "overlap", "retry",
+                 "timeout", "capture", "inputs", "chunk_size", "depends_on",
+                 "jitter", "priority", "weight", "waiting", "paused", "epoch",
+                 "lateness", "cancelled", "instances", "queued", "fire",
+                 "virtual_finish")
+
+    def __init__(
+            self,
+            name,
+            function,
+            tz,
+            start,
+            stop,
+            number_of_reattempts,
+            reattempt_duration_in_seconds,
+            when=None,
+            when_crons=None,
+            period_in_seconds=None,
+            executor=None,
+            misfire_policy="fire_once",
+            max_instances=None,
+            overlap="queue",
+            retry=None,
+            timeout=None,
+            capture=False,
+            inputs=None,
+            chunk_size=100,
+            depends_on=(),
+            jitter=None,
+            priority=0,
+            weight=1
+            ):
+        self.name = name
+        self.function = function
+        self.tz = tz
+        self.start = start
+        self.stop = stop
+        self.number_of_reattempts = number_of_reattempts
+        self.reattempt_duration_in_seconds = reattempt_duration_in_seconds
+        self.when = when
+        self.when_crons = when_crons
+        self.period_in_seconds = period_in_seconds
+        self.executor = executor
+        self.misfire_policy = misfire_policy
+        self.max_instances = max_instances
+        self.overlap = overlap
+        if (retry is None) and (number_of_reattempts > 0):
+            retry = RetryPolicy(max_retries=number_of_reattempts,
+                                backoff=reattempt_duration_in_seconds,
+                                multiplier=1,
+                                jitter=False)
+        self.retry = retry
+        self.timeout = timeout
+        self.capture = capture
+        self.inputs = inputs
+        self.chunk_size = chunk_size
+        self.depends_on = depends_on
+        self.jitter = jitter
+        self.priority = priority
+        self.weight = weight
+        self.waiting = set(depends_on)
+        self.paused = False
+        self.epoch = None
+        self.lateness = None
+        self.cancelled = False
+        self.instances = []
+        self.queued = 0
+        self.fire = None
+        self.virtual_finish = 0
+
+    def __getstate__(self):
+        state = {name:getattr(self, name) for name in self.__slots__}
+        state.update(epoch=None, lateness=None, cancelled=False, instances=[],
+                     queued=0, fire=None, waiting=set(self.depends_on),
+                     virtual_finish=0)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+class _Run():
+    """ One logical run of a job, across all of its attempts."""
+
+    __slots__ = ("job", "retries", "first", "enqueued", "tag", "key",
+                 "level", "waiting")
+
+    def __init__(
+            self,
+            job
+            ):
+        self.job = job
+        self.retries = 0
+        self.first = None
+        # time.monotonic() it entered the pending queue, its virtual start
+        self.enqueued = None
+        self.tag = 0
+        # in the pending queue (see simple_scheduler.fairqueue.FairQueue)
+        self.key = None
+        self.level = None
+        self.waiting = False
+
+def _job_process(
+        kind,
+        settings,
+        job
+        ):
+    """
+    Target of the per-job process: a scheduler of its own holding just
+    this job, so that a job process is sent (or, when forked, only
+    touches) the job and the scheduler's settings, not every other job.
+
+    Parameters
+    ----------
+    kind : type
+        the class of the scheduler, eg. Event
+    settings : dict
+        its parameters, see Schedule._settings()
+    job : _Job
+
+    Returns
+    -------
+    None.
+
+    """
+    scheduler = kind(**settings)
+    scheduler._specs[job.name] = job
+    scheduler._schedule(job)
 
 class Schedule():
     def __init__(
             self,
-            verbose:bool=False
+            verbose:bool=False,
+            dispatcher:bool=False,
+            executor=None,
+            store=None,
+            max_concurrency=None,
+            max_pending=1000,
+            coordinator=None,
+            jitter=0,
+            stagger=0,
+            rate_limit=None,
+            clock=None,
+            audit=None,
+            start_method=None,
+            status=None,
+            aging=60
             ) -> None:
+        """
+        Parameters
+        ----------
+        verbose : bool, optional
+            print scheduling messages, the default is False
+        dispatcher : bool, optional
+            if True all jobs share a single dispatcher thread which sleeps
+            until the earliest deadline, instead of one process per job
+            the default is False
+        executor : simple_scheduler.executors.Executor, optional
+            where due jobs run (ForkExecutor, ProcessPoolExecutor or
+            ThreadPoolExecutor); add_job can override it per job
+            the default is ForkExecutor(), a new process per run
+        store : simple_scheduler.store.JobStore, optional
+            persists jobs so that run() can recover them after a restart,
+            requires dispatcher=True
+            the default is None
+        max_concurrency : int, optional
+            runs allowed at the same time across all jobs; further runs
+            wait in the pending queue, requires dispatcher=True
+            the default is None (no limit)
+        max_pending : int, optional
+            size of the pending queue, runs beyond it are skipped
+            (dispatcher=True)
+            the default is 1000
+        coordinator : simple_scheduler.coordination.Coordinator, optional
+            shares the jobs with other schedulers (gunicorn workers,
+            replicas) such that every fire runs exactly once; add the
+            same jobs to every scheduler
+            the default is None
+        jitter : float, optional
+            the run of every fire is dispatched a random 0 to jitter
+            seconds late (add_job can override it per job), so that jobs
+            due at the same instant do not all start together
+            the default is 0
+        stagger : float, optional
+            spreads jobs due at the same instant over a window of these
+            many seconds: every job is dispatched its own fixed share of
+            the window late (from a hash of its name)
+            the default is 0
+        rate_limit : simple_scheduler.ratelimit.TokenBucket, optional
+            dispatches per second (with bursts) across all jobs; further
+            runs wait in the pending queue, requires dispatcher=True
+            the default is None (no limit)
+        clock : simple_scheduler.clock.Clock, optional
+            where the scheduler reads the time and waits; with a
+            VirtualClock see simulate()
+            the default is None (the real clock)
+        audit : simple_scheduler.audit.AuditLog, optional
+            a JSON-lines record of every job being scheduled, dispatched,
+            started, finished, failed, retried or skipped
+            the default is None
+        start_method : str, optional
+            how job processes are started (dispatcher=False): "fork",
+            "spawn" or "forkserver", where every job process is forked
+            from a small template process that has only imported the
+            scheduler, so it holds nothing but its own job
+            the default is None (the platform's default)
+        status : simple_scheduler.status.StatusBoard, optional
+            a live table in shared memory of every job (runs in flight,
+            last run, next fire, failure streak), kept up to date by the
+            scheduler and by job processes, for any process to read
+            the default is None
+        aging : float, optional
+            a run waiting in the pending queue is served as if its job's
+            priority were one higher for every these many seconds it has
+            waited, so that low priorities are not starved
+            (dispatcher=True)
+            the default is 60 (None: no aging)
+
+        Jitter and stagger never delay a run past the next fire of its
+        job.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.clock = clock if clock else Clock()
+        self.audit = audit
+        self.start_method = start_method
+        self.status = status
+        self.aging = aging
+        self._virtual = {}
         self._jobs = {}
-        self._workers = []
+        self._specs = {}
+        self._workers = {}
+        # worker : key of its timeout entry in the timer queue
+        self._timeouts = {}
         self._processes = []
+        self._heap = []
+        self._sequence = count()
+        self._condition = Condition()
+        self._dispatcher = None
+        self.dispatcher = dispatcher
+        self.executor = executor if executor else ForkExecutor()
+        if store and not dispatcher:
+            raise Exception("A job store requires dispatcher=True")
+        # without a dispatcher every job process would have its own limit
+        if (max_concurrency or rate_limit) and not dispatcher:
+            raise Exception("max_concurrency and rate_limit require "+\
+                            "dispatcher=True")
+        self.store = store
+        self.metrics = Metrics()
+        self.results = Results()
+        self._fan_out_executor = None
+        self._downstream = {}
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.coordinator = coordinator
+        self._validate_jitter(jitter, "jitter")
+        self._validate_jitter(stagger, "stagger")
+        self.jitter = jitter
+        self.stagger = stagger
+        self.rate_limit = rate_limit
+        self._refill = None
+        self._peak = (0, None)
+        self._pending = FairQueue(aging)
+        self._finished = []
+        self.kill_after = 5
+        # seconds between two looks at the wall clock (see
+        # _follow_wall_clock), None if the fires are on the monotonic clock
+        self.wall_clock_check = None
+        self._offset = self.clock.time() - self.clock.monotonic()
+        self._kind = type(self).__name__
+        self._bulk = None
+        self._started = False
+        self._stale = 0
         self._days = {
             0:"mon",
             1:"tue",
@@ -25,157 +311,1671 @@ class Schedule():
 
     def job_summary(self):
         """
-        Provides summary of jobs that are still running
+        Provides summary of jobs that are still running
+
+        Returns
+        -------
+        None.
+
+        """
+        self._print("\tScheduled jobs:")
+        names = {p.name:p.is_alive() for p in self._processes}
+        for _, name in enumerate(self._jobs):
+            msg = f"{self._jobs[name][0]}"
+            try:
+                msg += f" running in {self._jobs[name][1]}"
+                if not names[name]:
+                    continue
+            except:
+                pass
+            status = self.status.read(name) if self.status else None
+            if status:
+                msg += f" | {status['in_flight']} in flight, "+\
+                       f"{status['runs']} run(s), "+\
+                       f"failure streak {status['failure_streak']}"
+            self._print(msg)
+
+    def timezones(self):
+        """
+        A quick look-up of all time-zones.
+
+        Returns
+        -------
+        all_timezones : list
+            zoneinfo.available_timezones(), sorted
+
+        """
+        return all_timezones()
+
+    def _print(
+            self,
+            message
+            ):
+        """
+        To silence, this class, if need be.
+
+        Parameters
+        ----------
+        message : str
+            description
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.verbose:
+            print(message)
+
+    def _audit(
+            self,
+            event,
+            job,
+            p=None,
+            **fields
+            ):
+        """
+        Records an event of the job in the audit log, if any.
+
+        Parameters
+        ----------
+        event : str
+            "scheduled", "dispatched", "started", "finished", "failed",
+            "retried" or "skipped"
+        job : _Job
+        p : multiprocess.Process (or a handle with the same interface)
+            the worker, if any: its pid is recorded (None for runs on
+            pools); without a worker the pid of the scheduler is
+        **fields
+            recorded as they are
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.audit is None:
+            return
+        pid = getattr(p, "pid", None) if p is not None else os.getpid()
+        self.audit.record(event,
+                          job.name,
+                          self.clock.time(),
+                          kind=self._kind,
+                          pid=pid,
+                          **fields)
+
+    def _reap(self):
+        """
+        Forgets (and accounts for) workers reported by _done().
+
+        Returns
+        -------
+        None.
+
+        """
+        finished, self._finished = self._finished, []
+        for x in finished:
+            if x not in self._workers:
+                continue
+            run, started = self._workers.pop(x)
+            if x in self._timeouts:
+                self._discard(self._timeouts.pop(x))
+            job = run.job
+            job.instances.remove(x)
+            duration = self.clock.monotonic() - started
+            self.metrics.finished(job.name, x.exitcode, duration)
+            if self.status:
+                self.status.finished(job.name, self.clock.time(), x.exitcode)
+            self._audit("finished" if x.exitcode == 0 else "failed",
+                        job,
+                        x,
+                        exitcode=x.exitcode,
+                        duration=duration,
+                        attempt=run.retries)
+            if job.capture:
+                self._capture(job, x, started)
+            if self.store:
+                self.store.update(self._kind, job.name, last_exitcode=x.exitcode)
+            if job.retry and (x.exitcode != 0) and self._failed(run, x):
+                continue
+            if job.name in self._downstream:
+                self._completed(job, x.exitcode == 0)
+
+    def _completed(
+            self,
+            job,
+            succeeded
+            ):
+        """
+        Called once a run of the job is over (retries included): a job
+        downstream is dispatched right away once all of the jobs it
+        depends on have succeeded since its last run; if one failed, its
+        run is skipped and so are the runs of the jobs downstream of it.
+
+        Parameters
+        ----------
+        job : _Job
+        succeeded : bool
+
+        Returns
+        -------
+        None.
+
+        """
+        if not succeeded:
+            failed, stack = set(), list(self._downstream.get(job.name, ()))
+            while stack:
+                name = stack.pop()
+                child = self._specs.get(name)
+                if (child is None) or (name in failed):
+                    continue
+                failed.add(name)
+                child.waiting = set(child.depends_on)
+                self._skip(child, "upstream_failed")
+                stack.extend(self._downstream.get(name, ()))
+            return
+        for name in list(self._downstream.get(job.name, ())):
+            child = self._specs.get(name)
+            if child is None:
+                continue
+            child.waiting.discard(job.name)
+            if child.waiting:
+                continue
+            child.waiting = set(child.depends_on)
+            if child.paused or (self._in_window(child) != 0):
+                continue
+            self.metrics.fired(child.name, 0)
+            self._request(_Run(child))
+
+    def _capture(
+            self,
+            job,
+            p,
+            started
+            ):
+        """
+        Keeps the result of a finished attempt in self.results; attempts
+        which did not report one (terminated, killed) are kept with their
+        exit code and timing only.
+
+        Parameters
+        ----------
+        job : _Job
+        p : multiprocess.Process (or a handle with the same interface)
+        started : float
+            time.monotonic() at which the attempt was started
+
+        Returns
+        -------
+        None.
+
+        """
+        result = getattr(p, "result", None)
+        if result is None:
+            result = (None, None, self._to_wall(started), self.clock.time())
+        value, traceback, began, finished = result
+        self.results.add(Result(job.name,
+                                p.exitcode,
+                                value=value,
+                                exception=getattr(p, "exception", None),
+                                traceback=traceback,
+                                started=began,
+                                finished=finished))
+
+    def _done(
+            self,
+            p
+            ):
+        """
+        Called by the executors, from their own threads, as soon as a
+        worker has finished; wakes up the dispatcher.
+
+        Parameters
+        ----------
+        p : multiprocess.Process (or a handle with the same interface)
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            self._finished.append(p)
+            self._condition.notify()
+
+    def _next_fire(
+            self,
+            job,
+            after=None
+            ):
+        """
+        To be implemented by the child classes.
+
+        Parameters
+        ----------
+        job : _Job
+        after : float, optional
+            time.monotonic() of the previous fire; None if the job never
+            fired. The job's next fire must be strictly later than this
+
+        Returns
+        -------
+        float
+            time.monotonic() at which the job should fire next
+
+        """
+        raise NotImplementedError
+
+    def _describe(
+            self,
+            job
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        str
+            the description shown by job_summary()
+
+        """
+        raise NotImplementedError
+
+    def _to_wall(
+            self,
+            at
+            ):
+        """
+        Parameters
+        ----------
+        at : float
+            time.monotonic()
+
+        Returns
+        -------
+        float
+            the corresponding epoch, as per the wall clock right now
+
+        """
+        return at + self.clock.time() - self.clock.monotonic()
+
+    def _to_monotonic(
+            self,
+            at
+            ):
+        """
+        Parameters
+        ----------
+        at : float
+            epoch
+
+        Returns
+        -------
+        float
+            the corresponding time.monotonic(), as per the wall clock
+            right now
+
+        """
+        return at - self.clock.time() + self.clock.monotonic()
+
+    def _validate_misfire_policy(
+            self,
+            misfire_policy
+            ):
+        """
+        Parameters
+        ----------
+        misfire_policy : str
+
+        Raises
+        ------
+        Exception
+
+        Returns
+        -------
+        None.
+
+        """
+        if misfire_policy not in ("fire_once", "fire_all", "skip"):
+            raise Exception('misfire_policy must be one of '+\
+                            '"fire_once", "fire_all" or "skip"')
+
+    def _validate_overlap(
+            self,
+            max_instances,
+            overlap
+            ):
+        """
+        Parameters
+        ----------
+        max_instances : int
+        overlap : str
+
+        Raises
+        ------
+        Exception
+
+        Returns
+        -------
+        None.
+
+        """
+        if (max_instances is not None) and \
+           ((type(max_instances) != int) or (max_instances < 1)):
+            raise Exception("max_instances must be a positive int")
+        if overlap not in ("skip", "queue", "terminate"):
+            raise Exception('overlap must be one of "skip", "queue" or '+\
+                            '"terminate"')
+
+    def _validate_depends_on(
+            self,
+            job_name,
+            depends_on
+            ):
+        """
+        Parameters
+        ----------
+        job_name : str
+        depends_on : str or list(str)
+            names of the jobs (of this scheduler) the job runs after
+
+        Raises
+        ------
+        Exception
+            - if the scheduler is not a dispatcher
+            - if the scheduler is running and a job it depends on does
+              not exist (before run() they are checked by
+              _validate_upstreams())
+            - if the dependencies would make a cycle
+
+        Returns
+        -------
+        tuple(str)
+
+        """
+        if not depends_on:
+            return ()
+        if not self.dispatcher:
+            raise Exception("depends_on requires dispatcher=True")
+        depends_on = (depends_on,) if isinstance(depends_on, str) else \
+                     tuple(depends_on)
+        missing = [name for name in depends_on if name not in self._specs]
+        if self._started and missing:
+            raise Exception(f"{job_name} depends on unknown job(s) {missing}")
+        # a cycle, if a job it depends on is downstream of it (or itself)
+        seen, stack = {job_name}, [job_name]
+        while stack:
+            name = stack.pop()
+            if name in depends_on:
+                raise Exception(f"depends_on={list(depends_on)} of {job_name} "+\
+                                f"makes a cycle through {name}")
+            for child in self._downstream.get(name, ()):
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return depends_on
+
+    def _validate_upstreams(self):
+        """
+        Checks, when the scheduler starts, that every job a job depends
+        on exists (they may be added in any order before that).
+
+        Raises
+        ------
+        Exception
+            if a job depends on a job that does not exist
+
+        Returns
+        -------
+        None.
+
+        """
+        for job in self._specs.values():
+            missing = [name for name in job.depends_on
+                       if name not in self._specs]
+            if missing:
+                raise Exception(f"{job.name} depends on unknown job(s) "+\
+                                f"{missing}")
+
+    def _link(
+            self,
+            job
+            ):
+        """ Registers the job downstream of the jobs it depends on."""
+        for name in job.depends_on:
+            self._downstream.setdefault(name, []).append(job.name)
+
+    def _unlink(
+            self,
+            job
+            ):
+        """ Unregisters the job from downstream of the jobs it depends on
+            (see _link()); a job left with nothing downstream is dropped
+            from _downstream."""
+        for name in job.depends_on:
+            children = self._downstream.get(name, [])
+            if job.name in children:
+                children.remove(job.name)
+            if not children:
+                self._downstream.pop(name, None)
+
+    def _validate_jitter(
+            self,
+            jitter,
+            name="jitter"
+            ):
+        """
+        Parameters
+        ----------
+        jitter : float
+            seconds
+        name : str, optional
+            of the parameter, for the error message
+
+        Raises
+        ------
+        Exception
+            if jitter is not a non-negative int or float
+
+        Returns
+        -------
+        None.
+
+        """
+        if not isinstance(jitter, (int, float)) or (jitter < 0):
+            raise Exception(f"{name} must be a non-negative int or float")
+
+    def _validate_priority(
+            self,
+            priority,
+            weight
+            ):
+        """
+        Parameters
+        ----------
+        priority : int
+        weight : float
+
+        Raises
+        ------
+        Exception
+            if priority is not an int or weight is not positive, or either
+            is set without a dispatcher (no shared pending queue)
+
+        Returns
+        -------
+        None.
+
+        """
+        if ((priority, weight) != (0, 1)) and not self.dispatcher:
+            raise Exception("priority and weight require dispatcher=True")
+        if not isinstance(priority, int):
+            raise Exception("priority must be an int")
+        if not isinstance(weight, (int, float)) or (weight <= 0):
+            raise Exception("weight must be a positive int or float")
+
+    def _validate_capture(
+            self,
+            capture
+            ):
+        """
+        Parameters
+        ----------
+        capture : bool
+
+        Raises
+        ------
+        Exception
+            if capture is set without a dispatcher (the runs of a job
+            process never reach .results)
+
+        Returns
+        -------
+        None.
+
+        """
+        if capture and not self.dispatcher:
+            raise Exception("capture requires dispatcher=True")
+
+    def _validate_chunk_size(
+            self,
+            chunk_size
+            ):
+        """
+        Parameters
+        ----------
+        chunk_size : int
+
+        Raises
+        ------
+        Exception
+            if chunk_size is not a positive int
+
+        Returns
+        -------
+        None.
+
+        """
+        if not isinstance(chunk_size, int) or (chunk_size < 1):
+            raise Exception("chunk_size must be a positive int")
+
+    def _in_window(
+            self,
+            job
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+            job.start and job.stop are epochs (or None)
+
+        Returns
+        -------
+        int
+            -1 if start is yet to come, 0 if within start/stop, 1 if
+            stop has passed
+
+        """
+        time_ = self.clock.time()
+        if (job.start is not None) and (time_ < job.start):
+            return -1
+        elif (job.stop is not None) and (time_ > job.stop):
+            return 1
+        return 0
+
+    def _push(
+            self,
+            at,
+            action,
+            job,
+            *args
+            ):
+        """
+        Adds an action to the timer queue, O(log n).
+
+        Parameters
+        ----------
+        at : float
+            time.monotonic() at which the action is due
+        action : callable
+            called as action(job, at, *args)
+        job : _Job
+
+        Returns
+        -------
+        key : int
+            identifies the entry
+
+        """
+        with self._condition:
+            key = next(self._sequence)
+            heappush(self._heap, (at, key, action, job, args))
+            self._condition.notify()
+            return key
+
+    def _schedule_fire(
+            self,
+            job,
+            at
+            ):
+        """
+        Queues the next fire of the job; it replaces the fire queued
+        before, if any.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the job should fire
+
+        Returns
+        -------
+        None.
+
+        """
+        job.fire = self._push(at, self._fire, job)
+        self._scheduled(job, at)
+
+    def _scheduled(
+            self,
+            job,
+            at
+            ):
+        """ Records the next fire of the job (audit log, status board)."""
+        self._audit("scheduled", job, due=self._to_wall(at))
+        if self.status:
+            self.status.scheduled(job.name, self._to_wall(at))
+
+    def _follow_wall_clock(self):
+        """
+        Moves the queued fires by as much as the wall clock has jumped
+        against the monotonic clock since the fires were queued (the host
+        was suspended, or the clock was stepped), so that they still fire
+        at their wall-clock time; late fires then follow the job's
+        misfire_policy. A drift of less than a second is left to the
+        rounding of the fire times.
+
+        Returns
+        -------
+        None.
+
+        """
+        offset = self.clock.time() - self.clock.monotonic()
+        shift = self._offset - offset
+        if abs(shift) < 1:
+            return
+        self._offset = offset
+        self._print(f"The wall clock jumped by {-shift:.0f}s")
+        self._shift_fires(shift)
+
+    def _shift_fires(
+            self,
+            shift
+            ):
+        """
+        Parameters
+        ----------
+        shift : float
+            seconds to add to the due time of every queued fire
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            self._heap = [(at + shift, key, action, job, args)
+                          if action == self._fire else
+                          (at, key, action, job, args)
+                          for at, key, action, job, args in self._heap]
+            heapify(self._heap)
+
+    def _unschedule(
+            self,
+            job
+            ):
+        """
+        Drops the queued fire of the job, O(1): the entry stays in the
+        timer queue and is skipped when due; the queue is compacted once
+        most of it is made of such entries.
+
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            if job.fire is None:
+                return
+            key, job.fire = job.fire, None
+            self._discard(key)
+
+    def _discard(
+            self,
+            key
+            ):
+        """
+        Accounts for a timer queue entry that _is_stale() from now on.
+
+        Parameters
+        ----------
+        key : int
+            of the entry
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            self._stale += 1
+            if self._stale > len(self._heap) // 2 + 64:
+                self._heap = [entry for entry in self._heap
+                              if not self._is_stale(entry)]
+                heapify(self._heap)
+                self._stale = 0
+
+    def _is_stale(
+            self,
+            entry
+            ):
+        """ A timer queue entry of a removed job, a replaced fire, or the
+            timeout of a worker that has finished."""
+        _, key, action, job, args = entry
+        if job is None:
+            # an entry of the scheduler itself
+            return False
+        if action == self._timeout:
+            return self._timeouts.get(args[0]) != key
+        return job.cancelled or ((action == self._fire) and (key != job.fire))
+
+    def _spawn(
+            self,
+            job
+            ):
+        """
+        Hands the job over to a worker; a fan-out job (with inputs) over
+        a pool: the job's or the scheduler's executor if it is a pool,
+        else a process pool of os.cpu_count() workers.
+
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        p : multiprocess.Process (or a handle with the same interface)
+
+        """
+        executor = job.executor if job.executor else self.executor
+        if job.inputs is not None:
+            if not isinstance(executor, ProcessPoolExecutor):
+                if self._fan_out_executor is None:
+                    self._fan_out_executor = ProcessPoolExecutor()
+                executor = self._fan_out_executor
+            return executor.fan_out(job.function,
+                                    job.inputs,
+                                    job.chunk_size,
+                                    self._done,
+                                    capture=job.capture)
+        if job.capture:
+            return executor.submit(job.function, self._done, capture=True)
+        return executor.submit(job.function, self._done)
+
+    def _skip(
+            self,
+            job,
+            reason
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+        reason : str
+            "overlap", "queue_full" or "upstream_failed"
+
+        Returns
+        -------
+        None.
+
+        """
+        self._print(f"Skipped run of job: {job.name} ({reason})")
+        self._audit("skipped", job, reason=reason)
+        self.metrics.inc("skipped_total", (("job", job.name),
+                                           ("reason", reason)))
+
+    def _request(
+            self,
+            run
+            ):
+        """
+        Starts an attempt of the run, unless its job's max_instances or
+        the scheduler's max_concurrency says otherwise. At max_instances
+        the job's overlap policy decides:
+            "skip"      : drop this run
+            "queue"     : run once an instance finishes (at most one run
+                          waits, later ones are dropped)
+            "terminate" : terminate the oldest instance and run as soon as
+                          it has exited (runs on pools cannot be
+                          terminated, they are just queued)
+
+        Parameters
+        ----------
+        run : _Run
+
+        Returns
+        -------
+        None.
+
+        """
+        job = run.job
+        self._audit("dispatched", job, attempt=run.retries)
+        if job.max_instances and (len(job.instances) >= job.max_instances):
+            oldest = job.instances[0]
+            if (job.overlap == "skip") or job.queued:
+                self._skip(job, "overlap")
+                return
+            if (job.overlap == "terminate") and hasattr(oldest, "terminate"):
+                self._print(f"Terminating overlapping run of job: {job.name}")
+                oldest.terminate()
+            self._enqueue(run)
+            return
+        if self._pending or (self.max_concurrency and \
+                             len(self._workers) >= self.max_concurrency):
+            self._enqueue(run)
+            return
+        if not self._admit():
+            self.metrics.inc("throttled_total", (("job", job.name),))
+            self._enqueue(run)
+            return
+        self._start(run)
+
+    def _admit(self):
+        """
+        Takes a token from the scheduler's rate_limit, if any; without
+        one a wake-up is queued for when the next token is available.
+
+        Returns
+        -------
+        bool
+            True if a run may be dispatched now
+
+        """
+        if self.rate_limit is None:
+            return True
+        wait = self.rate_limit.take(self.clock.monotonic())
+        if wait == 0:
+            return True
+        if self._refill is None:
+            self._refill = self._push(self.clock.monotonic() + wait,
+                                      self._refilled,
+                                      None)
+        return False
+
+    def _refilled(
+            self,
+            job,
+            at
+            ):
+        """
+        Timer queue action, due once the rate limit has a token again
+        (see _admit()): starts the runs waiting for it.
+
+        Parameters
+        ----------
+        job : None
+            an entry of the scheduler itself
+        at : float
+            time.monotonic() at which the entry was due
+
+        Returns
+        -------
+        None.
+
+        """
+        self._refill = None
+        self._drain_pending()
+
+    def _enqueue(
+            self,
+            run
+            ):
+        """
+        Parameters
+        ----------
+        run : _Run
+
+        Returns
+        -------
+        None.
+
+        """
+        job = run.job
+        now = self.clock.monotonic()
+        run.enqueued = now
+        # start-time fair queuing within a priority: a job's runs are
+        # spaced 1/weight apart in the virtual time of its priority
+        run.tag = max(self._virtual.get(job.priority, 0), job.virtual_finish)
+        if (self.max_pending is not None) and \
+           (len(self._pending) >= self.max_pending):
+            self._pending.age(now)
+            worst = self._pending.worst()
+            if (worst is None) or \
+               ((-worst.level, worst.tag) <= (-job.priority, run.tag)):
+                self._skip(job, "queue_full")
+                return
+            # the lowest ranked run makes room, and gives back its share
+            # (it is the last queued run of its job)
+            self._pending.remove(worst)
+            worst.job.queued -= 1
+            worst.job.virtual_finish = worst.tag
+            self._skip(worst.job, "queue_full")
+        job.virtual_finish = run.tag + 1 / job.weight
+        job.queued += 1
+        self._pending.push(run)
+        self.metrics.inc("queued_total", (("job", job.name),))
+        self.metrics.set("pending", (), len(self._pending))
+
+    def _drain_pending(self):
+        """
+        Starts waiting runs, highest priority (raised by aging) first,
+        then by virtual start, as far as capacity allows.
+
+        Returns
+        -------
+        None.
+
+        """
+        if not self._pending:
+            return
+        self._pending.age(self.clock.monotonic())
+        blocked = []
+        while not (self.max_concurrency and \
+                   len(self._workers) >= self.max_concurrency):
+            run = self._pending.peek()
+            if run is None:
+                break
+            job = run.job
+            if job.cancelled:
+                self._pending.remove(run)
+                job.queued -= 1
+            elif job.max_instances and \
+                 (len(job.instances) >= job.max_instances):
+                # the runs of other jobs may start
+                self._pending.remove(run)
+                blocked.append(run)
+            elif not self._admit():
+                # no token left, the later runs wait as well
+                break
+            else:
+                self._pending.remove(run)
+                job.queued -= 1
+                self._start(run)
+        for run in blocked:
+            self._pending.put_back(run)
+        self.metrics.set("pending", (), len(self._pending))
+
+    def _start(
+            self,
+            run
+            ):
+        """
+        Spawns an attempt of the run and keeps track of it.
+
+        Parameters
+        ----------
+        run : _Run
+
+        Returns
+        -------
+        None.
+
+        """
+        job = run.job
+        p = self._spawn(job)
+        now = self.clock.monotonic()
+        if run.first is None:
+            run.first = now
+        if run.enqueued is None:
+            self.metrics.waited(job.priority, 0)
+        else:
+            self.metrics.waited(job.priority, now - run.enqueued)
+            self._virtual[job.priority] = max(self._virtual.get(job.priority, 0),
+                                              run.tag)
+            run.enqueued = None
+        self._workers[p] = (run, now)
+        job.instances.append(p)
+        self.metrics.started(job.name)
+        self.metrics.inc("dispatches_total", (("job", job.name),))
+        self._audit("started", job, p, attempt=run.retries)
+        if self.status:
+            self.status.started(job.name,
+                                self.clock.time(),
+                                getattr(p, "pid", None))
+        if len(job.instances) > 1:
+            self.metrics.inc("overlaps_total", (("job", job.name),))
+        if len(self._workers) > self._peak[0]:
+            self._peak = (len(self._workers), self.clock.time())
+        if self.store:
+            self.store.update(self._kind, job.name, last_run=self.clock.time())
+        timeouts = [t for t in (job.timeout,
+                                job.retry.attempt_timeout if job.retry else None)
+                    if t]
+        if timeouts:
+            self._timeouts[p] = self._push(now + min(timeouts),
+                                           self._timeout,
+                                           job,
+                                           p)
+
+    def _timeout(
+            self,
+            job,
+            at,
+            p
+            ):
+        """
+        Terminates the worker if it is still running, and kills it if it
+        is still alive kill_after seconds later.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the worker timed out
+        p : multiprocess.Process (or a handle with the same interface)
+
+        Returns
+        -------
+        None.
+
+        """
+        self._timeouts.pop(p, None)
+        if (p in self._workers) and hasattr(p, "terminate"):
+            self._print(f"Run of job: {job.name} timed out")
+            self.metrics.inc("timeouts_total", (("job", job.name),))
+            p.terminate()
+            if hasattr(p, "kill"):
+                self._push(self.clock.monotonic() + self.kill_after,
+                           self._kill,
+                           job,
+                           p)
+
+    def _kill(
+            self,
+            job,
+            at,
+            p
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+        at : float
+        p : multiprocess.Process
+
+        Returns
+        -------
+        None.
+
+        """
+        if p in self._workers:
+            self._print(f"Killing run of job: {job.name}")
+            p.kill()
+
+    def _failed(
+            self,
+            run,
+            p
+            ):
+        """
+        Queues a retry of the run in the timer queue, if its job's retry
+        policy allows one.
+
+        Parameters
+        ----------
+        run : _Run
+        p : multiprocess.Process (or a handle with the same interface)
+            the failed attempt
+
+        Returns
+        -------
+        bool
+            True if the run is retried
+
+        """
+        delay = run.job.retry.should_retry(run.retries,
+                                           p.exitcode,
+                                           getattr(p, "exception", None),
+                                           self.clock.monotonic() - run.first)
+        if delay is None:
+            return False
+        run.retries += 1
+        self._push(self.clock.monotonic() + delay, self._retry, run.job, run)
+        self._audit("retried", run.job, attempt=run.retries, delay=delay)
+        return True
+
+    def _retry(
+            self,
+            job,
+            at,
+            run
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the retry was due
+        run : _Run
+
+        Returns
+        -------
+        None.
+
+        """
+        self._print(f"Reattempting job: {job.name}")
+        self.metrics.retried(job.name)
+        self._request(run)
+
+    def _fire_key(
+            self,
+            job,
+            at
+            ):
+        """
+        Identifies a fire the same way on every scheduler sharing the job.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the job was due
+
+        Returns
+        -------
+        int
+            the wall-clock second of the fire
+
+        """
+        return round(self._to_wall(at))
+
+    def _claim(
+            self,
+            job,
+            at
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the job was due
+
+        Returns
+        -------
+        bool
+            True if this scheduler is to run the fire; a fire which can
+            not be claimed (coordinator unreachable) is not run
+
+        """
+        if not self.coordinator:
+            return True
+        try:
+            return self.coordinator.owns(self._kind, job.name) and \
+                   self.coordinator.claim(self._kind,
+                                          job.name,
+                                          self._fire_key(job, at))
+        except Exception as e:
+            self._print(f"Could not claim job: {job.name} ({e})")
+            return False
+
+    def _fire(
+            self,
+            job,
+            at
+            ):
+        """
+        Executes the job (if within its start/stop window) and queues
+        the next fire as well as the reattempt check.
+        If the next fire is already due, i.e. runs were missed (the host
+        was busy; for fires on the wall clock also suspended, or its clock
+        stepped, see _follow_wall_clock()), the job's misfire_policy
+        decides:
+            "fire_once" : run once now and carry on from the next fire
+            "fire_all"  : run once for every missed fire
+            "skip"      : run nothing now and carry on from the next fire
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the job was due
+
+        Returns
+        -------
+        None.
+
+        """
+        window = self._in_window(job)
+        if window == 1:
+            self._print(f"Expired job: {job.name}")
+            if self.store:
+                self.store.remove(self._kind, [job.name])
+            return
+        now = self.clock.monotonic()
+        job.lateness = now - at
+        next_at = self._next_fire(job, at)
+        missed = next_at <= now
+        if missed and (job.misfire_policy != "fire_all"):
+            next_at = self._next_fire(job, now)
+        if missed and (job.misfire_policy == "skip"):
+            self._print(f"Skipped late run of job: {job.name} "+\
+                        f"({job.lateness:.3f}s late)")
+            self._audit("skipped", job, reason="misfire")
+        elif (window == 0) and self._claim(job, at):
+            self.metrics.fired(job.name, job.lateness)
+            delay = min(self._spread(job), next_at - now)
+            if delay > 0:
+                self._push(now + delay, self._deferred, job)
+            else:
+                self._request(_Run(job))
+        self._schedule_fire(job, next_at)
+        if self.store:
+            self.store.update(self._kind,
+                              job.name,
+                              next_fire=self._to_wall(next_at))
+
+    def _spread(
+            self,
+            job
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        float
+            seconds by which the run of a fire of the job is dispatched
+            late: its share of the stagger window plus a random jitter
+
+        """
+        delay = 0
+        if self.stagger:
+            share = int.from_bytes(md5(job.name.encode()).digest()[:8], "big")
+            delay += share / 2**64 * self.stagger
+        jitter = self.jitter if job.jitter is None else job.jitter
+        if jitter:
+            delay += uniform(0, jitter)
+        return delay
+
+    def _deferred(
+            self,
+            job,
+            at
+            ):
+        """
+        Timer queue action, due once a fire's stagger and jitter delay
+        is over (see _spread()): requests its run.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the entry was due
+
+        Returns
+        -------
+        None.
+
+        """
+        self._request(_Run(job))
+
+    def _dispatch(
+            self,
+            until=None
+            ):
+        """
+        Sleeps exactly until the earliest deadline in the timer queue, or
+        until a worker finishes, and executes whatever is due.
+        Fires on the wall clock are looked at again at least every
+        wall_clock_check seconds, see _follow_wall_clock().
+        Returns once nothing is queued or running.
+
+        Parameters
+        ----------
+        until : float, optional
+            time.monotonic() (of the scheduler's clock) at which to return
+            regardless
+            the default is None
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            while self._heap or self._pending or self._workers:
+                self._reap()
+                self._drain_pending()
+                if self.wall_clock_check:
+                    self._follow_wall_clock()
+                now = self.clock.monotonic()
+                if (until is not None) and (now >= until):
+                    break
+                if not self._heap:
+                    if self._workers or self._pending:
+                        self.clock.wait(self._condition,
+                                        None if until is None else until - now)
+                    continue
+                if self._is_stale(self._heap[0]):
+                    # without waiting for it (a job process ends as soon
+                    # as nothing but such entries are left)
+                    heappop(self._heap)
+                    self._stale = max(0, self._stale - 1)
+                    continue
+                at, _, action, job, args = self._heap[0]
+                delay = at - now
+                if delay > 0:
+                    if self.store:
+                        self.store.flush()
+                    if until is not None:
+                        delay = min(delay, until - now)
+                    if self.wall_clock_check:
+                        delay = min(delay, self.wall_clock_check)
+                    self.clock.wait(self._condition, delay)
+                    continue
+                heappop(self._heap)
+                try:
+                    action(job, at, *args)
+                except Exception as e:
+                    self._print(str(e))
+            if until is None:
+                # under the lock: a job added from now on starts a new thread
+                self._dispatcher = None
+
+    def _schedule(
+            self,
+            job
+            ):
+        """
+        The loop of a job process (see _job_process): a dispatcher with a
+        single job.
+
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        None.
+
+        """
+        self._heap = []
+        self._offset = self.clock.time() - self.clock.monotonic()
+        self._schedule_fire(job, self._next_fire(job))
+        self._dispatch()
+
+    def _recover(self):
+        """
+        Loads jobs from the store which were not added (again) in this
+        process.
+
+        Returns
+        -------
+        next_fires : dict
+            job_name : epoch at which the job was due to fire next
+
+        """
+        next_fires = {}
+        if not self.store:
+            return next_fires
+        for job, description, next_fire in self.store.load(self._kind):
+            if job.name not in self._specs:
+                self._jobs[job.name] = [description]
+                self._specs[job.name] = job
+                self._link(job)
+            if next_fire is not None:
+                next_fires[job.name] = next_fire
+        return next_fires
+
+    def _first_fire(
+            self,
+            job,
+            next_fire=None
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+        next_fire : float, optional
+            epoch at which the job was due as per the store; runs missed
+            since then are handled by the job's misfire_policy
+
+        Returns
+        -------
+        float
+            time.monotonic() at which the job should fire first
+
+        """
+        if next_fire is None:
+            return self._next_fire(job)
+        at = self._to_monotonic(next_fire)
+        if job.epoch is None:
+            # keep recurring jobs on the grid they were on before
+            job.epoch = at
+        if (at < self.clock.monotonic()) and (job.misfire_policy == "skip"):
+            at = self._next_fire(job, self.clock.monotonic())
+        return at
+
+    def run(self):
+        """
+        Spawns tasks simultaneously.
+
+        Raises
+        ------
+        Exception
+            if a job depends on a job that does not exist
 
         Returns
         -------
         None.
 
         """
-        self._print("\tScheduled jobs:")
-        names = {p.name:p.is_alive() for p in self._processes}
-        for _, name in enumerate(self._jobs):
-            msg = f"{self._jobs[name][0]}"
-            try:
-                msg += f" running in {self._jobs[name][1]}"
-                if not names[name]:
-                    continue
-            except:
-                pass
-            self._print(msg)
+        if self.dispatcher:
+            self._queue_jobs()
+            self._start_dispatcher()
+            return
+        try:
+            processes = [p for p in self._processes if p.pid is None]
+            if processes:
+                [p.start() for p in processes]
+                for p in processes:
+                    self._jobs[p.name].append(p.pid)
+            self._started = True
+        except:
+            [p.terminate() for p in self._processes]
+            pass
 
-    def timezones(self):
+    def _queue_jobs(self):
         """
-        A quick look-up of all pytz time-zones.
+        Queues the first fire of every job not queued yet (dispatcher
+        mode), including the jobs recovered from the store.
 
         Returns
         -------
-        all_timezones : list
-            pytz.all_timezones
+        None.
 
         """
-        return all_timezones
+        next_fires = self._recover()
+        self._validate_upstreams()
+        if not self._started:
+            self._offset = self.clock.time() - self.clock.monotonic()
+        with self._condition:
+            for job in self._specs.values():
+                if job.paused or (job.fire is not None) or job.depends_on:
+                    continue
+                # as _schedule_fire(), heapified once for all jobs
+                at = self._first_fire(job, next_fires.get(job.name))
+                job.fire = next(self._sequence)
+                self._heap.append((at, job.fire, self._fire, job, ()))
+                self._scheduled(job, at)
+            heapify(self._heap)
+            self._started = True
 
-    def _print(
+    def simulate(
             self,
-            message
+            seconds
             ):
         """
-        To silence, this class, if need be.
+        Replays the schedule for these many seconds of its VirtualClock,
+        in the calling thread and as fast as the jobs allow (instead of
+        run()). With a simulation.SimulatedExecutor nothing is run, every
+        run takes the executor's run_time, so a week of thousands of jobs
+        takes seconds; any other executor runs the jobs for real, with
+        the clock jumping over the time in between.
+        Can be called again to carry on from where it stopped.
 
         Parameters
         ----------
-        message : str
-            description
+        seconds : float
+
+        Raises
+        ------
+        Exception
+            if the scheduler is not a dispatcher or has no VirtualClock
 
         Returns
         -------
-        None.
+        report : dict
+            since the clock started:
+            "seconds"          : simulated so far
+            "fires"            : {job_name : fires}
+            "runs"             : {job_name : runs (retries included)}
+            "skipped"          : {job_name : runs skipped (overlap, ...)}
+            "overlaps"         : {job_name : runs started while another
+                                  run of the job was going on}
+            "peak_concurrency" : the most runs going on at the same time
+            "peak_at"          : epoch (virtual) at which it was reached
 
         """
-        if self.verbose:
-            print(message)
+        if not self.dispatcher:
+            raise Exception("simulate() requires dispatcher=True")
+        if not isinstance(self.clock, VirtualClock):
+            raise Exception("simulate() requires clock=VirtualClock()")
+        self._queue_jobs()
+        self._dispatch(self.clock.monotonic() + seconds)
+        snapshot = self.metrics.snapshot()
+        report = {"seconds":self.clock.monotonic()}
+        for name, metric in (("fires", "fires_total"),
+                             ("runs", "dispatches_total"),
+                             ("skipped", "skipped_total"),
+                             ("overlaps", "overlaps_total")):
+            report[name] = {}
+            for labels, value in snapshot.get(metric, {}).items():
+                # summed over the other labels, eg. the reason of a skip
+                job_name = dict(labels)["job"]
+                report[name][job_name] = report[name].get(job_name, 0) + value
+        report["peak_concurrency"], report["peak_at"] = self._peak
+        return report
 
-    def _sleep(
-            self,
-            period_in_seconds
-               ):
+    def _start_dispatcher(self):
         """
-        Resourceful sleep
-
-        Parameters
-        ----------
-        period_in_seconds : int
+        Starts the dispatcher thread, unless it is running.
 
         Returns
         -------
         None.
 
         """
-        if period_in_seconds > 0:
-            s = time() + period_in_seconds
-            for x in self._workers:
-                if not x.is_alive():
-                    x.join()
-                    self._workers.remove(x)
-            sleep(s - time())
+        with self._condition:
+            if self._dispatcher is None:
+                self._dispatcher = Thread(target=self._dispatch,
+                                          name="simple_scheduler")
+                self._dispatcher.start()
 
-    def _execute(
+    def _add_job(
             self,
-            tz,
-            start,
-            stop,
-            function,
-            period_in_seconds,
-            number_of_reattempts,
-            reattempt_duration_in_seconds
+            job,
+            description
             ):
         """
+        Registers the job with the dispatcher or assigns it to a process;
+        once the scheduler is running the job starts right away.
+
         Parameters
         ----------
-        tz : str
-            standard time zone (call the method .timezones() for more info)
-            the default is "GMT"
-        start : str, optional
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-            the default is None
-        stop : str, optional
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-            the default is None
-        function : callable function
-            name of the function which needs to be scheduled
-        period_in_seconds : int
-        number_of_reattempts : int
-            each event is tried these many number of times, but executed once
-        reattempt_duration_in_seconds : int
-            duration to wait (in seconds) after un-successful attempt
+        job : _Job
+        description : str
+            used by job_summary()
 
         Returns
         -------
-        int
+        None.
 
         """
-        time_ = datetime.now(timezone(tz)).ctime()[4:]
-        stop = stop if stop else time_
-        start = start if start else time_
-        if (time_ >= str(start)) & (time_ <= str(stop)):
-            p = Process(target = function)
-            p.start(); self._workers.append(p)
-            timer = time() + period_in_seconds
-            for tries in range(number_of_reattempts + 1):
-                self._sleep(
-                    period_in_seconds = timer - \
-                                        time() - \
-                                        reattempt_duration_in_seconds
-                            )
-                if (number_of_reattempts > 1) & (p.exitcode != 0):
-                    p.join()
-                    p = Process(target = function)
-                    p.start(); self._workers.append(p)
-            self._sleep(period_in_seconds= timer - time())
-            return 1
-        elif time_ < str(start):
-            return 1
-        elif time_ > str(stop):
-            return 0
+        if self.dispatcher:
+            with self._condition:
+                if job.name in self._specs:
+                    # a job of the same name is replaced
+                    self._unschedule(self._specs[job.name])
+                    self._unlink(self._specs[job.name])
+                    self._specs[job.name].cancelled = True
+                self._jobs[job.name] = [description]
+                self._specs[job.name] = job
+                self._link(job)
+                if self.status:
+                    self.status.register(job.name)
+                if self._started and not job.depends_on:
+                    self._schedule_fire(job, self._first_fire(job))
+                    self._start_dispatcher()
+            if self._bulk is not None:
+                self._bulk.append((job, description))
+            elif self.store:
+                self.store.add(self._kind, [(job, description)])
+        else:
+            self._jobs[job.name] = [description]
+            self._specs[job.name] = job
+            if self.status:
+                # before any job process looks its row up
+                self.status.register(job.name)
+            # imported on first use, it is the heaviest import by far
+            from multiprocess import get_context
+            context = get_context(self.start_method)
+            if self.start_method == "forkserver":
+                context.set_forkserver_preload([type(self).__module__])
+            self._processes.append(
+                context.Process(
+                    target=_job_process,
+                    name=job.name,
+                    args=(type(self), self._settings(), job)
+                    )
+                )
+            if self._started:
+                self._processes[-1].start()
+                self._jobs[job.name].append(self._processes[-1].pid)
 
-    def run(self):
+    def _settings(self):
         """
-        Spawns tasks simultaneously.
+        Returns
+        -------
+        dict
+            the parameters of the scheduler of a job process
+
+        """
+        # no max_concurrency, rate_limit or priorities: a job process has
+        # no pending queue shared with the other jobs
+        return dict(verbose=self.verbose,
+                    executor=self.executor,
+                    coordinator=self.coordinator,
+                    jitter=self.jitter,
+                    stagger=self.stagger,
+                    clock=self.clock,
+                    audit=self.audit,
+                    status=self.status)
+
+    def add_jobs(
+            self,
+            jobs
+            ):
+        """
+        Adds many jobs at once; with a job store they are written in a
+        single transaction. If any job is invalid none of them is added.
+
+        Parameters
+        ----------
+        jobs : list(dict)
+            keyword arguments for add_job, one dict per job
 
         Returns
         -------
         None.
 
         """
+        self._bulk = []
         try:
-            if self._processes:
-                [p.start() for p in self._processes]
-                for p in self._processes:
-                    self._jobs[p.name].append(p.pid)
+            for kwargs in jobs:
+                self.add_job(**kwargs)
+            if self.store:
+                self.store.add(self._kind, self._bulk)
         except:
-            [p.terminate() for p in self._processes]
-            pass
+            with self._condition:
+                for job, _ in self._bulk:
+                    self._unschedule(job)
+                    self._unlink(job)
+                    job.cancelled = True
+                    self._specs.pop(job.name, None)
+                    self._jobs.pop(job.name, None)
+            raise
+        finally:
+            self._bulk = None
 
     def _manifest_function(
             self,
@@ -212,10 +2012,30 @@ class Schedule():
             self._processes = []
             raise
 
+    def _timezone(
+            self,
+            tz
+            ):
+        """
+        Resolves (and caches) a time zone.
+
+        Parameters
+        ----------
+        tz : str
+            standard time zone (call the method .timezones() for more info)
+
+        Returns
+        -------
+        zoneinfo.ZoneInfo
+
+        """
+        return get_timezone(tz)
+
     def _validate_start_stop(
             self,
             start,
-            stop
+            stop,
+            tz="GMT"
             ):
         """
         Parameters
@@ -226,6 +2046,9 @@ class Schedule():
         stop : str, optional
             of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
             the default is None
+        tz : str, optional
+            time zone in which start/stop are given
+            the default is "GMT"
 
         Raises
         ------
@@ -233,21 +2056,29 @@ class Schedule():
 
         Returns
         -------
-        None.
+        tuple(float, float)
+            start and stop as epochs (None if not given)
 
         """
+        bounds = []
         try:
             for x in [start, stop]:
                 if x:
-                    month, date, time, year = start.split(" ")
+                    month, date, time_, year = x.split(" ")
                     assert(month.istitle()); assert(len(month) == 3)
                     assert(date.isnumeric()); assert(len(date) == 2)
-                    for t in time.split(":"):
+                    for t in time_.split(":"):
                         assert(t.isnumeric()); assert(len(t) == 2)
                     assert(year.isnumeric()); assert(len(year) == 4)
+                    bounds.append(to_epoch(
+                        datetime.strptime(x, "%b %d %H:%M:%S %Y"),
+                        self._timezone(tz)))
+                else:
+                    bounds.append(None)
         except:
             raise Exception('start/stop must be of the form'+\
                             ' "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")')
+        return tuple(bounds)
 
     def remove_job(
             self,
@@ -266,6 +2097,10 @@ class Schedule():
         None.
 
         """
+        if self.dispatcher and (job_name in self._specs):
+            self._remove_spec(job_name)
+            self.job_summary()
+            return
         remove_jobs = [p for p in self._processes if p.name == job_name]
         if remove_jobs:
             for p in remove_jobs:
@@ -274,6 +2109,290 @@ class Schedule():
         else:
             self._print("No such job_name exists.")
 
+    def _get_spec(
+            self,
+            job_name
+            ):
+        """
+        Helper function for the runtime control of jobs.
+
+        Parameters
+        ----------
+        job_name : str
+
+        Raises
+        ------
+        Exception
+            - if the scheduler is not a dispatcher
+            - if there is no such job
+
+        Returns
+        -------
+        _Job
+
+        """
+        if not self.dispatcher:
+            raise Exception("Jobs can only be paused, resumed, modified or "+\
+                            "run now with dispatcher=True")
+        try:
+            return self._specs[job_name]
+        except KeyError:
+            raise Exception(f"No such job_name exists: {job_name}")
+
+    def _persist(
+            self,
+            job
+            ):
+        """ Writes a changed job to the store, if any."""
+        if self.store:
+            self.store.add(self._kind, [(job, self._jobs[job.name][0])])
+
+    def _resume_fire(
+            self,
+            job
+            ):
+        """
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        float
+            time.monotonic() of the job's next fire from now on
+
+        """
+        return self._next_fire(job, self.clock.monotonic())
+
+    def _reschedule(
+            self,
+            job
+            ):
+        """
+        Replaces the queued fire of the job by its next fire from now on,
+        O(log n).
+
+        Parameters
+        ----------
+        job : _Job
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            self._unschedule(job)
+            at = self._resume_fire(job)
+            self._schedule_fire(job, at)
+            if self.store:
+                self.store.update(self._kind,
+                                  job.name,
+                                  next_fire=self._to_wall(at))
+            self._start_dispatcher()
+
+    def pause_job(
+            self,
+            job_name
+            ):
+        """
+        Stops firing a job until resume_job(); runs in flight carry on.
+
+        Parameters
+        ----------
+        job_name : str
+
+        Returns
+        -------
+        None.
+
+        """
+        job = self._get_spec(job_name)
+        with self._condition:
+            job.paused = True
+            self._unschedule(job)
+            self._persist(job)
+            if self.status:
+                self.status.set_state(job_name, "paused")
+        self._print(f"Paused job: {job_name}")
+
+    def resume_job(
+            self,
+            job_name
+            ):
+        """
+        Fires a paused job again, from its next fire time on (fires missed
+        while paused are not made up for).
+
+        Parameters
+        ----------
+        job_name : str
+
+        Returns
+        -------
+        None.
+
+        """
+        job = self._get_spec(job_name)
+        with self._condition:
+            if not job.paused:
+                return
+            job.paused = False
+            if self._started and not job.depends_on:
+                self._reschedule(job)
+            self._persist(job)
+            if self.status:
+                self.status.set_state(job_name, "active")
+        self._print(f"Resumed job: {job_name}")
+
+    def _modify(
+            self,
+            job,
+            changes
+            ):
+        """
+        Validates all changes, then applies them to the job.
+
+        Parameters
+        ----------
+        job : _Job
+        changes : dict
+            see modify_job()
+
+        Raises
+        ------
+        Exception
+            if any change is invalid, none is applied
+
+        Returns
+        -------
+        bool
+            True if the fire times of the job have changed
+
+        """
+        unknown = set(changes) - {"args", "kwargs", "start", "stop",
+                                  "misfire_policy", "max_instances", "overlap",
+                                  "retry", "timeout", "executor", "capture",
+                                  "inputs", "chunk_size", "jitter",
+                                  "priority", "weight"}
+        if unknown:
+            raise Exception(f"Cannot modify {sorted(unknown)} of a job")
+        if "misfire_policy" in changes:
+            self._validate_misfire_policy(changes["misfire_policy"])
+        if "chunk_size" in changes:
+            self._validate_chunk_size(changes["chunk_size"])
+        if changes.get("jitter") is not None:
+            self._validate_jitter(changes["jitter"])
+        self._validate_priority(changes.get("priority", job.priority),
+                                changes.get("weight", job.weight))
+        self._validate_capture(changes.get("capture", job.capture))
+        self._validate_overlap(changes.get("max_instances", job.max_instances),
+                               changes.get("overlap", job.overlap))
+        start, stop = self._validate_start_stop(changes.get("start"),
+                                                changes.get("stop"),
+                                                job.tz)
+        if ("args" in changes) or ("kwargs" in changes):
+            job.function = partial(job.function.func,
+                                   *changes.get("args", job.function.args),
+                                   **changes.get("kwargs", job.function.keywords))
+        for name in ("misfire_policy", "max_instances", "overlap", "retry",
+                     "timeout", "executor", "capture", "inputs", "chunk_size",
+                     "jitter", "priority", "weight"):
+            if name in changes:
+                setattr(job, name, changes[name])
+        if "start" in changes:
+            job.start = start
+        if "stop" in changes:
+            job.stop = stop
+        return False
+
+    def modify_job(
+            self,
+            job_name,
+            **changes
+            ):
+        """
+        Changes a job in place, without restarting anything; a new
+        period/when takes effect from now on, runs in flight carry on.
+
+        Parameters
+        ----------
+        job_name : str
+        **changes
+            any of period_in_seconds (recurring), when (event), args,
+            kwargs, start, stop, misfire_policy, max_instances, overlap,
+            retry, timeout, executor, capture, inputs, chunk_size,
+            jitter, priority and weight; as in add_job
+
+        Raises
+        ------
+        Exception
+            if a change is invalid (then nothing is changed)
+
+        Returns
+        -------
+        None.
+
+        """
+        job = self._get_spec(job_name)
+        if job.depends_on and \
+           (("when" in changes) or ("period_in_seconds" in changes)):
+            raise Exception(f"{job_name} is triggered by the jobs it depends "+\
+                            "on, it has no when/period_in_seconds")
+        with self._condition:
+            if self._modify(job, changes) and self._started and \
+               not job.paused:
+                self._reschedule(job)
+            self._jobs[job_name][0] = self._describe(job)
+            self._persist(job)
+        self._print(f"Modified job: {job_name}")
+
+    def _run_now(
+            self,
+            job,
+            at
+            ):
+        """
+        Timer queue action queued by run_job_now(): a fire of its own,
+        which leaves the job's schedule as it is.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which run_job_now() was called
+
+        Returns
+        -------
+        None.
+
+        """
+        self.metrics.fired(job.name, self.clock.monotonic() - at)
+        self._request(_Run(job))
+
+    def run_job_now(
+            self,
+            job_name
+            ):
+        """
+        Runs a job once, right away, on top of its schedule (paused jobs
+        as well; start/stop are not checked).
+
+        Parameters
+        ----------
+        job_name : str
+
+        Returns
+        -------
+        None.
+
+        """
+        job = self._get_spec(job_name)
+        if not self._started:
+            raise Exception("The scheduler is not running; call run() first")
+        self._push(self.clock.monotonic(), self._run_now, job)
+        self._start_dispatcher()
+
     def _remove_job(
             self,
             this_job
@@ -294,11 +2413,47 @@ class Schedule():
             if this_job.is_alive():
                 self._print(f"Removed job: {this_job.name}")
                 self._jobs.pop(this_job.name)
+                self._specs.pop(this_job.name, None)
                 self._processes.remove(this_job)
                 this_job.terminate()
+                if self.status:
+                    # the job's process writes its row: it may have died
+                    # half way through a write
+                    this_job.join(1)
+                    self.status.reset(this_job.name)
         except:
             raise
 
+    def _remove_spec(
+            self,
+            job_name
+            ):
+        """
+        Helper function for the dispatcher; the job's pending entries in
+        the timer queue are dropped when they come due.
+
+        Parameters
+        ----------
+        job_name : str
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._condition:
+            job = self._specs.pop(job_name)
+            self._unschedule(job)
+            self._unlink(job)
+            job.cancelled = True
+            self._jobs.pop(job_name, None)
+            if self.store:
+                self.store.remove(self._kind, [job_name])
+            if self.status:
+                self.status.set_state(job_name, "removed")
+            self._print(f"Removed job: {job_name}")
+            self._condition.notify()
+
     def clear(self):
         """
         Stops all jobs as well as clears them from the schedule.
@@ -308,9 +2463,40 @@ class Schedule():
         None.
 
         """
+        executors = [self.executor, self._fan_out_executor] + \
+                    [job.executor for job in self._specs.values()]
+        if self.dispatcher:
+            for job_name in list(self._specs):
+                self._remove_spec(job_name)
+        with self._condition:
+            self._heap = []
+            self._stale = 0
+            self._timeouts = {}
+            self._started = False
+            self._refill = None
+            self._peak = (0, None)
+            self._virtual = {}
+            self._pending.clear()
+            for p, (run, _) in self._workers.items():
+                if hasattr(p, "terminate") and p.is_alive():
+                    p.terminate()
+                if self.status:
+                    self.status.reset(run.job.name)
+            self._workers = {}
+            self._condition.notify()
         for p in self._processes:
             self._remove_job(p)
         # in case a process is still alive do the following
         for p in [p for p in self._processes if p.is_alive()]:
             self._remove_job(p)
+        for executor in executors:
+            if executor:
+                executor.shutdown()
+        if self.coordinator:
+            try:
+                self.coordinator.leave()
+            except Exception as e:
+                self._print(str(e))
+        if self.audit:
+            self.audit.flush()
         self.job_summary()
@@ -0,0 +1,146 @@
+from time import time, monotonic
+from heapq import heappush, heappop
+from itertools import count
+
+class Clock():
+    """ Where schedulers read the time and wait: the real clock."""
+
+    def time(self):
+        """
+        Returns
+        -------
+        float
+            the wall clock, as time.time()
+
+        """
+        return time()
+
+    def monotonic(self):
+        """
+        Returns
+        -------
+        float
+            as time.monotonic()
+
+        """
+        return monotonic()
+
+    def wait(
+            self,
+            condition,
+            timeout=None
+            ):
+        """
+        Waits on the condition (held by the caller) until notified or
+        for timeout seconds.
+
+        Parameters
+        ----------
+        condition : threading.Condition
+        timeout : float, optional
+            the default is None (until notified)
+
+        Returns
+        -------
+        bool
+            False if the timeout expired
+
+        """
+        return condition.wait(timeout)
+
+class VirtualClock(Clock):
+    """ A clock that only moves when a scheduler waits on it: instead of
+        sleeping, the wait jumps straight to its deadline (or to the next
+        timer of the clock, if earlier). Days of schedule run in seconds,
+        and the same jobs always fire at the same times."""
+
+    def __init__(
+            self,
+            start=None
+            ):
+        """
+        Parameters
+        ----------
+        start : float or datetime.datetime, optional
+            the wall-clock time the clock starts at, an epoch or a
+            datetime (naive: local time of the host)
+            the default is None (now)
+
+        Returns
+        -------
+        None.
+
+        """
+        if start is None:
+            start = time()
+        elif not isinstance(start, (int, float)):
+            start = start.timestamp()
+        self.start = start
+        self._now = 0.0
+        self._timers = []
+        self._sequence = count()
+
+    def time(self):
+        return self.start + self._now
+
+    def monotonic(self):
+        return self._now
+
+    def call_at(
+            self,
+            at,
+            function
+            ):
+        """
+        Calls function() once the clock reaches at.
+
+        Parameters
+        ----------
+        at : float
+            as .monotonic()
+        function : callable
+
+        Returns
+        -------
+        None.
+
+        """
+        heappush(self._timers, (at, next(self._sequence), function))
+
+    def advance(
+            self,
+            seconds
+            ):
+        """
+        Moves the clock forward, calling the timers that become due.
+
+        Parameters
+        ----------
+        seconds : float
+
+        Returns
+        -------
+        None.
+
+        """
+        until = self._now + seconds
+        while self._timers and (self._timers[0][0] <= until):
+            at, _, function = heappop(self._timers)
+            self._now = max(self._now, at)
+            function()
+        self._now = until
+
+    def wait(
+            self,
+            condition,
+            timeout=None
+            ):
+        if self._timers and ((timeout is None) or
+                             (self._timers[0][0] <= self._now + timeout)):
+            self.advance(max(0, self._timers[0][0] - self._now))
+            return True
+        if timeout is None:
+            # nothing can happen on this clock, wait for real workers
+            return condition.wait()
+        self.advance(timeout)
+        return False
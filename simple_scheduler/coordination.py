@@ -0,0 +1,231 @@
+import os
+import sqlite3
+from time import time, sleep
+from uuid import uuid4
+from hashlib import md5
+from socket import gethostname
+from threading import Lock, Thread
+
+class Coordinator():
+    """ Lets several schedulers (workers of one host, or hosts sharing the
+        backend) run the same set of jobs, while every fire runs once."""
+
+    def owns(
+            self,
+            kind,
+            job_name
+            ):
+        """
+        Parameters
+        ----------
+        kind : str
+            name of the scheduler class, eg. "Event"
+        job_name : str
+
+        Returns
+        -------
+        bool
+            False if the job belongs to another scheduler (sharding)
+
+        """
+        return True
+
+    def claim(
+            self,
+            kind,
+            job_name,
+            fire
+            ):
+        """
+        Parameters
+        ----------
+        kind : str
+        job_name : str
+        fire : int
+            identifies the fire, the same on every scheduler
+
+        Returns
+        -------
+        bool
+            True for exactly one of the schedulers claiming this fire
+
+        """
+        raise NotImplementedError
+
+    def leave(self):
+        """
+        Gives up the membership of this scheduler, so that its jobs move
+        to the other members right away.
+
+        Returns
+        -------
+        None.
+
+        """
+        pass
+
+class SQLiteCoordinator(Coordinator):
+    """ Claims and leases in a SQLite file shared by all schedulers (a
+        local stand-in for a database or a lock service).
+        A fire runs where its claim (an INSERT on a primary key) succeeds.
+        With shard=True every scheduler holds a lease on its membership,
+        renewed by a background thread, and a job is only tried by the live member
+        it hashes to (rendezvous hashing, so a member joining or leaving
+        moves only its own share of the jobs)."""
+
+    def __init__(
+            self,
+            path="simple_scheduler.db",
+            instance=None,
+            lease_seconds=30,
+            shard=False,
+            keep_claims_seconds=86400
+            ):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            the SQLite database file, on storage every scheduler can reach
+            the default is "simple_scheduler.db"
+        instance : str, optional
+            unique name of this scheduler
+            the default is "<hostname>:<pid>:<random>"
+        lease_seconds : float, optional
+            a member that has not renewed its lease for this long is
+            considered gone and its jobs move to the others
+            the default is 30
+        shard : bool, optional
+            spread the jobs across the live schedulers, instead of every
+            scheduler racing for every fire
+            the default is False
+        keep_claims_seconds : float, optional
+            claims older than this are deleted
+            the default is 86400
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        self.instance = instance if instance else \
+                        f"{gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.shard = shard
+        self.keep_claims_seconds = keep_claims_seconds
+        self._lock = Lock()
+        self._pid = None
+        self._connection = None
+        self._heartbeat = None
+        self._members = []
+        self._renewed = 0
+        self._purged = 0
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS claims (
+                    kind TEXT,
+                    name TEXT,
+                    fire INTEGER,
+                    owner TEXT,
+                    claimed REAL,
+                    PRIMARY KEY (kind, name, fire)
+                    )""")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS members (
+                    instance TEXT PRIMARY KEY,
+                    expires REAL
+                    )""")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_connection"] = None
+        state["_pid"] = None
+        state["_heartbeat"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _connect(self):
+        """ A connection of this process (forked processes need their own)."""
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path,
+                                               timeout=self.lease_seconds,
+                                               check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def _beat(self):
+        while True:
+            sleep(self.lease_seconds / 3)
+            if self._heartbeat != os.getpid():
+                return
+            try:
+                with self._lock:
+                    self._renew()
+            except Exception:
+                pass
+
+    def _renew(self):
+        """ Renews the lease of this scheduler and reads the live members,
+            at most three times per lease."""
+        now = time()
+        if self._heartbeat != os.getpid():
+            # the heartbeat of this process (threads do not survive a fork)
+            self._heartbeat = os.getpid()
+            Thread(target=self._beat,
+                   name="simple_scheduler_heartbeat",
+                   daemon=True).start()
+        elif now - self._renewed < self.lease_seconds / 3:
+            return
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO members (instance, expires) "+\
+                "VALUES (?, ?)",
+                (self.instance, now + self.lease_seconds))
+            connection.execute("DELETE FROM members WHERE expires < ?",
+                               (now,))
+            self._members = [instance for (instance,) in connection.execute(
+                "SELECT instance FROM members")]
+        self._renewed = now
+
+    def owns(
+            self,
+            kind,
+            job_name
+            ):
+        if not self.shard:
+            return True
+        with self._lock:
+            self._renew()
+            members = self._members
+        owner = max(members,
+                    key=lambda m: md5(f"{m}|{kind}|{job_name}".encode()).digest())
+        return owner == self.instance
+
+    def claim(
+            self,
+            kind,
+            job_name,
+            fire
+            ):
+        now = time()
+        with self._lock, self._connect() as connection:
+            claimed = connection.execute(
+                "INSERT OR IGNORE INTO claims "+\
+                "(kind, name, fire, owner, claimed) VALUES (?, ?, ?, ?, ?)",
+                (kind, job_name, fire, self.instance, now)).rowcount == 1
+            if now - self._purged > self.keep_claims_seconds / 24:
+                connection.execute("DELETE FROM claims WHERE claimed < ?",
+                                   (now - self.keep_claims_seconds,))
+                self._purged = now
+        return claimed
+
+    def leave(self):
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM members WHERE instance = ?",
+                               (self.instance,))
+            self._heartbeat = None
+            self._renewed = 0
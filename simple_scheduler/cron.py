@@ -0,0 +1,299 @@
+from datetime import datetime, timedelta
+from heapq import heappush, heappop, merge
+
+from simple_scheduler.timezones import to_epoch, to_local
+
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun",
+           "jul", "aug", "sep", "oct", "nov", "dec"]
+_WEEKDAYS = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+def _next_bit(
+        bits,
+        i
+        ):
+    """ The lowest set bit of bits at position >= i, None if there is none."""
+    x = bits >> i
+    if not x:
+        return None
+    return i + (x & -x).bit_length() - 1
+
+class Cron():
+    """ A cron (or quartz-like, with seconds) expression, parsed once into
+        one bitset per field:
+
+            [second] minute hour day-of-month month day-of-week
+
+        Each field takes "*" (or "?"), numbers, ranges "a-b", lists "a,b",
+        steps "*/n", "a-b/n", "a/n"; months and days of the week also take
+        names (jan..dec, sun..sat; 0 and 7 are both sunday). With 5 fields
+        the second is 0. As in cron, when both day-of-month and day-of-week
+        are restricted a day matching either one fires.
+
+        eg. Cron("*/15 9-17 * * mon-fri"), Cron("30 0 12 1,15 * *")"""
+
+    _RANGES = [(0, 59), (0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(
+            self,
+            expression
+            ):
+        """
+        Parameters
+        ----------
+        expression : str
+
+        Raises
+        ------
+        Exception
+            if the expression cannot be parsed
+
+        Returns
+        -------
+        None.
+
+        """
+        self.expression = expression
+        fields = expression.lower().split()
+        if len(fields) == 5:
+            fields = ["0"] + fields
+        if len(fields) != 6:
+            raise Exception(f'"{expression}" must have 5 or 6 fields: '+\
+                            '[second] minute hour day-of-month month day-of-week')
+        try:
+            (self.seconds, self.minutes, self.hours,
+             self.days, self.months, weekdays) = [
+                self._parse(field, low, high, names)
+                for field, (low, high), names in zip(
+                    fields,
+                    self._RANGES,
+                    [None, None, None, None, _MONTHS, _WEEKDAYS])
+                ]
+        except Exception:
+            raise Exception(f'"{expression}" is not a valid cron expression')
+        # 7 is sunday as well
+        self.weekdays = (weekdays | (weekdays >> 7)) & 0b1111111
+        self._any_day = fields[3] in ("*", "?")
+        self._any_weekday = fields[5] in ("*", "?")
+        if not all((self.seconds, self.minutes, self.hours, self.days,
+                    self.months, self.weekdays)):
+            raise Exception(f'"{expression}" never fires')
+
+    def _parse(
+            self,
+            field,
+            low,
+            high,
+            names
+            ):
+        """
+        Returns
+        -------
+        bits : int
+            n-th bit set if value n is in the field
+
+        """
+        def value(x):
+            if names and x in names:
+                return names.index(x) + (1 if names is _MONTHS else 0)
+            x = int(x)
+            assert low <= x <= high
+            return x
+
+        bits = 0
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+                assert step > 0
+            if part in ("*", "?"):
+                first, last = low, high
+            elif "-" in part:
+                first, last = (value(x) for x in part.split("-"))
+                assert first <= last
+            else:
+                first = value(part)
+                last = high if step > 1 else first
+            for n in range(first, last + 1, step):
+                bits |= 1 << n
+        return bits
+
+    def _day_matches(
+            self,
+            day
+            ):
+        day_bit = (self.days >> day.day) & 1
+        weekday_bit = (self.weekdays >> ((day.weekday() + 1) % 7)) & 1
+        if self._any_day:
+            return bool(weekday_bit)
+        if self._any_weekday:
+            return bool(day_bit)
+        return bool(day_bit | weekday_bit)
+
+    def iter_fire_times(
+            self,
+            after
+            ):
+        """
+        Walks the calendar once, yielding every fire time after "after".
+
+        Parameters
+        ----------
+        after : datetime.datetime
+            naive, local to the time zone of the job
+
+        Returns
+        -------
+        generator of datetime.datetime (naive), strictly after "after"
+
+        """
+        after = after.replace(microsecond=0)
+        day = datetime(after.year, after.month, after.day)
+        # 8 years without a match (eg. "0 0 31 2 *"), give up
+        last = day + timedelta(days=366 * 8)
+        first_day = True
+        while day <= last:
+            if not (self.months >> day.month) & 1:
+                # jump to the first day of the next month
+                day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+                first_day = False
+                continue
+            if self._day_matches(day):
+                h = after.hour if first_day else 0
+                while (h := _next_bit(self.hours, h)) is not None:
+                    m = after.minute if first_day and h == after.hour else 0
+                    while (m := _next_bit(self.minutes, m)) is not None:
+                        s = 0
+                        while (s := _next_bit(self.seconds, s)) is not None:
+                            at = day.replace(hour=h, minute=m, second=s)
+                            if at > after:
+                                yield at
+                                last = day + timedelta(days=366 * 8)
+                            s += 1
+                        m += 1
+                    h += 1
+            day += timedelta(days=1)
+            first_day = False
+
+    def next_fire(
+            self,
+            after
+            ):
+        """
+        Parameters
+        ----------
+        after : datetime.datetime
+            naive, local to the time zone of the job
+
+        Returns
+        -------
+        datetime.datetime
+            naive, the first fire time strictly after "after"
+            (None if there is none within 8 years)
+
+        """
+        return next(self.iter_fire_times(after), None)
+
+    def next_epoch(
+            self,
+            after,
+            zone
+            ):
+        """
+        The next fire as an instant, DST-correct: a fire time skipped by
+        a DST gap fires shifted forward by the gap (once), a fire time
+        repeated by a DST overlap fires at its first occurrence only.
+
+        Parameters
+        ----------
+        after : float
+            epoch
+        zone : zoneinfo.ZoneInfo
+
+        Returns
+        -------
+        float
+            epoch of the first fire strictly after "after"
+            (None if there is none within 8 years)
+
+        """
+        return next(fire_epochs([self], after, zone), None)
+
+    def fire_times(
+            self,
+            after,
+            count=None,
+            until=None
+            ):
+        """
+        Computes many fire times in a single pass (previews, capacity
+        planning).
+
+        Parameters
+        ----------
+        after : datetime.datetime
+            naive, local to the time zone of the job
+        count : int, optional
+            at most these many fire times
+        until : datetime.datetime, optional
+            naive, fire times up to and including this one
+
+        Returns
+        -------
+        list(datetime.datetime)
+
+        """
+        if (count is None) and (until is None):
+            raise Exception("Either count or until is required")
+        times = []
+        for at in self.iter_fire_times(after):
+            if ((until is not None) and (at > until)) or \
+               ((count is not None) and (len(times) >= count)):
+                break
+            times.append(at)
+        return times
+
+    def __repr__(self):
+        return f'Cron("{self.expression}")'
+
+def fire_epochs(
+        crons,
+        after,
+        zone
+        ):
+    """
+    Walks the calendar of all crons once, yielding the fire instants of
+    any of them in order, each as next_epoch() of the previous one
+    (DST gaps and overlaps as in Cron.next_epoch).
+
+    Parameters
+    ----------
+    crons : list(Cron)
+    after : float
+        epoch
+    zone : zoneinfo.ZoneInfo
+
+    Returns
+    -------
+    generator of float, epochs strictly after "after"
+    (up to 8 years of fire times)
+
+    """
+    after_local = to_local(after, zone)
+    # near a DST gap shifted fire times can come out of order: a fire is
+    # only certain once the walk is past its local time
+    queue = []
+    for at in merge(*(cron.iter_fire_times(after_local) for cron in crons)):
+        while queue and (at > queue[0][1]):
+            epoch, local, source = heappop(queue)
+            # the next fire is looked up from the local time of the last
+            if (epoch > after) and (source > after_local):
+                yield epoch
+                after, after_local = epoch, local
+        epoch = to_epoch(at, zone)
+        heappush(queue, (epoch, to_local(epoch, zone), at))
+    while queue:
+        epoch, local, source = heappop(queue)
+        if (epoch > after) and (source > after_local):
+            yield epoch
+            after, after_local = epoch, local
@@ -1,8 +1,11 @@
-from pytz import timezone
 from datetime import datetime
-from multiprocess import Process
+from itertools import islice
+from threading import Lock
 
-from simple_scheduler.base import Schedule
+from simple_scheduler.base import _Job, Schedule
+from simple_scheduler.cron import Cron, fire_epochs
+from simple_scheduler.timezones import to_epoch
+from simple_scheduler.asynchronous import AsyncSchedule
 
 class Event(Schedule):
     """ Event occurs at an exact time.
@@ -15,94 +18,156 @@ class Event(Schedule):
             **kwargs
             ):
         super().__init__(*args, **kwargs)
+        self.wall_clock_check = 60
 
-    def _schedule(
+    def _compile_when(
             self,
-            function,
             when,
-            tz,
-            start,
-            stop,
-            number_of_reattempts,
-            reattempt_duration_in_seconds
+            tz
             ):
         """
+        Compiles "when" into cron bitsets, so that the next fire time can
+        be computed without polling. Every "day|HH:MM" element becomes one
+        Cron (at second 0), cron expressions are parsed as they are.
 
         Parameters
         ----------
-        function : callable function
-            name of the function which needs to be scheduled
-        when : list, a collection of "day|HH:MM"
-            at what precise time(s) should the function be called
-            eg. ["mon|22:04","*|03:45", ...] please "only" use 24-hour
-                                             clock with "|" as day separator
-                                             and ":" as time separator
-        tz : str, optional
-            standard time zone (call the method .timezones() for more info)
-            the default is "GMT"
-        start : str, optional
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-            the default is None
-        stop : str, optional
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-            the default is None
-        number_of_reattempts : int
-            number of times each event is tried, but executed only once
-        reattempt_duration_in_seconds : int
-            duration to wait (in seconds) after each un-successful attempt
+        when : list, a collection of "day|HH:MM" and/or cron expressions
+        tz : str
+            time zone of the job
+
+        Raises
+        ------
+        Exception
+            if an element parses but never fires (eg. "0 0 30 2 *")
 
         Returns
         -------
-        None.
+        list(simple_scheduler.cron.Cron)
+
         """
-        while True:
-            HH, MM = str(datetime.now(timezone(tz)).time()).\
-                        rsplit(":",1)[0].\
-                            split(":")
-            day = self._days[datetime.today().weekday()]
-            condition_1 =     (f"{day}|{HH}:{MM}" in when) |\
-                                  (f"*|{HH}:{MM}" in when)
-            condition_2 = (f"{day}|*{HH[1]}:{MM}" in when) |\
-                              (f"*|*{HH[1]}:{MM}" in when)
-            condition_3 = (f"{day}|{HH[0]}*:{MM}" in when) |\
-                              (f"*|{HH[0]}*:{MM}" in when)
-            condition_4 = (f"{day}|{HH}:*{MM[1]}" in when) |\
-                              (f"*|{HH}:*{MM[1]}" in when)
-            condition_5 = (f"{day}|{HH}:{MM[0]}*" in when) |\
-                              (f"*|{HH}:{MM[0]}*" in when)
-            condition_6 =       (f"{day}|**:{MM}" in when) |\
-                                    (f"*|**:{MM}" in when)
-            condition_7 =   (f"{day}|**:{MM[0]}*" in when) |\
-                                (f"*|**:{MM[0]}*" in when)
-            condition_8 =   (f"{day}|**:*{MM[1]}" in when) |\
-                                (f"*|**:*{MM[1]}" in when)
-            condition_9 =       (f"{day}|{HH}:**" in when) |\
-                                    (f"*|{HH}:**" in when)
-            if True in [condition_1, condition_2, condition_3, condition_4,
-                        condition_5, condition_6, condition_7, condition_8,
-                        condition_9]:
-                try:
-                    continue_ = self._execute(
-                        function=function,
-                        tz=tz,
-                        start=start,
-                        stop=stop,
-                        period_in_seconds=60,
-                        number_of_reattempts=number_of_reattempts,
-                        reattempt_duration_in_seconds=\
-                            reattempt_duration_in_seconds
-                            )
-                    if continue_:
-                        continue
-                    else:
-                        break
-                except Exception as e:
-                    self._print(str(e))
-                    [p.terminate for p in self._workers]
-                    self._workers = []
-                    pass
+        def fits(pattern, value):
+            return all(p in ("*", v) for p, v in zip(pattern, value))
+
+        crons = []
+        for element in when:
+            if isinstance(element, Cron):
+                crons.append(element)
+            elif "|" not in element:
+                crons.append(Cron(element))
             else:
-                self._sleep(period_in_seconds=55)
+                day, HHMM = element.split("|")
+                HH, MM = HHMM.split(":")
+                minutes = [str(m) for m in range(60) if fits(MM, f"{m:02}")]
+                hours = [str(h) for h in range(24) if fits(HH, f"{h:02}")]
+                if minutes and hours:
+                    crons.append(Cron(f"0 {','.join(minutes)} "+\
+                                      f"{','.join(hours)} * * {day}"))
+        zone, now = self._timezone(tz), self.clock.time()
+        for cron in crons:
+            if cron.next_epoch(now, zone) is None:
+                raise Exception(f'"{cron.expression}" never fires')
+        return crons
+
+    def _next_fire(
+            self,
+            job,
+            after=None
+            ):
+        """
+        Looks up the compiled "when" of the job, in its time zone (DST
+        gaps and overlaps as in simple_scheduler.timezones.to_epoch).
+
+        Parameters
+        ----------
+        job : _Job
+        after : float, optional
+            time.monotonic() of the previous fire; if None the current
+            minute is also considered
+
+        Returns
+        -------
+        float
+            time.monotonic() of the next fire
+
+        """
+        tz = self._timezone(job.tz)
+
+        def next_fire(after):
+            at = next(fire_epochs(job.when_crons, after, tz), None)
+            if at is None:
+                raise Exception(f"{job.name}: {job.when} never fires")
+            return at
+
+        if after is None:
+            # fire within the current minute if it matches, unless there
+            # is a later fire within this minute (cron with seconds)
+            now = self.clock.time()
+            minute = int(now) // 60 * 60
+            at = next_fire(minute - 1)
+            if at < now:
+                upcoming = next_fire(int(now))
+                if upcoming < minute + 60:
+                    at = upcoming
+        else:
+            # fires are on whole seconds, rounding absorbs clock conversion
+            at = next_fire(round(self._to_wall(after)))
+        return at - self.clock.time() + self.clock.monotonic()
+
+    def fire_times(
+            self,
+            job_name,
+            count=None,
+            until=None,
+            after=None
+            ):
+        """
+        Upcoming fire times of a job (previews and capacity planning),
+        exactly as the scheduler will fire them, in a single walk of the
+        calendar.
+
+        Parameters
+        ----------
+        job_name : str
+        count : int, optional
+            the next these many fire times
+        until : datetime.datetime, optional
+            all fire times up to this one (naive: in the job's time zone)
+        after : datetime.datetime, optional
+            (naive: in the job's time zone) the default is now
+
+        Raises
+        ------
+        Exception
+            - if neither count nor until is given
+            - if there is no such job
+
+        Returns
+        -------
+        list(datetime.datetime)
+            in the job's time zone, sorted
+
+        """
+        if (count is None) and (until is None):
+            raise Exception("Either count or until is required")
+        try:
+            job = self._specs[job_name]
+        except KeyError:
+            raise Exception(f"No such job_name exists: {job_name}")
+        if job.depends_on:
+            # fires when the jobs it depends on are done, not on a schedule
+            return []
+        tz = self._timezone(job.tz)
+        after = to_epoch(after, tz) if after and not after.tzinfo else \
+                after.timestamp() if after else self.clock.time()
+        if until is not None:
+            until = until.timestamp() if until.tzinfo else to_epoch(until, tz)
+        times = []
+        for at in islice(fire_epochs(job.when_crons, after, tz), count):
+            if (until is not None) and (at > until):
+                break
+            times.append(datetime.fromtimestamp(at, tz))
+        return times
 
     def __assert_int(self, i):
         """
@@ -123,9 +188,84 @@ class Event(Schedule):
         except AssertionError:
             assert(i == "*")
 
+    def _validate_when(
+            self,
+            when
+            ):
+        """
+        Parameters
+        ----------
+        when : list, a collection of "day|HH:MM" and/or cron expressions
+
+        Raises
+        ------
+        Exception
+            if when is empty, or an element is not of the form "day|HH:MM"
+            (cron expressions are validated when compiled)
+
+        Returns
+        -------
+        when : list
+            lower-cased
+
+        """
+        if not when:
+            raise Exception('"when" must not be empty')
+        when = [w if isinstance(w, Cron) else w.lower() for w in when]
+        try:
+            desired_day_list = list(self._days.values()) + ["*"]
+            for element in when:
+                if isinstance(element, Cron) or ("|" not in element):
+                    # cron expression, validated when compiled
+                    continue
+                if element.split("|")[0] not in desired_day_list:
+                    raise Exception("Incorrect day; should be one of "+\
+                                    "{list(self._days.values()) + ["*"]}")
+                HH, MM = element.split("|")[1].split(":")
+                try:
+                    assert(len(HH) == 2)
+                except:
+                    raise
+                try:
+                    assert(len(MM) == 2)
+                except:
+                    raise
+                self.__assert_int(HH[0])
+                self.__assert_int(HH[1])
+                self.__assert_int(MM[0])
+                self.__assert_int(MM[1])
+        except:
+            raise Exception('Elements of "when"(list(str)) must be a ' +\
+                            'collection of:\n*|HH:MM,\n*|HH:MM,\n*|H*:MM,\n'+\
+                            '*|*H:MM,\n*|**:MM,\n*|**:M*,\n*|**:*M,\n*|HH:**')
+        return when
+
+    def _describe(
+            self,
+            job
+            ):
+        if job.depends_on:
+            return f"{job.name} event | after {list(job.depends_on)}]"
+        return f"{job.name} event | {job.when} | {job.tz}]"
+
+    def _modify(
+            self,
+            job,
+            changes
+            ):
+        """ Also takes "when"; see Schedule._modify()."""
+        changes = dict(changes)
+        if "when" not in changes:
+            return super()._modify(job, changes)
+        when = self._validate_when(changes.pop("when"))
+        when_crons = self._compile_when(when, job.tz)
+        super()._modify(job, changes)
+        job.when, job.when_crons = when, when_crons
+        return True
+
     def add_job(self,
                 target,
-                when,
+                when=None,
                 tz="GMT",
                 start=None,
                 stop=None,
@@ -133,7 +273,20 @@ class Event(Schedule):
                 number_of_reattempts=0,
                 reattempt_duration_in_seconds=0,
                 args=(),
-                kwargs={}
+                kwargs={},
+                executor=None,
+                misfire_policy="fire_once",
+                max_instances=None,
+                overlap="queue",
+                retry=None,
+                timeout=None,
+                capture=False,
+                inputs=None,
+                chunk_size=100,
+                depends_on=None,
+                jitter=None,
+                priority=0,
+                weight=1
                 ):
         """
         Assigns an event to a process.
@@ -141,11 +294,15 @@ class Event(Schedule):
         Parameters
         ----------
         target : a callable function
-        when : list, a collection of "day|HH:MM"
+        when : list, a collection of "day|HH:MM" and/or cron expressions
             at what precise time(s) should the function be called
             eg. ["mon|22:04","*|03:45", ...] please "only" use 24-hour
                                              clock with "|" as day separator
                                              and ":" as time separator
+            eg. ["*/15 9-17 * * mon-fri", "30 0 12 1,15 * *", ...] cron
+                (5 fields) or cron with seconds (6 fields), also as
+                simple_scheduler.cron.Cron
+            not given for a job with depends_on
         tz : str, optional
             standard time zone (call the method .timezones() for more info)
             the default is "GMT"
@@ -170,6 +327,67 @@ class Event(Schedule):
         kwargs : dict{key:object}, optional
             named argumets for the "target" callable
             the default is {}
+        executor : simple_scheduler.executors.Executor, optional
+            overrides the scheduler's executor for this job
+            the default is None
+        misfire_policy : str, optional
+            what to do when runs were missed (host suspended, clock
+            stepped or host busy; noticed within a minute):
+            "fire_once" runs once, "fire_all" runs every missed fire,
+            "skip" waits for the next fire
+            the default is "fire_once"
+        max_instances : int, optional
+            runs of this job allowed at the same time
+            the default is None (no limit)
+        overlap : str, optional
+            at max_instances: "skip" the new run, "queue" it until an
+            instance finishes, or "terminate" the oldest instance
+            the default is "queue"
+        retry : simple_scheduler.retry.RetryPolicy, optional
+            exponential backoff with jitter, time budget, per-attempt
+            timeout and which failures to retry on; replaces
+            number_of_reattempts and reattempt_duration_in_seconds
+            the default is None
+        timeout : float, optional
+            a run still going after these many seconds is terminated, and
+            killed if it is still alive 5 (Schedule.kill_after) seconds later
+            the default is None (no limit)
+        capture : bool, optional
+            keep what each run returned or raised (value, exception type
+            and traceback, timing) in .results, a ring buffer per job;
+            requires dispatcher=True
+            the default is False
+        inputs : iterable, or a callable returning one, optional
+            makes a fan-out job: every run calls target(input, *args,
+            **kwargs) for each input, spread over a pool in chunks; the
+            run counts as one (for retries, overlap and timeout) and fails
+            if any input failed. A callable (eg. a generator function) is
+            called every run; the pool is the job's/scheduler's executor
+            if it is a ProcessPoolExecutor/ThreadPoolExecutor, else one
+            process per core
+            the default is None
+        chunk_size : int, optional
+            inputs per pool task, for fan-out jobs
+            the default is 100
+        depends_on : str or list(str), optional
+            job name(s) of this scheduler: the job has no schedule of its
+            own and runs once all of them have succeeded (retries
+            included) since its last run; if one fails the job is skipped,
+            and so are the jobs depending on it
+            the default is None
+        jitter : float, optional
+            the run of every fire is dispatched a random 0 to jitter
+            seconds late (never past the next fire)
+            the default is None (the scheduler's jitter)
+        priority : int, optional
+            when runs wait for capacity (max_concurrency, rate_limit),
+            higher priorities start first; requires dispatcher=True
+            the default is 0
+        weight : float, optional
+            share of the capacity left to a priority that this job gets
+            against the other jobs of that priority, eg. a job of weight
+            2 starts twice as many waiting runs as one of weight 1
+            the default is 1
 
         Raises
         ------
@@ -180,36 +398,25 @@ class Event(Schedule):
                                                    clock, with "|" as day
                                                    separator and ":" as time
                                                    separator
+            - If a cron expression cannot be parsed or never fires
+            - If both or neither of "when" and "depends_on" are given
+            - If "when" is empty
+            - If depends_on makes a cycle, or the scheduler is not a
+              dispatcher
+            - If a job in depends_on does not exist and the scheduler is
+              running (otherwise run() raises)
+            - If priority, weight or capture is set and the scheduler is
+              not a dispatcher
 
         Returns
         -------
         None.
 
         """
-        when = [w.lower() for w in when]
-        try:
-            desired_day_list = list(self._days.values()) + ["*"]
-            for element in when:
-                if element.split("|")[0] not in desired_day_list:
-                    raise Exception("Incorrect day; should be one of "+\
-                                    "{list(self._days.values()) + ["*"]}")
-                HH, MM = element.split("|")[1].split(":")
-                try:
-                    assert(len(HH) == 2)
-                except:
-                    raise
-                try:
-                    assert(len(MM) == 2)
-                except:
-                    raise
-                self.__assert_int(HH[0])
-                self.__assert_int(HH[1])
-                self.__assert_int(MM[0])
-                self.__assert_int(MM[1])
-        except:
-            raise Exception('Elements of "when"(list(str)) must be a ' +\
-                            'collection of:\n*|HH:MM,\n*|HH:MM,\n*|H*:MM,\n'+\
-                            '*|*H:MM,\n*|**:MM,\n*|**:M*,\n*|**:*M,\n*|HH:**')
+        if (when is None) == (not depends_on):
+            raise Exception('A job takes either "when" or "depends_on"')
+        if when is not None:
+            when = self._validate_when(when)
         try:
             assert(type(reattempt_duration_in_seconds) == int)
         except ValueError:
@@ -219,28 +426,72 @@ class Event(Schedule):
                 raise Exception("reattempt_duration_in_seconds(seconds) should be"+\
                                 " either int or float")
         try:
-            self._validate_start_stop(start, stop)
+            self._timezone(tz)
+        except:
+            raise Exception(f"Unknown time zone {tz}; "+\
+                            "call the method .timezones() for more info")
+        try:
+            start, stop = self._validate_start_stop(start, stop, tz)
         except:
             raise
+        self._validate_misfire_policy(misfire_policy)
+        self._validate_overlap(max_instances, overlap)
+        self._validate_chunk_size(chunk_size)
+        if jitter is not None:
+            self._validate_jitter(jitter)
+        self._validate_priority(priority, weight)
+        self._validate_capture(capture)
+        when_crons = self._compile_when(when, tz) if when is not None else None
         function, job_name = self._manifest_function(target,
                                                      job_name,
                                                      args,
                                                      kwargs)
-        self._jobs[job_name] = [f"{job_name} event | {when} | {tz}]"]
-        self._processes.append(
-            Process(
-                target=self._schedule,
-                name=job_name,
-                args=(
-                    function,
-                    when,
-                    tz,
-                    start,
-                    stop,
-                    number_of_reattempts,
-                    reattempt_duration_in_seconds
-                    )
-                )
+        depends_on = self._validate_depends_on(job_name, depends_on)
+        job = _Job(
+            name=job_name,
+            function=function,
+            tz=tz,
+            start=start,
+            stop=stop,
+            number_of_reattempts=number_of_reattempts,
+            reattempt_duration_in_seconds=reattempt_duration_in_seconds,
+            when=when,
+            when_crons=when_crons,
+            executor=executor,
+            misfire_policy=misfire_policy,
+            max_instances=max_instances,
+            overlap=overlap,
+            retry=retry,
+            timeout=timeout,
+            capture=capture,
+            inputs=inputs,
+            chunk_size=chunk_size,
+            depends_on=depends_on,
+            jitter=jitter,
+            priority=priority,
+            weight=weight
             )
+        self._add_job(job, self._describe(job))
+
+class AsyncEvent(AsyncSchedule, Event):
+    """ Event jobs for "async def" targets, run as tasks on an existing
+        asyncio event loop (call .run() from within the loop)."""
+
+    def __init__(
+            self,
+            *args,
+            **kwargs
+            ):
+        super().__init__(*args, **kwargs)
+
+_lock = Lock()
 
-event_scheduler = Event(verbose=True)
+def __getattr__(name):
+    """ event_scheduler is created on first use (PEP 562), not at import."""
+    global event_scheduler
+    if name == "event_scheduler":
+        with _lock:
+            if "event_scheduler" not in globals():
+                event_scheduler = Event(verbose=True)
+        return event_scheduler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,610 @@
+import os
+import sys
+from time import time
+from functools import partial
+from itertools import islice
+from traceback import format_exc
+from threading import Event, Lock, Semaphore, Thread
+
+# multiprocess is imported where it is used, so that importing the
+# package stays cheap
+
+def _call(
+        function,
+        capture=False
+        ):
+    """
+    Runs the function inside a pool worker and translates the outcome
+    into an exit code, the same way a process would report it.
+
+    Parameters
+    ----------
+    function : callable function
+    capture : bool, optional
+        also return what the function produced
+        the default is False
+
+    Returns
+    -------
+    tuple(int, type)
+        0 on success, the SystemExit code if raised, else 1;
+        and the type of the exception raised (None if none)
+    with capture a third element is added:
+    tuple(object, str, float, float)
+        the returned value, the traceback (None if none) and the epochs
+        at which the function started and finished
+
+    """
+    started, value, traceback = time(), None, None
+    try:
+        value = function()
+        outcome = 0, None
+    except SystemExit as e:
+        if e.code is None:
+            outcome = 0, None
+        else:
+            outcome = (e.code if isinstance(e.code, int) else 1), SystemExit
+    except BaseException as e:
+        outcome = 1, type(e)
+        traceback = format_exc()
+    if not capture:
+        return outcome
+    return outcome + ((value, traceback, started, time()),)
+
+def _call_in_child(
+        function,
+        connection
+        ):
+    """
+    Target of a forked worker whose result is captured: sends it to the
+    scheduler over a pipe, then exits with the same code as it would have.
+    bytes (bytearray, memoryview) are sent as they are, not pickled.
+
+    Parameters
+    ----------
+    function : callable function
+    connection : multiprocess.connection.Connection
+        the writing end of the pipe
+
+    Returns
+    -------
+    None.
+
+    """
+    code, exception, (value, traceback, started, finished) = _call(function,
+                                                                  capture=True)
+    if traceback:
+        # as an uncaught exception would
+        sys.stderr.write(traceback)
+    raw = isinstance(value, (bytes, bytearray, memoryview))
+    try:
+        connection.send((code, exception, None if raw else value,
+                         traceback, started, finished, raw))
+    except Exception:
+        # not picklable
+        connection.send((code, exception, repr(value),
+                         traceback, started, finished, False))
+    if raw:
+        connection.send_bytes(value)
+    connection.close()
+    sys.exit(code)
+
+class _Task():
+    """ Gives a pooled run the part of the multiprocess.Process interface
+        that the scheduler relies on."""
+
+    def __init__(
+            self,
+            callback
+            ):
+        self._callback = callback
+        self._outcome = None
+        self._finished = Event()
+
+    def _finish(
+            self,
+            outcome
+            ):
+        self._outcome = outcome
+        self._finished.set()
+        self._callback(self)
+
+    def _error(
+            self,
+            exception
+            ):
+        self._finish((1, type(exception)))
+
+    @property
+    def exitcode(self):
+        return self._outcome[0] if self._outcome else None
+
+    @property
+    def exception(self):
+        return self._outcome[1] if self._outcome else None
+
+    @property
+    def result(self):
+        if (self._outcome is None) or (len(self._outcome) < 3):
+            return None
+        return self._outcome[2]
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+    def join(
+            self,
+            timeout=None
+            ):
+        self._finished.wait(timeout)
+
+def _call_chunk(
+        function,
+        chunk
+        ):
+    """
+    Runs the function once per input of the chunk, inside a pool worker;
+    an input that fails does not stop the others. Each input succeeds or
+    fails as a run would (see _call), eg. KeyboardInterrupt fails it.
+
+    Parameters
+    ----------
+    function : functools.partial
+        target loaded with its own parameters, called as
+        target(input, *args, **kwargs)
+    chunk : list
+
+    Returns
+    -------
+    tuple(int, int, type, str)
+        inputs, failed inputs, type and traceback of the first failure
+
+    """
+    failed, exception, traceback = 0, None, None
+    for item in chunk:
+        code, error, (_, trace, _, _) = _call(partial(function.func,
+                                                      item,
+                                                      *function.args,
+                                                      **function.keywords),
+                                              capture=True)
+        if code != 0:
+            failed += 1
+            if exception is None:
+                exception, traceback = error, trace
+    return len(chunk), failed, exception, traceback
+
+class _FanOut():
+    """ One run of a fan-out job: a feeder thread cuts the inputs into
+        chunks and streams them to a pool, never more than two chunks per
+        worker in flight, so that inputs are not all held at once. Has
+        the part of the multiprocess.Process interface that the scheduler
+        relies on; the run fails if any input failed."""
+
+    def __init__(
+            self,
+            pool,
+            size,
+            function,
+            inputs,
+            chunk_size,
+            callback,
+            capture
+            ):
+        self._pool = pool
+        self._function = function
+        self._inputs = inputs
+        self._chunk_size = chunk_size
+        self._callback = callback
+        self._capture = capture
+        self._lock = Lock()
+        self._slots = Semaphore(2 * size)
+        self._finished = Event()
+        self._terminated = False
+        self._fed = False
+        self._in_flight = 0
+        self._counts = {"inputs":0, "failed":0, "chunks":0}
+        self._started = time()
+        self.exitcode = None
+        self.exception = None
+        self.result = None
+        self._traceback = None
+        Thread(target=self._feed,
+               name="simple_scheduler_fan_out",
+               daemon=True).start()
+
+    def _feed(self):
+        try:
+            inputs = self._inputs() if callable(self._inputs) else self._inputs
+            iterator = iter(inputs)
+            while not self._terminated:
+                chunk = list(islice(iterator, self._chunk_size))
+                if not chunk:
+                    break
+                self._slots.acquire()
+                with self._lock:
+                    self._in_flight += 1
+                try:
+                    self._pool.apply_async(_call_chunk,
+                                           (self._function, chunk),
+                                           callback=self._chunk_done,
+                                           error_callback=self._chunk_error)
+                except BaseException:
+                    # eg. the pool was shut down
+                    with self._lock:
+                        self._in_flight -= 1
+                    self._slots.release()
+                    raise
+        except BaseException as e:
+            # the inputs could not be read
+            with self._lock:
+                self._counts["failed"] += 1
+                if self.exception is None:
+                    self.exception, self._traceback = type(e), format_exc()
+        with self._lock:
+            self._fed = True
+        self._maybe_finish()
+
+    def _chunk_done(
+            self,
+            outcome
+            ):
+        inputs, failed, exception, traceback = outcome
+        with self._lock:
+            self._in_flight -= 1
+            self._counts["chunks"] += 1
+            self._counts["inputs"] += inputs
+            self._counts["failed"] += failed
+            if (exception is not None) and (self.exception is None):
+                self.exception, self._traceback = exception, traceback
+        self._slots.release()
+        self._maybe_finish()
+
+    def _chunk_error(
+            self,
+            exception
+            ):
+        # the chunk could not be sent or returned (eg. not picklable)
+        self._chunk_done((0, 1, type(exception), None))
+
+    def _maybe_finish(self):
+        with self._lock:
+            if not self._fed or self._in_flight or self._finished.is_set():
+                return
+            if self._terminated:
+                self.exitcode = -15
+            else:
+                self.exitcode = 1 if self._counts["failed"] else 0
+            if self._capture:
+                self.result = (dict(self._counts), self._traceback,
+                               self._started, time())
+            self._finished.set()
+        self._callback(self)
+
+    def terminate(self):
+        """ Stops feeding; chunks in flight on the pool still finish."""
+        self._terminated = True
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+    def join(
+            self,
+            timeout=None
+            ):
+        self._finished.wait(timeout)
+
+class _Reaper():
+    """ One thread per process that waits (multiprocess.connection.wait)
+        on the sentinels of all running forked workers, joins each one as
+        soon as it exits and reports it; no polling, no zombies.
+        Results sent by workers are read as soon as they arrive, so that
+        a large one cannot block a worker on a full pipe."""
+
+    def __init__(self):
+        self._pid = os.getpid()
+        self._lock = Lock()
+        self._watched = {}
+        self._connections = {}
+        self._r, self._w = os.pipe()
+        self._thread = Thread(target=self._loop,
+                              name="simple_scheduler_reaper",
+                              daemon=True)
+        self._thread.start()
+
+    def watch(
+            self,
+            p,
+            callback,
+            connection=None
+            ):
+        """
+        Parameters
+        ----------
+        p : multiprocess.Process
+            a started process
+        callback : callable
+            called with p once p has exited
+        connection : multiprocess.connection.Connection, optional
+            the reading end of the pipe p sends its result to
+            (_call_in_child); the result is set as p.result and the
+            exception type as p.exception
+            the default is None
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            self._watched[p.sentinel] = (p, callback, connection)
+            if connection is not None:
+                self._connections[connection] = p
+        os.write(self._w, b"\0")
+
+    def _read(
+            self,
+            connection,
+            p
+            ):
+        """ Reads the result of p, sent by _call_in_child."""
+        try:
+            code, exception, value, traceback, started, finished, raw = \
+                connection.recv()
+            if raw:
+                value = connection.recv_bytes()
+            p.exception = exception
+            p.result = (value, traceback, started, finished)
+        except Exception:
+            # no result (eg. it could not be unpickled)
+            pass
+        connection.close()
+
+    def _loop(self):
+        from multiprocess.connection import wait
+        while True:
+            with self._lock:
+                waitables = list(self._watched) + list(self._connections)
+            for ready in wait(waitables + [self._r]):
+                if ready == self._r:
+                    os.read(self._r, 4096)
+                    continue
+                try:
+                    self._ready(ready)
+                except Exception as e:
+                    # the reaper is shared by every scheduler of the
+                    # process: one failing callback must not stop it
+                    print(f"Reaper: {e!r}")
+
+    def _ready(
+            self,
+            ready
+            ):
+        """
+        Handles a sentinel or a connection reported by wait().
+
+        Parameters
+        ----------
+        ready : int or multiprocess.connection.Connection
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            p = self._connections.pop(ready, None)
+        if p is not None:
+            self._read(ready, p)
+            return
+        with self._lock:
+            watched = self._watched.pop(ready, None)
+            if watched is None:
+                # a connection already read along with its sentinel
+                return
+            p, callback, connection = watched
+            unread = self._connections.pop(connection, None)
+        if unread is not None:
+            # exited in the same instant, or without a result
+            if connection.poll():
+                self._read(connection, p)
+            else:
+                connection.close()
+        p.join()
+        callback(p)
+
+_reaper = None
+
+def _get_reaper():
+    """ The reaper of this process (forked processes need their own)."""
+    global _reaper
+    if (_reaper is None) or (_reaper._pid != os.getpid()):
+        _reaper = _Reaper()
+    return _reaper
+
+class Executor():
+    """ Decides where a due job actually runs."""
+
+    def submit(
+            self,
+            function,
+            callback,
+            capture=False
+            ):
+        """
+        Parameters
+        ----------
+        function : callable function
+            target loaded with its own parameters
+        callback : callable
+            called with the returned handle, from another thread, as
+            soon as the run has finished
+        capture : bool, optional
+            bring back what the function produced, as the handle's
+            .result (see _call)
+            the default is False
+
+        Returns
+        -------
+        handle with .exitcode, .is_alive() and .join()
+
+        """
+        raise NotImplementedError
+
+    def shutdown(self):
+        """
+        Releases the workers.
+
+        Returns
+        -------
+        None.
+
+        """
+        pass
+
+class ForkExecutor(Executor):
+    """ A brand-new process for every run (maximum isolation)."""
+
+    def submit(
+            self,
+            function,
+            callback,
+            capture=False
+            ):
+        from multiprocess import Pipe, Process
+        if not capture:
+            p = Process(target=function)
+            p.start()
+            _get_reaper().watch(p, callback)
+            return p
+        reader, writer = Pipe(duplex=False)
+        p = Process(target=_call_in_child, args=(function, writer))
+        p.start()
+        writer.close()
+        _get_reaper().watch(p, callback, reader)
+        return p
+
+class ProcessPoolExecutor(Executor):
+    """ A reusable pool of processes; the pool is created on first use so
+        that it belongs to the process which dispatches the jobs.
+        A run on a pool cannot be terminated on its own, and captured
+        results must be picklable."""
+
+    def __init__(
+            self,
+            size=None,
+            max_tasks_per_child=None
+            ):
+        """
+        Parameters
+        ----------
+        size : int, optional
+            number of worker processes, the default is os.cpu_count()
+        max_tasks_per_child : int, optional
+            a worker is replaced after these many runs,
+            the default is None (workers live as long as the pool)
+
+        Returns
+        -------
+        None.
+
+        """
+        self.size = size
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = self._make_pool()
+        return self._pool
+
+    def _make_pool(self):
+        from multiprocess import Pool
+        return Pool(processes=self.size,
+                    maxtasksperchild=self.max_tasks_per_child)
+
+    def submit(
+            self,
+            function,
+            callback,
+            capture=False
+            ):
+        task = _Task(callback)
+        self._get_pool().apply_async(_call,
+                                     (function, capture),
+                                     callback=task._finish,
+                                     error_callback=task._error)
+        return task
+
+    def fan_out(
+            self,
+            function,
+            inputs,
+            chunk_size,
+            callback,
+            capture=False
+            ):
+        """
+        Spreads one run over the pool, chunk_size inputs per task.
+
+        Parameters
+        ----------
+        function : functools.partial
+            target loaded with its own parameters, called once per input
+            as target(input, *args, **kwargs)
+        inputs : iterable, or a callable returning one
+            a callable (eg. a generator function) is called every run
+        chunk_size : int
+        callback : callable
+            called with the returned handle once every chunk finished
+        capture : bool, optional
+            the handle's .result carries the number of inputs, failed
+            inputs and chunks (see _call for the format)
+            the default is False
+
+        Returns
+        -------
+        handle with .exitcode, .is_alive(), .join() and .terminate()
+
+        """
+        return _FanOut(self._get_pool(),
+                       self.size if self.size else (os.cpu_count() or 1),
+                       function,
+                       inputs,
+                       chunk_size,
+                       callback,
+                       capture)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+class ThreadPoolExecutor(ProcessPoolExecutor):
+    """ A reusable pool of threads, for I/O-bound callables."""
+
+    def __init__(
+            self,
+            size=None
+            ):
+        """
+        Parameters
+        ----------
+        size : int, optional
+            number of worker threads, the default is os.cpu_count()
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__(size=size)
+
+    def _make_pool(self):
+        from multiprocess.pool import ThreadPool
+        return ThreadPool(processes=self.size)
@@ -0,0 +1,221 @@
+from collections import deque
+from heapq import heapify, heappush, heappop
+from itertools import count
+
+class FairQueue():
+    """ The pending queue of a scheduler: runs are served by priority
+        level, then by virtual start (tag, see Schedule._enqueue).
+        A run's level is its job's priority, raised by one for every
+        "aging" seconds it has waited.
+
+        Every level is a pair of heaps, one for the best run (lowest tag)
+        and one for the worst (highest tag, pushed out when the queue is
+        full); entries of runs that left are dropped lazily. Runs age in
+        the order they were queued, so aging only looks at the front of
+        one FIFO per number of levels gained."""
+
+    def __init__(
+            self,
+            aging=None
+            ):
+        """
+        Parameters
+        ----------
+        aging : float, optional
+            seconds of waiting per level gained
+            the default is None (no aging)
+
+        Returns
+        -------
+        None.
+
+        """
+        self.aging = aging
+        self._levels = {}
+        self._ages = []
+        self._sequence = count()
+        self._size = 0
+        self._stale = 0
+
+    def __len__(self):
+        return self._size
+
+    def _live(
+            self,
+            entry,
+            level
+            ):
+        key, run = abs(entry[1]), entry[3]
+        return run.waiting and (run.key == key) and (run.level == level)
+
+    def _insert(
+            self,
+            run
+            ):
+        best, worst = self._levels.setdefault(run.level, ([], []))
+        # the insertion breaks ties, put_back() can queue a key twice
+        n = next(self._sequence)
+        heappush(best, (run.tag, run.key, n, run))
+        heappush(worst, (-run.tag, -run.key, n, run))
+
+    def push(
+            self,
+            run
+            ):
+        """
+        Parameters
+        ----------
+        run : _Run
+            with its enqueued time and tag set
+
+        Returns
+        -------
+        None.
+
+        """
+        run.key = next(self._sequence)
+        run.level = run.job.priority
+        run.waiting = True
+        self._insert(run)
+        self._size += 1
+        if self.aging:
+            if not self._ages:
+                self._ages.append(deque())
+            self._ages[0].append((run, run.key))
+
+    def age(
+            self,
+            now
+            ):
+        """
+        Raises the level of the runs that have waited long enough (and
+        drops stale entries, once they are most of the queue).
+
+        Parameters
+        ----------
+        now : float
+            time.monotonic()
+
+        Returns
+        -------
+        None.
+
+        """
+        for gained, fifo in enumerate(self._ages if self.aging else ()):
+            waited = (gained + 1) * self.aging
+            while fifo:
+                run, key = fifo[0]
+                if run.waiting and (run.key == key):
+                    if now - run.enqueued < waited:
+                        break
+                    run.level += 1
+                    self._insert(run)
+                    # its entries on the level below
+                    self._stale += 2
+                    if gained + 1 == len(self._ages):
+                        self._ages.append(deque())
+                    self._ages[gained + 1].append((run, key))
+                fifo.popleft()
+        self._compact()
+
+    def _head(
+            self,
+            level,
+            which
+            ):
+        """ The live entry on top of one heap of the level, None if
+            there is none."""
+        heap = self._levels[level][which]
+        while heap and not self._live(heap[0], level):
+            heappop(heap)
+            self._stale = max(0, self._stale - 1)
+        return heap[0] if heap else None
+
+    def peek(self):
+        """
+        Returns
+        -------
+        _Run
+            the next run to serve, None if the queue is empty
+
+        """
+        for level in sorted(self._levels, reverse=True):
+            entry = self._head(level, 0)
+            if entry is not None:
+                return entry[3]
+            if self._head(level, 1) is None:
+                del self._levels[level]
+        return None
+
+    def worst(self):
+        """
+        Returns
+        -------
+        _Run
+            the last run that would be served, None if the queue is empty
+
+        """
+        for level in sorted(self._levels):
+            entry = self._head(level, 1)
+            if entry is not None:
+                return entry[3]
+            if self._head(level, 0) is None:
+                del self._levels[level]
+        return None
+
+    def remove(
+            self,
+            run
+            ):
+        """
+        Takes a queued run out (eg. the one returned by peek()).
+
+        Returns
+        -------
+        None.
+
+        """
+        if run.waiting:
+            run.waiting = False
+            self._size -= 1
+            self._stale += 2
+
+    def put_back(
+            self,
+            run
+            ):
+        """
+        Queues a run taken out by remove() again, where it was (same
+        level, tag and age).
+
+        Returns
+        -------
+        None.
+
+        """
+        if not run.waiting:
+            run.waiting = True
+            self._size += 1
+            self._insert(run)
+
+    def clear(self):
+        self._levels, self._ages = {}, []
+        self._size = self._stale = 0
+
+    def _compact(self):
+        """ Rebuilds the heaps once most of their entries are stale."""
+        if self._stale <= 2 * self._size + 64:
+            return
+        for level, heaps in list(self._levels.items()):
+            best, worst = ([entry for entry in heap if self._live(entry, level)]
+                           for heap in heaps)
+            if not best:
+                del self._levels[level]
+                continue
+            # put_back() may have left a run twice in a heap
+            best = list({entry[1]:entry for entry in best}.values())
+            worst = list({entry[1]:entry for entry in worst}.values())
+            heapify(best)
+            heapify(worst)
+            self._levels[level] = (best, worst)
+        self._stale = 0
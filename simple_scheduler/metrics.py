@@ -0,0 +1,283 @@
+from bisect import bisect_left
+from threading import Thread
+
+class _Histogram():
+    """ Cumulative-bucket histogram, as used by Prometheus."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(
+            self,
+            bounds
+            ):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(
+            self,
+            value
+            ):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        buckets, total = {}, 0
+        for bound, n in zip(self.bounds + [float("inf")], self.counts):
+            total += n
+            buckets[bound] = total
+        return {"buckets":buckets, "sum":self.sum, "count":self.count}
+
+class Metrics():
+    """ Per-job counters and histograms, updated from the dispatch path.
+        Plain dict/int updates, no locks: there is a single writer (the
+        dispatcher) and readers only take copies."""
+
+    LATENESS_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 60]
+    DURATION_BUCKETS = [0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600]
+
+    def __init__(
+            self,
+            prefix="simple_scheduler"
+            ):
+        """
+        Parameters
+        ----------
+        prefix : str, optional
+            prepended to every metric name
+            the default is "simple_scheduler"
+
+        Returns
+        -------
+        None.
+
+        """
+        self.prefix = prefix
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._server = None
+
+    def inc(
+            self,
+            name,
+            labels,
+            value=1
+            ):
+        """
+        Parameters
+        ----------
+        name : str
+            eg. "fires_total"
+        labels : tuple(tuple(str, str))
+            eg. (("job", "job-1"),)
+        value : int, optional
+            the default is 1
+
+        Returns
+        -------
+        None.
+
+        """
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(
+            self,
+            name,
+            labels,
+            delta
+            ):
+        """ Moves a gauge up or down by delta."""
+        key = (name, labels)
+        self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def set(
+            self,
+            name,
+            labels,
+            value
+            ):
+        """ Sets a gauge to value."""
+        self._gauges[(name, labels)] = value
+
+    def observe(
+            self,
+            name,
+            labels,
+            value,
+            bounds
+            ):
+        """ Adds value to a histogram with the given bucket bounds."""
+        key = (name, labels)
+        try:
+            self._histograms[key].observe(value)
+        except KeyError:
+            self._histograms[key] = _Histogram(bounds)
+            self._histograms[key].observe(value)
+
+    def fired(
+            self,
+            job_name,
+            lateness
+            ):
+        """ A job was handed over to a worker, lateness in seconds."""
+        labels = (("job", job_name),)
+        self.inc("fires_total", labels)
+        self.observe("start_lateness_seconds", labels, lateness,
+                     self.LATENESS_BUCKETS)
+
+    def started(
+            self,
+            job_name
+            ):
+        """ A run (first attempt or retry) is in flight."""
+        self.gauge("in_flight", (("job", job_name),), 1)
+
+    def waited(
+            self,
+            priority,
+            seconds
+            ):
+        """ A run (or attempt) started after waiting seconds in the
+            pending queue (0 if it did not wait)."""
+        self.observe("pending_wait_seconds", (("priority", str(priority)),),
+                     seconds, self.DURATION_BUCKETS)
+
+    def retried(
+            self,
+            job_name
+            ):
+        """ A failed run is being reattempted."""
+        self.inc("retries_total", (("job", job_name),))
+
+    def finished(
+            self,
+            job_name,
+            exitcode,
+            duration
+            ):
+        """ A run finished with exitcode after duration seconds."""
+        labels = (("job", job_name),)
+        self.gauge("in_flight", labels, -1)
+        if exitcode == 0:
+            self.inc("successes_total", labels)
+        else:
+            self.inc("failures_total", labels + (("exitcode", str(exitcode)),))
+        self.observe("run_duration_seconds", labels, duration,
+                     self.DURATION_BUCKETS)
+
+    def snapshot(self):
+        """
+        Returns
+        -------
+        dict
+            {metric name : {labels (tuple) : value}}, histograms as
+            {"buckets":{upper bound:count}, "sum":float, "count":int}
+
+        """
+        snapshot = {}
+        for (name, labels), value in list(self._counters.items()) + \
+                                      list(self._gauges.items()):
+            snapshot.setdefault(name, {})[labels] = value
+        for (name, labels), histogram in list(self._histograms.items()):
+            snapshot.setdefault(name, {})[labels] = histogram.snapshot()
+        return snapshot
+
+    def exposition(self):
+        """
+        Returns
+        -------
+        str
+            all metrics in the Prometheus text format
+
+        """
+        def render(labels):
+            if not labels:
+                return ""
+            escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').\
+                                 replace("\n", "\\n")
+            return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+        lines = []
+        for kind, metrics in (("counter", list(self._counters.items())),
+                              ("gauge", list(self._gauges.items()))):
+            for name in sorted({name for (name, _), _ in metrics}):
+                lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+                for (name_, labels), value in metrics:
+                    if name_ == name:
+                        lines.append(f"{self.prefix}_{name}{render(labels)} {value}")
+        histograms = list(self._histograms.items())
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f"# TYPE {self.prefix}_{name} histogram")
+            for (name_, labels), histogram in histograms:
+                if name_ != name:
+                    continue
+                snapshot = histogram.snapshot()
+                for bound, n in snapshot["buckets"].items():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.prefix}_{name}_bucket"+\
+                                 f"{render(labels + (('le', le),))} {n}")
+                lines.append(f"{self.prefix}_{name}_sum{render(labels)} "+\
+                             f"{snapshot['sum']}")
+                lines.append(f"{self.prefix}_{name}_count{render(labels)} "+\
+                             f"{snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+    def serve(
+            self,
+            port=9100,
+            host="127.0.0.1"
+            ):
+        """
+        Serves exposition() over HTTP (any path) from a background thread.
+
+        Parameters
+        ----------
+        port : int, optional
+            the default is 9100
+        host : str, optional
+            the default is "127.0.0.1" (local only)
+
+        Returns
+        -------
+        server : http.server.ThreadingHTTPServer
+
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        Thread(target=self._server.serve_forever,
+               name="simple_scheduler_metrics",
+               daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        """
+        Stops the HTTP listener, if any.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,62 @@
+class TokenBucket():
+    """ Limits how many runs are dispatched per second: every dispatch
+        takes a token, tokens are added at a constant rate up to burst.
+        Runs that find the bucket empty wait in the pending queue (by
+        priority) until a token is available."""
+
+    def __init__(
+            self,
+            rate,
+            burst=None
+            ):
+        """
+        Parameters
+        ----------
+        rate : float
+            dispatches per second, on average
+        burst : int, optional
+            dispatches allowed back to back, after an idle period
+            the default is None (max(1, rate))
+
+        Returns
+        -------
+        None.
+
+        """
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise Exception("rate must be a positive int or float")
+        burst = max(1, rate) if burst is None else burst
+        if not isinstance(burst, (int, float)) or burst < 1:
+            raise Exception("burst must be an int or float of at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = None
+
+    def take(
+            self,
+            now
+            ):
+        """
+        Parameters
+        ----------
+        now : float
+            time.monotonic() (or that of the scheduler's clock)
+
+        Returns
+        -------
+        float
+            0 if a token was taken, else the seconds until one is
+            available (nothing is taken)
+
+        """
+        if self._updated is None:
+            self._updated = now
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # a token is due by now, up to rounding of the refill
+        if self._tokens >= 1 - 1e-9:
+            self._tokens = max(0, self._tokens - 1)
+            return 0
+        return (1 - self._tokens) / self.rate
@@ -1,6 +1,7 @@
-from multiprocess import Process
+from threading import Lock
 
-from simple_scheduler.base import Schedule
+from simple_scheduler.base import _Job, Schedule
+from simple_scheduler.asynchronous import AsyncSchedule
 
 class Recurring(Schedule):
     """ Recurring tasks are those that occur after every "x"-seconds.
@@ -13,63 +14,120 @@ class Recurring(Schedule):
             ):
         super().__init__(*args, **kwargs)
 
-    def _schedule(
+    def _next_fire(
             self,
-            function,
-            tz,
-            start,
-            stop,
-            period_in_seconds,
-            number_of_reattempts,
-            reattempt_duration_in_seconds
+            job,
+            after=None
             ):
         """
+        Fires are anchored to the job's first fire (on the monotonic clock),
+        the k-th fire is due at epoch + k * period_in_seconds, so neither
+        execution time nor wall-clock jumps make the period drift.
+
         Parameters
         ----------
-        function : a callable function
-        tz : str
-            standard time zone (call the method .timezones() for more info)
-        start : str
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-        stop : str
-            of the form "Month DD HH:MM:SS YYYY" (eg. "Dec 31 23:59:59 2021")
-        period_in_seconds : int
-            the time period in seconds
-        number_of_reattempts : int
-            each event is tried these many number of times, but executed once
-        reattempt_duration_in_seconds : int
-            duration to wait (in seconds) after un-successful attempt
+        job : _Job
+        after : float, optional
+            time.monotonic() of the previous fire; if None the job fires
+            right away
+
+        Returns
+        -------
+        float
+            time.monotonic() at which the job should fire next
+
+        """
+        if after is None:
+            job.epoch = self.clock.monotonic()
+            return job.epoch
+        k = (after - job.epoch) // job.period_in_seconds + 1
+        return job.epoch + k * job.period_in_seconds
+
+    def _fire_key(
+            self,
+            job,
+            at
+            ):
+        """
+        Schedulers sharing the job have their own grids, so a fire is
+        identified by the period it falls in.
+
+        Parameters
+        ----------
+        job : _Job
+        at : float
+            time.monotonic() at which the job was due
+
+        Returns
+        -------
+        int
+            the number of the period of the fire, counted from the epoch
+
+        """
+        return round(self._to_wall(at) / job.period_in_seconds)
+
+    def _resume_fire(
+            self,
+            job
+            ):
+        if job.epoch is None:
+            # never fired: fire right away, as a new job would
+            return self._next_fire(job)
+        return super()._resume_fire(job)
+
+    def _validate_period(
+            self,
+            period_in_seconds
+            ):
+        """
+        Parameters
+        ----------
+        period_in_seconds : float
+
+        Raises
+        ------
+        Exception
+            if period_in_seconds is not a positive int or float
 
         Returns
         -------
         None.
 
         """
-        while True:
-            try:
-                continue_ = self._execute(
-                    tz=tz,
-                    start=start,
-                    stop=stop,
-                    function=function,
-                    period_in_seconds=period_in_seconds,
-                    number_of_reattempts=number_of_reattempts,
-                    reattempt_duration_in_seconds=reattempt_duration_in_seconds
-                    )
-                if continue_:
-                    continue
-                else:
-                    break
-            except Exception as e:
-                self._print(str(e))
-                [p.terminate for p in self._workers]
-                self._workers = []
-                pass
+        if not isinstance(period_in_seconds, (int, float)) or \
+           (period_in_seconds <= 0):
+            raise Exception("period_in_seconds must be a positive int or float")
+
+    def _describe(
+            self,
+            job
+            ):
+        if job.depends_on:
+            return f"{job.name} [recurring | after {list(job.depends_on)}]"
+        return f"{job.name} [recurring | {job.period_in_seconds}-second(s)]"
+
+    def _modify(
+            self,
+            job,
+            changes
+            ):
+        """ Also takes "period_in_seconds", the fires are then anchored
+            to now; see Schedule._modify()."""
+        changes = dict(changes)
+        if "period_in_seconds" not in changes:
+            return super()._modify(job, changes)
+        period_in_seconds = changes.pop("period_in_seconds")
+        self._validate_period(period_in_seconds)
+        super()._modify(job, changes)
+        job.period_in_seconds = period_in_seconds
+        if job.epoch is not None:
+            job.epoch = self.clock.monotonic()
+        return True
 
     def add_job(
             self,
             target,
-            period_in_seconds,
+            period_in_seconds=None,
             tz="GMT",
             start=None,
             stop=None,
@@ -77,7 +135,20 @@ class Recurring(Schedule):
             number_of_reattempts=0,
             reattempt_duration_in_seconds=0,
             args=(),
-            kwargs={}
+            kwargs={},
+            executor=None,
+            misfire_policy="fire_once",
+            max_instances=None,
+            overlap="queue",
+            retry=None,
+            timeout=None,
+            capture=False,
+            inputs=None,
+            chunk_size=100,
+            depends_on=None,
+            jitter=None,
+            priority=0,
+            weight=1
                 ):
         """
         Assigns an periodic task to a process.
@@ -87,6 +158,7 @@ class Recurring(Schedule):
         target : a callable function
         period_in_seconds : int
             the time period in seconds to execute this function
+            not given for a job with depends_on
         tz : str, optional
             standard time zone (call the method .timezones() for more info)
             the default is "GMT"
@@ -111,12 +183,92 @@ class Recurring(Schedule):
         reattempt_duration_in_seconds : int, optional
             default is 0 secs
             duration to wait (in seconds) after un-successful attempt
+        executor : simple_scheduler.executors.Executor, optional
+            overrides the scheduler's executor for this job
+            the default is None
+        misfire_policy : str, optional
+            what to do when runs were missed (host busy; the period
+            is on the monotonic clock, which stops while the host is
+            suspended on most systems):
+            "fire_once" runs once, "fire_all" runs every missed fire,
+            "skip" waits for the next fire
+            the default is "fire_once"
+        max_instances : int, optional
+            runs of this job allowed at the same time
+            the default is None (no limit)
+        overlap : str, optional
+            at max_instances: "skip" the new run, "queue" it until an
+            instance finishes, or "terminate" the oldest instance
+            the default is "queue"
+        retry : simple_scheduler.retry.RetryPolicy, optional
+            exponential backoff with jitter, time budget, per-attempt
+            timeout and which failures to retry on; replaces
+            number_of_reattempts and reattempt_duration_in_seconds
+            the default is None
+        timeout : float, optional
+            a run still going after these many seconds is terminated, and
+            killed if it is still alive 5 (Schedule.kill_after) seconds later
+            the default is None (no limit)
+        capture : bool, optional
+            keep what each run returned or raised (value, exception type
+            and traceback, timing) in .results, a ring buffer per job;
+            requires dispatcher=True
+            the default is False
+        inputs : iterable, or a callable returning one, optional
+            makes a fan-out job: every run calls target(input, *args,
+            **kwargs) for each input, spread over a pool in chunks; the
+            run counts as one (for retries, overlap and timeout) and fails
+            if any input failed. A callable (eg. a generator function) is
+            called every run; the pool is the job's/scheduler's executor
+            if it is a ProcessPoolExecutor/ThreadPoolExecutor, else one
+            process per core
+            the default is None
+        chunk_size : int, optional
+            inputs per pool task, for fan-out jobs
+            the default is 100
+        depends_on : str or list(str), optional
+            job name(s) of this scheduler: the job has no schedule of its
+            own and runs once all of them have succeeded (retries
+            included) since its last run; if one fails the job is skipped,
+            and so are the jobs depending on it
+            the default is None
+        jitter : float, optional
+            the run of every fire is dispatched a random 0 to jitter
+            seconds late (never past the next fire)
+            the default is None (the scheduler's jitter)
+        priority : int, optional
+            when runs wait for capacity (max_concurrency, rate_limit),
+            higher priorities start first; requires dispatcher=True
+            the default is 0
+        weight : float, optional
+            share of the capacity left to a priority that this job gets
+            against the other jobs of that priority, eg. a job of weight
+            2 starts twice as many waiting runs as one of weight 1
+            the default is 1
+
+        Raises
+        ------
+        Exception
+            - If both or neither of "period_in_seconds" and "depends_on"
+              are given
+            - If period_in_seconds is not a positive int or float
+            - If depends_on makes a cycle, or the scheduler is not a
+              dispatcher
+            - If a job in depends_on does not exist and the scheduler is
+              running (otherwise run() raises)
+            - If priority, weight or capture is set and the scheduler is
+              not a dispatcher
 
         Returns
         -------
         None.
 
         """
+        if (period_in_seconds is None) == (not depends_on):
+            raise Exception('A job takes either "period_in_seconds" or '+\
+                            '"depends_on"')
+        if period_in_seconds is not None:
+            self._validate_period(period_in_seconds)
         try:
             assert(type(reattempt_duration_in_seconds) == int)
         except ValueError:
@@ -126,34 +278,77 @@ class Recurring(Schedule):
                 raise Exception("reattempt_duration_in_seconds(seconds) should be"+\
                                 " either int or float")
         try:
-            assert(reattempt_duration_in_seconds*number_of_reattempts < period_in_seconds)
+            assert((period_in_seconds is None) or \
+                   (reattempt_duration_in_seconds*number_of_reattempts < period_in_seconds))
         except:
             print("(reattempt_duration_in_seconds * number_of_reattempts) must be less"+\
                   " than (period_in_seconds)")
         try:
-            self._validate_start_stop(start, stop)
+            self._timezone(tz)
+        except:
+            raise Exception(f"Unknown time zone {tz}; "+\
+                            "call the method .timezones() for more info")
+        try:
+            start, stop = self._validate_start_stop(start, stop, tz)
         except:
             raise
+        self._validate_misfire_policy(misfire_policy)
+        self._validate_overlap(max_instances, overlap)
+        self._validate_chunk_size(chunk_size)
+        if jitter is not None:
+            self._validate_jitter(jitter)
+        self._validate_priority(priority, weight)
+        self._validate_capture(capture)
 
         function, job_name = self._manifest_function(target,
                                                      job_name,
                                                      args,
                                                      kwargs)
-        self._jobs[job_name] = [f"{job_name} "+\
-                               f"[recurring | {period_in_seconds}-second(s)]"]
-        p = Process(
-            target=self._schedule,
+        depends_on = self._validate_depends_on(job_name, depends_on)
+        job = _Job(
             name=job_name,
-            args=(
-                function,
-                tz,
-                start,
-                stop,
-                period_in_seconds,
-                number_of_reattempts,
-                reattempt_duration_in_seconds
-                )
+            function=function,
+            tz=tz,
+            start=start,
+            stop=stop,
+            number_of_reattempts=number_of_reattempts,
+            reattempt_duration_in_seconds=reattempt_duration_in_seconds,
+            period_in_seconds=period_in_seconds,
+            executor=executor,
+            misfire_policy=misfire_policy,
+            max_instances=max_instances,
+            overlap=overlap,
+            retry=retry,
+            timeout=timeout,
+            capture=capture,
+            inputs=inputs,
+            chunk_size=chunk_size,
+            depends_on=depends_on,
+            jitter=jitter,
+            priority=priority,
+            weight=weight
             )
-        self._processes.append(p)
+        self._add_job(job, self._describe(job))
+
+class AsyncRecurring(AsyncSchedule, Recurring):
+    """ Recurring jobs for "async def" targets, run as tasks on an existing
+        asyncio event loop (call .run() from within the loop)."""
+
+    def __init__(
+            self,
+            *args,
+            **kwargs
+            ):
+        super().__init__(*args, **kwargs)
+
+_lock = Lock()
 
-recurring_scheduler = Recurring(verbose=True)
+def __getattr__(name):
+    """ recurring_scheduler is created on first use (PEP 562), not at import."""
+    global recurring_scheduler
+    if name == "recurring_scheduler":
+        with _lock:
+            if "recurring_scheduler" not in globals():
+                recurring_scheduler = Recurring(verbose=True)
+        return recurring_scheduler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,214 @@
+import sys
+from threading import Lock
+from collections import deque
+
+class Result():
+    """ What one attempt of a job produced."""
+
+    __slots__ = ("job_name", "exitcode", "value", "exception", "traceback",
+                 "started", "finished", "size")
+
+    def __init__(
+            self,
+            job_name,
+            exitcode,
+            value=None,
+            exception=None,
+            traceback=None,
+            started=None,
+            finished=None
+            ):
+        """
+        Parameters
+        ----------
+        job_name : str
+        exitcode : int
+        value : object, optional
+            returned by the target (bytes stay bytes)
+        exception : type, optional
+            raised by the target
+        traceback : str, optional
+            of the exception
+        started : float, optional
+            epoch at which the attempt started
+        finished : float, optional
+            epoch at which the attempt finished
+
+        Returns
+        -------
+        None.
+
+        """
+        self.job_name = job_name
+        self.exitcode = exitcode
+        self.value = value
+        self.exception = exception
+        self.traceback = traceback
+        self.started = started
+        self.finished = finished
+        self.size = _size(value) + _size(traceback)
+
+    @property
+    def duration(self):
+        if (self.started is None) or (self.finished is None):
+            return None
+        return self.finished - self.started
+
+    def __repr__(self):
+        return f"Result({self.job_name!r}, exitcode={self.exitcode}, "+\
+               f"duration={self.duration}, size={self.size})"
+
+def _size(value):
+    """ Bytes held by value, including what its containers (dicts,
+        lists, tuples, sets, deques, instance __dict__s) hold, every
+        object counted once."""
+    if value is None:
+        return 0
+    size, seen, stack = 0, set(), [value]
+    while stack:
+        x = stack.pop()
+        if id(x) in seen:
+            continue
+        seen.add(id(x))
+        if isinstance(x, memoryview):
+            size += x.nbytes
+            continue
+        size += sys.getsizeof(x)
+        if isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset, deque)):
+            stack.extend(x)
+        elif hasattr(x, "__dict__") and not isinstance(x, type):
+            stack.append(x.__dict__)
+    return size
+
+class Results():
+    """ The latest results of every job, in a ring buffer per job bounded
+        both in number of results and in bytes; the oldest results are
+        dropped first."""
+
+    def __init__(
+            self,
+            max_results=100,
+            max_bytes=1 << 20
+            ):
+        """
+        Parameters
+        ----------
+        max_results : int, optional
+            results kept per job
+            the default is 100
+        max_bytes : int, optional
+            memory kept per job (the latest result is always kept)
+            the default is 1 MiB
+
+        Returns
+        -------
+        None.
+
+        """
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._buffers = {}
+        self._bytes = {}
+
+    def add(
+            self,
+            result
+            ):
+        """
+        Parameters
+        ----------
+        result : Result
+
+        Returns
+        -------
+        None.
+
+        """
+        name = result.job_name
+        with self._lock:
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                buffer = self._buffers[name] = deque()
+                self._bytes[name] = 0
+            buffer.append(result)
+            self._bytes[name] += result.size
+            while (len(buffer) > self.max_results) or \
+                  ((self._bytes[name] > self.max_bytes) and (len(buffer) > 1)):
+                self._bytes[name] -= buffer.popleft().size
+
+    def get(
+            self,
+            job_name,
+            n=None
+            ):
+        """
+        Parameters
+        ----------
+        job_name : str
+        n : int, optional
+            only the latest n results
+            the default is None (all that are kept)
+
+        Returns
+        -------
+        list(Result)
+            oldest first
+
+        """
+        with self._lock:
+            results = list(self._buffers.get(job_name, ()))
+        return results if n is None else results[-n:] if n else []
+
+    def last(
+            self,
+            job_name
+            ):
+        """
+        Returns
+        -------
+        Result
+            the latest result of the job, None if there is none
+
+        """
+        with self._lock:
+            buffer = self._buffers.get(job_name)
+            return buffer[-1] if buffer else None
+
+    def nbytes(
+            self,
+            job_name=None
+            ):
+        """
+        Returns
+        -------
+        int
+            memory held by the results of the job (of all jobs if None)
+
+        """
+        with self._lock:
+            if job_name is None:
+                return sum(self._bytes.values())
+            return self._bytes.get(job_name, 0)
+
+    def clear(
+            self,
+            job_name=None
+            ):
+        """
+        Drops the results of the job (of all jobs if None).
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            if job_name is None:
+                self._buffers, self._bytes = {}, {}
+            else:
+                self._buffers.pop(job_name, None)
+                self._bytes.pop(job_name, None)
@@ -0,0 +1,141 @@
+from random import uniform
+
+class RetryPolicy():
+    """ When and how often an un-successful run is tried again.
+        The n-th retry (n = 0, 1, ...) waits
+            min(max_backoff, backoff * multiplier ** n)
+        seconds after the failed attempt finished; with full jitter a
+        uniformly random part of that, so that jobs failing together
+        do not retry in lockstep."""
+
+    def __init__(
+            self,
+            max_retries=3,
+            backoff=1,
+            multiplier=2,
+            max_backoff=300,
+            jitter=True,
+            max_elapsed=None,
+            attempt_timeout=None,
+            retry_on=None
+            ):
+        """
+        Parameters
+        ----------
+        max_retries : int, optional
+            the default is 3
+        backoff : float, optional
+            seconds to wait before the first retry
+            the default is 1
+        multiplier : float, optional
+            growth of the wait from one retry to the next
+            the default is 2
+        max_backoff : float, optional
+            the longest wait between two attempts
+            the default is 300
+        jitter : bool, optional
+            wait a random duration between 0 and the backoff (full jitter)
+            the default is True
+        max_elapsed : float, optional
+            no retry starts later than these many seconds after the
+            first attempt started
+            the default is None (no limit)
+        attempt_timeout : float, optional
+            an attempt running longer is terminated (runs on pools can
+            not be terminated) and counts as failed
+            the default is None (no limit)
+        retry_on : list or callable, optional
+            exit codes (int) and/or exception types to retry on, or a
+            callable(exitcode, exception) -> bool; the exception type is
+            only known for pool, thread and asyncio runs (else None)
+            the default is None (retry on any failure)
+
+        Returns
+        -------
+        None.
+
+        """
+        for name, value in (("max_retries", max_retries),
+                            ("backoff", backoff),
+                            ("multiplier", multiplier),
+                            ("max_backoff", max_backoff)):
+            if not isinstance(value, (int, float)) or value < 0:
+                raise Exception(f"{name} must be a non-negative int or float")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_elapsed = max_elapsed
+        self.attempt_timeout = attempt_timeout
+        self.retry_on = retry_on
+
+    def delay(
+            self,
+            retry
+            ):
+        """
+        Parameters
+        ----------
+        retry : int
+            0 for the first retry
+
+        Returns
+        -------
+        float
+            seconds to wait before this retry
+
+        """
+        delay = min(self.max_backoff, self.backoff * self.multiplier ** retry)
+        return uniform(0, delay) if self.jitter else delay
+
+    def _retry_on(
+            self,
+            exitcode,
+            exception
+            ):
+        if self.retry_on is None:
+            return True
+        if callable(self.retry_on) and not isinstance(self.retry_on, type):
+            return bool(self.retry_on(exitcode, exception))
+        for x in self.retry_on:
+            if isinstance(x, type):
+                if (exception is not None) and issubclass(exception, x):
+                    return True
+            elif x == exitcode:
+                return True
+        return False
+
+    def should_retry(
+            self,
+            retry,
+            exitcode,
+            exception,
+            elapsed
+            ):
+        """
+        Parameters
+        ----------
+        retry : int
+            retries made so far
+        exitcode : int
+            of the failed attempt
+        exception : type
+            raised by the failed attempt, None if unknown
+        elapsed : float
+            seconds since the first attempt started
+
+        Returns
+        -------
+        delay : float
+            seconds to wait before retrying, None if not to retry
+
+        """
+        if (retry >= self.max_retries) or \
+           not self._retry_on(exitcode, exception):
+            return None
+        delay = self.delay(retry)
+        if (self.max_elapsed is not None) and \
+           (elapsed + delay > self.max_elapsed):
+            return None
+        return delay
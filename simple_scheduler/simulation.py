@@ -0,0 +1,75 @@
+from simple_scheduler.executors import Executor
+
+class _SimulatedRun():
+    """ Gives a simulated run the part of the multiprocess.Process
+        interface that the scheduler relies on."""
+
+    def __init__(self):
+        self.exitcode = None
+        self.exception = None
+        self.result = None
+
+    def is_alive(self):
+        return self.exitcode is None
+
+    def join(
+            self,
+            timeout=None
+            ):
+        pass
+
+class SimulatedExecutor(Executor):
+    """ Runs nothing: every run "takes" run_time seconds of a
+        simple_scheduler.clock.VirtualClock and succeeds (see
+        Schedule.simulate)."""
+
+    def __init__(
+            self,
+            clock,
+            run_time=0
+            ):
+        """
+        Parameters
+        ----------
+        clock : simple_scheduler.clock.VirtualClock
+            the clock of the scheduler
+        run_time : float or callable, optional
+            seconds every run takes, or a callable(function) returning
+            them (function: the job's target loaded with its parameters)
+            the default is 0
+
+        Returns
+        -------
+        None.
+
+        """
+        self.clock = clock
+        self.run_time = run_time
+
+    def submit(
+            self,
+            function,
+            callback,
+            capture=False
+            ):
+        run = _SimulatedRun()
+        run_time = self.run_time(function) if callable(self.run_time) else \
+                   self.run_time
+        run.terminate = lambda: self._finish(run, callback, -15)
+        self.clock.call_at(self.clock.monotonic() + run_time,
+                           lambda: self._finish(run, callback, 0))
+        return run
+
+    def _finish(
+            self,
+            run,
+            callback,
+            exitcode
+            ):
+        if run.exitcode is not None:
+            return
+        run.exitcode = exitcode
+        callback(run)
+
+    def shutdown(self):
+        pass
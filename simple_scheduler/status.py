@@ -0,0 +1,376 @@
+"""
+A live status table of all jobs in shared memory, readable from any
+process on the host, eg.
+
+    python -m simple_scheduler.status simple_scheduler_4242
+"""
+import os
+import time
+import struct
+from hashlib import md5
+from datetime import datetime
+
+_MAGIC = b"SSSB0001"
+_HEADER = struct.Struct("<8sII")
+# a row starts with its sequence number (uint32), then the fields
+_ROW = struct.Struct("<I64sB3xiiiIQQddd")
+_OFFSETS = {name:(offset, struct.Struct("<" + code))
+            for name, offset, code in (("name", 4, "64s"),
+                                       ("state", 68, "B"),
+                                       ("in_flight", 72, "i"),
+                                       ("last_exitcode", 76, "i"),
+                                       ("pid", 80, "i"),
+                                       ("failure_streak", 84, "I"),
+                                       ("runs", 88, "Q"),
+                                       ("failures", 96, "Q"),
+                                       ("last_start", 104, "d"),
+                                       ("last_finish", 112, "d"),
+                                       ("next_fire", 120, "d"))}
+_FIELDS = tuple(_OFFSETS)
+_STATES = ("active", "paused", "removed")
+
+class StatusBoard():
+    """ A fixed-layout table in shared memory, one row per job name
+        (found in O(1) by hashing the name): state, runs in flight, last
+        start/finish, last exit code, failure streak and next fire.
+        Every row has a single writer (the dispatcher of its job, in the
+        scheduler or in the job's process) and a sequence number that
+        lets readers detect a row being written and read it again, so
+        neither side ever takes a lock. A row whose writer died half way
+        through a write is read as it is, marked "torn", until the
+        scheduler resets it (see reset())."""
+
+    def __init__(
+            self,
+            name=None,
+            slots=1024,
+            create=True
+            ):
+        """
+        Parameters
+        ----------
+        name : str, optional
+            of the shared memory block, eg. for the CLI
+            the default is None ("simple_scheduler_<pid>")
+        slots : int, optional
+            the most jobs the board can hold
+            the default is 1024
+        create : bool, optional
+            False attaches to an existing board (readers)
+            the default is True
+
+        Raises
+        ------
+        Exception
+            if an existing block is not a status board
+
+        Returns
+        -------
+        None.
+
+        """
+        from multiprocessing import shared_memory
+        self.name = name if name else f"simple_scheduler_{os.getpid()}"
+        if create:
+            self._memory = shared_memory.SharedMemory(
+                self.name, create=True, size=_HEADER.size + slots * _ROW.size)
+            _HEADER.pack_into(self._memory.buf, 0, _MAGIC, slots, _ROW.size)
+        else:
+            self._memory = shared_memory.SharedMemory(self.name)
+            self._untrack()
+        magic, self.slots, size = _HEADER.unpack_from(self._memory.buf, 0)
+        if (magic != _MAGIC) or (size != _ROW.size):
+            raise Exception(f"{self.name} is not a status board")
+        self._owner = create
+        self._rows = {}
+
+    def _untrack(self):
+        """ Only the creator may unlink the block when it exits (see
+            bpo-39959)."""
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._memory._name, "shared_memory")
+        except Exception:
+            pass
+
+    def __getstate__(self):
+        return {"name":self.name}
+
+    def __setstate__(self, state):
+        # a spawned process attaches to the board by its name
+        self.__init__(state["name"], create=False)
+
+    def _offset(
+            self,
+            row,
+            field
+            ):
+        return _HEADER.size + row * _ROW.size + _OFFSETS[field][0]
+
+    def _find(
+            self,
+            job_name
+            ):
+        """
+        Returns
+        -------
+        row : int
+            of the job, or of the empty slot where it would go
+        found : bool
+
+        """
+        key = job_name.encode()[:64]
+        start = int.from_bytes(md5(key).digest()[:8], "big") % self.slots
+        buf = self._memory.buf
+        for i in range(self.slots):
+            row = (start + i) % self.slots
+            name = bytes(buf[self._offset(row, "name"):
+                             self._offset(row, "name") + 64]).rstrip(b"\0")
+            if name == key:
+                return row, True
+            if not name:
+                return row, False
+        return None, False
+
+    def _row(
+            self,
+            job_name
+            ):
+        """ The row of the job, looked up once per process."""
+        row = self._rows.get(job_name)
+        if row is None:
+            row, found = self._find(job_name)
+            row = row if found else self.register(job_name)
+            self._rows[job_name] = row
+        return row
+
+    def _write(
+            self,
+            job_name,
+            **fields
+            ):
+        row = self._row(job_name)
+        buf, base = self._memory.buf, _HEADER.size + row * _ROW.size
+        # odd while the row is being written (already odd if the last
+        # writer died half way)
+        seq = struct.unpack_from("<I", buf, base)[0] | 1
+        struct.pack_into("<I", buf, base, seq)
+        for name, value in fields.items():
+            offset, packer = _OFFSETS[name]
+            packer.pack_into(buf, base + offset, value)
+        struct.pack_into("<I", buf, base, (seq + 1) & 0xffffffff)
+
+    def _field(
+            self,
+            job_name,
+            name
+            ):
+        offset, packer = _OFFSETS[name]
+        row = self._row(job_name)
+        return packer.unpack_from(self._memory.buf,
+                                  _HEADER.size + row * _ROW.size + offset)[0]
+
+    def register(
+            self,
+            job_name
+            ):
+        """
+        Gives the job a row (the one it had, if any), by the scheduler
+        that adds the job.
+
+        Parameters
+        ----------
+        job_name : str
+
+        Raises
+        ------
+        Exception
+            if the board is full
+
+        Returns
+        -------
+        int
+            the row of the job
+
+        """
+        row, found = self._find(job_name)
+        if row is None:
+            raise Exception(f"The status board {self.name} is full "+\
+                            f"({self.slots} jobs)")
+        self._rows[job_name] = row
+        if not found:
+            self._write(job_name, name=job_name.encode()[:64])
+        self._write(job_name, state=0)
+        return row
+
+    def scheduled(
+            self,
+            job_name,
+            next_fire
+            ):
+        """ next_fire : epoch of the next fire of the job."""
+        self._write(job_name, next_fire=next_fire)
+
+    def started(
+            self,
+            job_name,
+            at,
+            pid
+            ):
+        """ A run (or attempt) started at epoch at, in process pid (or 0)."""
+        self._write(job_name,
+                    in_flight=self._field(job_name, "in_flight") + 1,
+                    last_start=at,
+                    pid=pid or 0)
+
+    def finished(
+            self,
+            job_name,
+            at,
+            exitcode
+            ):
+        """ A run (or attempt) finished at epoch at with exitcode."""
+        streak = 0 if exitcode == 0 else \
+                 self._field(job_name, "failure_streak") + 1
+        self._write(job_name,
+                    in_flight=max(0, self._field(job_name, "in_flight") - 1),
+                    last_finish=at,
+                    last_exitcode=exitcode,
+                    failure_streak=streak,
+                    runs=self._field(job_name, "runs") + 1,
+                    failures=self._field(job_name, "failures") + (exitcode != 0))
+
+    def set_state(
+            self,
+            job_name,
+            state
+            ):
+        """ state : "active", "paused" or "removed"."""
+        self._write(job_name, state=_STATES.index(state))
+
+    def reset(
+            self,
+            job_name,
+            state="removed"
+            ):
+        """
+        Marks the row of a job whose process was terminated (and may have
+        died half way through a write) as whole again, with no runs in
+        flight.
+
+        Parameters
+        ----------
+        job_name : str
+        state : str, optional
+            "active", "paused" or "removed"
+            the default is "removed"
+
+        Returns
+        -------
+        None.
+
+        """
+        self._write(job_name, state=_STATES.index(state), in_flight=0, pid=0)
+
+    def _read_row(
+            self,
+            row,
+            tries=100
+            ):
+        """
+        Reads a row again while it is being written, backing off up to a
+        millisecond between tries; after the last try it is returned as
+        it is, with "torn" set (its writer may have died half way).
+
+        Returns
+        -------
+        dict
+
+        """
+        buf, base = self._memory.buf, _HEADER.size + row * _ROW.size
+        for i in range(tries):
+            values = _ROW.unpack_from(buf, base)
+            torn = (values[0] % 2 == 1) or \
+                   (struct.unpack_from("<I", buf, base)[0] != values[0])
+            if not torn:
+                break
+            time.sleep(min(0.001, 0.00001 * (1 << i)))
+        status = dict(zip(_FIELDS, values[1:]))
+        status["name"] = status["name"].rstrip(b"\0").decode(errors="replace")
+        status["state"] = _STATES[status["state"]] \
+                          if status["state"] < len(_STATES) else "?"
+        status["torn"] = torn
+        return status
+
+    def read(
+            self,
+            job_name
+            ):
+        """
+        Parameters
+        ----------
+        job_name : str
+
+        Returns
+        -------
+        dict
+            the row of the job ("torn" if it could not be read whole),
+            None if there is none
+
+        """
+        row, found = self._find(job_name)
+        return self._read_row(row) if found else None
+
+    def snapshot(self):
+        """
+        Returns
+        -------
+        list(dict)
+            the rows of all jobs
+
+        """
+        rows = []
+        for row in range(self.slots):
+            offset = self._offset(row, "name")
+            if self._memory.buf[offset]:
+                rows.append(self._read_row(row))
+        return rows
+
+    def close(self):
+        """
+        Detaches from the board; the process that created it also
+        removes it.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+def _format(epoch):
+    if not epoch:
+        return "-"
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("name", help="of the board, eg. simple_scheduler_4242")
+    args = parser.parse_args()
+    board = StatusBoard(args.name, create=False)
+    print(f"{'job':<32} {'state':<8} {'running':>7} {'runs':>8} "+\
+          f"{'fails':>6} {'streak':>6} {'exit':>5} {'last start':<19} "+\
+          f"{'next fire':<19}")
+    for row in sorted(board.snapshot(), key=lambda row: row["name"]):
+        state = row["state"] + ("*" if row["torn"] else "")
+        print(f"{row['name'][:32]:<32} {state:<8} "+\
+              f"{row['in_flight']:>7} {row['runs']:>8} {row['failures']:>6} "+\
+              f"{row['failure_streak']:>6} {row['last_exitcode']:>5} "+\
+              f"{_format(row['last_start']):<19} {_format(row['next_fire']):<19}")
+    board.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import sqlite3
+from threading import Lock
+
+import dill
+
+class JobStore():
+    """ Keeps job definitions, next fire times and last results outside
+        of the process, so that a restarted scheduler can pick up where
+        it left off."""
+
+    def add(
+            self,
+            kind,
+            jobs
+            ):
+        """
+        Inserts (or replaces) job definitions; a job's stored next fire
+        time is kept.
+
+        Parameters
+        ----------
+        kind : str
+            name of the scheduler class, eg. "Event"
+        jobs : list(tuple(_Job, str))
+            jobs with their descriptions
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def remove(
+            self,
+            kind,
+            job_names
+            ):
+        """
+        Parameters
+        ----------
+        kind : str
+        job_names : list(str)
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def update(
+            self,
+            kind,
+            job_name,
+            **fields
+            ):
+        """
+        Buffers a change of next_fire (epoch), last_exitcode or last_run
+        (epoch); buffered changes are written by flush().
+
+        Parameters
+        ----------
+        kind : str
+        job_name : str
+
+        Returns
+        -------
+        None.
+
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Writes all buffered changes.
+
+        Returns
+        -------
+        None.
+
+        """
+        pass
+
+    def load(
+            self,
+            kind
+            ):
+        """
+        Parameters
+        ----------
+        kind : str
+
+        Returns
+        -------
+        list(tuple(_Job, str, float))
+            jobs with their descriptions and next fire times (epoch or None)
+
+        """
+        raise NotImplementedError
+
+class SQLiteJobStore(JobStore):
+    """ A job store in a local SQLite file."""
+
+    def __init__(
+            self,
+            path="simple_scheduler.db"
+            ):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            the SQLite database file
+            the default is "simple_scheduler.db"
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        self._lock = Lock()
+        self._pending = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    kind TEXT,
+                    name TEXT,
+                    job BLOB,
+                    description TEXT,
+                    next_fire REAL,
+                    last_exitcode INTEGER,
+                    last_run REAL,
+                    PRIMARY KEY (kind, name)
+                    )""")
+
+    def add(
+            self,
+            kind,
+            jobs
+            ):
+        with self._lock, self._connection:
+            self._connection.executemany("""
+                INSERT INTO jobs (kind, name, job, description)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (kind, name) DO UPDATE SET
+                    job = excluded.job,
+                    description = excluded.description""",
+                [(kind, job.name, dill.dumps(job), description)
+                 for job, description in jobs])
+
+    def remove(
+            self,
+            kind,
+            job_names
+            ):
+        with self._lock, self._connection:
+            for name in job_names:
+                self._pending.pop((kind, name), None)
+            self._connection.executemany(
+                "DELETE FROM jobs WHERE kind = ? AND name = ?",
+                [(kind, name) for name in job_names])
+
+    def update(
+            self,
+            kind,
+            job_name,
+            **fields
+            ):
+        with self._lock:
+            self._pending.setdefault((kind, job_name), {}).update(fields)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            with self._connection:
+                for (kind, name), fields in pending.items():
+                    self._connection.execute(
+                        "UPDATE jobs SET " +\
+                        ", ".join(f"{field} = ?" for field in fields) +\
+                        " WHERE kind = ? AND name = ?",
+                        (*fields.values(), kind, name))
+
+    def load(
+            self,
+            kind
+            ):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job, description, next_fire FROM jobs WHERE kind = ?",
+                (kind,)).fetchall()
+        return [(dill.loads(job), description, next_fire)
+                for job, description, next_fire in rows]
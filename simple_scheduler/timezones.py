@@ -0,0 +1,100 @@
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+@lru_cache(maxsize=None)
+def get_timezone(
+        name
+        ):
+    """
+    Parameters
+    ----------
+    name : str
+        IANA time zone, eg. "Asia/Kolkata" or "GMT"
+
+    Raises
+    ------
+    zoneinfo.ZoneInfoNotFoundError, ValueError
+        if the time zone is unknown
+
+    Returns
+    -------
+    zoneinfo.ZoneInfo
+        one object per name, built on first use
+
+    """
+    return ZoneInfo(name)
+
+@lru_cache(maxsize=1)
+def all_timezones():
+    """
+    Returns
+    -------
+    list(str)
+        every time zone known to zoneinfo, sorted (read on first use)
+
+    """
+    return sorted(available_timezones())
+
+def to_epoch(
+        local,
+        zone
+        ):
+    """
+    Converts a wall-clock time of a time zone into an epoch.
+        - a time that does not exist (skipped by a DST gap) is moved
+          forward by the length of the gap, eg. 02:30 on the night the
+          clock jumps from 02:00 to 03:00 becomes 03:30
+        - a time that exists twice (DST overlap) is its first occurrence
+
+    Parameters
+    ----------
+    local : datetime.datetime
+        naive
+    zone : zoneinfo.ZoneInfo
+
+    Returns
+    -------
+    float
+
+    """
+    # fold=0 takes the offset in force before the transition, which is
+    # the first occurrence in an overlap and a shift forward in a gap
+    return local.replace(tzinfo=zone, fold=0).timestamp()
+
+def to_local(
+        epoch,
+        zone
+        ):
+    """
+    Parameters
+    ----------
+    epoch : float
+    zone : zoneinfo.ZoneInfo
+
+    Returns
+    -------
+    datetime.datetime
+        naive, the wall-clock time in the time zone
+
+    """
+    return datetime.fromtimestamp(epoch, zone).replace(tzinfo=None)
+
+def localize(
+        local,
+        zone
+        ):
+    """
+    Parameters
+    ----------
+    local : datetime.datetime
+        naive
+    zone : zoneinfo.ZoneInfo
+
+    Returns
+    -------
+    datetime.datetime
+        aware, resolved as in to_epoch()
+
+    """
+    return datetime.fromtimestamp(to_epoch(local, zone), zone)
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from simple_scheduler.clock import VirtualClock
+from simple_scheduler.recurring import Recurring
+from simple_scheduler.simulation import SimulatedExecutor, _SimulatedRun
+
+class ScriptedExecutor(SimulatedExecutor):
+    """ Every run takes run_time seconds and exits with the next of
+        exitcodes (0 once they are used up); the clock times at which
+        runs started are kept in .started."""
+
+    def __init__(
+            self,
+            clock,
+            run_time=0,
+            exitcodes=()
+            ):
+        super().__init__(clock, run_time)
+        self.exitcodes = iter(exitcodes)
+        self.started = []
+
+    def submit(
+            self,
+            function,
+            callback,
+            capture=False
+            ):
+        run = _SimulatedRun()
+        self.started.append(self.clock.monotonic())
+        run.terminate = lambda: self._finish(run, callback, -15)
+        self.clock.call_at(self.clock.monotonic() + self.run_time,
+                           lambda: self._finish(run, callback,
+                                                next(self.exitcodes, 0)))
+        return run
+
+@pytest.fixture
+def simulated():
+    """ Builds a dispatcher scheduler on a VirtualClock (from 2026-01-01,
+        or start) whose runs take run_time seconds and exit with
+        exitcodes."""
+    def scheduler(run_time=0, exitcodes=(), kind=Recurring, start=None,
+                  **kwargs):
+        clock = VirtualClock(start=start if start else datetime(2026, 1, 1))
+        return kind(dispatcher=True,
+                    clock=clock,
+                    executor=ScriptedExecutor(clock, run_time, exitcodes),
+                    **kwargs)
+    return scheduler
+
+@pytest.fixture
+def scripted():
+    return ScriptedExecutor
@@ -0,0 +1,79 @@
+import os
+import json
+from glob import glob
+from multiprocessing import get_context
+
+from simple_scheduler.audit import AuditLog
+
+def job(): pass
+
+def lines(name):
+    with open(name) as f:
+        return [json.loads(line) for line in f]
+
+def write(path, worker, n):
+    audit = AuditLog(path, max_bytes=4096, backups=100, batch_size=7)
+    for i in range(n):
+        audit.record("finished", f"job-{worker}", i, exitcode=0)
+        if i % 50 == 0:
+            audit.flush()
+    audit.close()
+
+def test_rotation(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    audit = AuditLog(path, max_bytes=1000, backups=2, batch_size=5)
+    for i in range(200):
+        audit.record("dispatched", "j", i, attempt=0)
+        audit.flush()
+    audit.close()
+    assert sorted(os.listdir(tmp_path)) == ["audit.jsonl", "audit.jsonl.1",
+                                            "audit.jsonl.2", "audit.jsonl.lock"]
+    assert all(os.path.getsize(f"{path}{suffix}") <= 1000
+               for suffix in ("", ".1", ".2"))
+    # the latest records are kept, whole and in order
+    ts = [record["ts"] for record in lines(f"{path}.2") + lines(f"{path}.1") +
+          lines(path)]
+    assert ts == list(range(200 - len(ts), 200))
+
+def test_truncate(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    audit = AuditLog(path, max_bytes=1000, backups=0)
+    for i in range(200):
+        audit.record("dispatched", "j", i)
+        audit.flush()
+    audit.close()
+    assert not os.path.exists(f"{path}.1")
+    assert lines(path)[-1]["ts"] == 199
+
+def test_processes(tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    processes = [get_context("fork").Process(target=write, args=(path, i, 500))
+                 for i in range(4)]
+    [p.start() for p in processes]
+    [p.join() for p in processes]
+    records = [record for name in glob(f"{path}*") if not name.endswith(".lock")
+               for record in lines(name)]
+    # nothing lost or interleaved across processes and rotations
+    assert len(records) == 4 * 500
+    for i in range(4):
+        assert sorted(record["ts"] for record in records
+                      if record["job"] == f"job-{i}") == list(range(500))
+
+def test_dropped(tmp_path):
+    audit = AuditLog(str(tmp_path / "audit.jsonl"), max_buffered=10,
+                     flush_seconds=60)
+    for i in range(15):
+        audit.record("scheduled", "j", i)
+    assert audit.dropped == 5
+    audit.close()
+
+def test_scheduler_events(simulated, tmp_path):
+    path = str(tmp_path / "audit.jsonl")
+    s = simulated(run_time=1, exitcodes=[1], audit=AuditLog(path))
+    s.add_job(target=job, period_in_seconds=10, job_name="j")
+    s.simulate(15)
+    s.audit.close()
+    events = [record["event"] for record in lines(path)]
+    assert events == ["scheduled", "dispatched", "started", "scheduled",
+                      "failed", "dispatched", "started", "scheduled",
+                      "finished"]
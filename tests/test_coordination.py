@@ -0,0 +1,45 @@
+from simple_scheduler.coordination import SQLiteCoordinator
+
+def job(): pass
+
+def test_claim(tmp_path):
+    path = str(tmp_path / "coordination.db")
+    a, b = SQLiteCoordinator(path), SQLiteCoordinator(path)
+    assert a.claim("Recurring", "j", 100)
+    assert not b.claim("Recurring", "j", 100)
+    assert b.claim("Recurring", "j", 110)
+    assert b.claim("Event", "j", 100)
+
+def test_shard(tmp_path):
+    path = str(tmp_path / "coordination.db")
+    members = [SQLiteCoordinator(path, instance=f"m{i}", shard=True)
+               for i in range(3)]
+    for member in members:
+        member.owns("Recurring", "warm-up")
+    # read the members again (at most every third of a lease otherwise)
+    for member in members:
+        member._renewed = 0
+    jobs = [f"job-{i}" for i in range(60)]
+    owners = {name: [m.instance for m in members if m.owns("Recurring", name)]
+              for name in jobs}
+    assert all(len(owner) == 1 for owner in owners.values())
+    # the jobs of a member that leaves move to the others, no other job moves
+    members[0].leave()
+    for member in members[1:]:
+        member._renewed = 0
+    for name in jobs:
+        moved = [m.instance for m in members[1:] if m.owns("Recurring", name)]
+        assert len(moved) == 1
+        assert (owners[name] == ["m0"]) or (moved == owners[name])
+    for member in members[1:]:
+        member.leave()
+
+def test_schedulers_share_fires(simulated, tmp_path):
+    path = str(tmp_path / "coordination.db")
+    schedulers = [simulated(coordinator=SQLiteCoordinator(path))
+                  for _ in range(2)]
+    for s in schedulers:
+        s.add_job(target=job, period_in_seconds=10, job_name="j")
+    reports = [s.simulate(95) for s in schedulers]
+    # both fire every time, only one runs each fire
+    assert [report["runs"] for report in reports] == [{"j": 10}, {}]
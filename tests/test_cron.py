@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from simple_scheduler.cron import Cron
+from simple_scheduler.event import Event
+
+def job(): pass
+
+def test_fields():
+    cron = Cron("*/15 9-17 * * mon-fri")
+    assert cron.seconds == 1
+    assert cron.minutes == (1 << 0) | (1 << 15) | (1 << 30) | (1 << 45)
+    assert cron.hours == sum(1 << h for h in range(9, 18))
+    assert cron.weekdays == sum(1 << d for d in range(1, 6))
+
+def test_names_steps_and_sunday():
+    assert Cron("0 0 1 jan,jul *").months == (1 << 1) | (1 << 7)
+    assert Cron("0 0 * * 7").weekdays == Cron("0 0 * * sun").weekdays == 1
+    assert Cron("10/20 * * * * *").seconds == (1 << 10) | (1 << 30) | (1 << 50)
+
+@pytest.mark.parametrize("expression", ["* * * *",
+                                        "60 * * * *",
+                                        "* 24 * * *",
+                                        "*/0 * * * *",
+                                        "5-1 * * * *",
+                                        "* * * foo *"])
+def test_invalid(expression):
+    with pytest.raises(Exception):
+        Cron(expression)
+
+def test_next_fire():
+    cron = Cron("30 0 12 1,15 * *")
+    assert cron.next_fire(datetime(2026, 1, 1, 12, 0, 30)) == \
+           datetime(2026, 1, 15, 12, 0, 30)
+    assert cron.fire_times(datetime(2026, 1, 1), count=3) == \
+           [datetime(2026, 1, 1, 12, 0, 30),
+            datetime(2026, 1, 15, 12, 0, 30),
+            datetime(2026, 2, 1, 12, 0, 30)]
+
+def test_day_of_month_or_day_of_week():
+    # the 13th, or any friday
+    times = Cron("0 0 13 * fri").fire_times(datetime(2026, 2, 1),
+                                            until=datetime(2026, 2, 28))
+    assert [t.day for t in times] == [6, 13, 20, 27]
+
+def test_never_fires():
+    assert Cron("0 0 30 2 *").next_fire(datetime(2026, 1, 1)) is None
+    scheduler = Event(dispatcher=True)
+    with pytest.raises(Exception, match="never fires"):
+        scheduler.add_job(target=print, when=["0 0 30 2 *"], job_name="x")
+    assert not scheduler._specs
+
+def test_sparse():
+    # 29th of february, and a 13th that is a friday in any month
+    assert [t.year for t in Cron("0 0 0 29 2 *").fire_times(
+                datetime(2026, 1, 1), count=3)] == [2028, 2032, 2036]
+    # or any monday of february
+    assert Cron("0 0 0 29 2 1").next_fire(datetime(2026, 1, 1)) == \
+           datetime(2026, 2, 2)
+
+def test_event_when(simulated):
+    s = simulated(kind=Event)
+    s.add_job(target=job, when=["*/20 * * * * *", "*|00:01"], job_name="j")
+    # every 20 seconds, 00:01:00 (in both) fires once
+    assert s.simulate(119)["runs"] == {"j": 6}
+    assert s.fire_times("j", count=3) == [datetime(2026, 1, 1, 0, 2, 0,
+                                                   tzinfo=timezone.utc),
+                                          datetime(2026, 1, 1, 0, 2, 20,
+                                                   tzinfo=timezone.utc),
+                                          datetime(2026, 1, 1, 0, 2, 40,
+                                                   tzinfo=timezone.utc)]
@@ -0,0 +1,51 @@
+from itertools import repeat
+
+import pytest
+
+from simple_scheduler.event import Event
+
+def job(): pass
+
+def test_dependencies(simulated):
+    s = simulated(run_time=1)
+    s.add_job(target=job, period_in_seconds=10, job_name="a")
+    s.add_job(target=job, depends_on="a", job_name="b")
+    s.add_job(target=job, depends_on=["a", "b"], job_name="c")
+    assert s.simulate(95)["runs"] == {"a": 10, "b": 10, "c": 10}
+
+def test_upstream_failure(simulated, scripted):
+    s = simulated(run_time=1)
+    s.add_job(target=job, period_in_seconds=10, job_name="a",
+              executor=scripted(s.clock, 1, repeat(1)))
+    s.add_job(target=job, depends_on="a", job_name="b")
+    s.add_job(target=job, depends_on="b", job_name="c")
+    report = s.simulate(95)
+    assert report["runs"] == {"a": 10}
+    assert report["skipped"] == {"b": 10, "c": 10}
+
+def test_cycle(simulated):
+    s = simulated()
+    s.add_job(target=job, period_in_seconds=10, job_name="a")
+    s.add_job(target=job, depends_on="a", job_name="b")
+    with pytest.raises(Exception, match="cycle"):
+        s.add_job(target=job, depends_on="b", job_name="b")
+
+def test_unknown_upstream(simulated):
+    s = simulated()
+    # upstream jobs may be added after the jobs depending on them
+    s.add_job(target=job, depends_on="a", job_name="b")
+    s.add_job(target=job, period_in_seconds=10, job_name="a")
+    s.add_job(target=job, depends_on="typo", job_name="c")
+    with pytest.raises(Exception, match=r"c depends on unknown job\(s\) \['typo'\]"):
+        s.simulate(10)
+    s.remove_job("c")
+    assert s.simulate(15)["runs"] == {"a": 2, "b": 2}
+    with pytest.raises(Exception, match="unknown job"):
+        s.add_job(target=job, depends_on="typo", job_name="c")
+
+def test_empty_when(simulated):
+    s = simulated(kind=Event)
+    with pytest.raises(Exception, match="must not be empty"):
+        s.add_job(target=job, when=[], job_name="a")
+    with pytest.raises(Exception, match="either"):
+        s.add_job(target=job, job_name="a")
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+from simple_scheduler.base import _Run
+from simple_scheduler.fairqueue import FairQueue
+
+def job(): pass
+
+def run(priority=0, tag=0, enqueued=0):
+    run = _Run(SimpleNamespace(priority=priority))
+    run.tag, run.enqueued = tag, enqueued
+    return run
+
+def drain(queue):
+    runs = []
+    while queue.peek() is not None:
+        runs.append(queue.peek())
+        queue.remove(runs[-1])
+    return runs
+
+def test_order():
+    queue = FairQueue()
+    runs = [run(0, 2), run(1, 5), run(0, 1), run(1, 3)]
+    for r in runs:
+        queue.push(r)
+    assert len(queue) == 4
+    # highest priority first, then lowest tag; worst is the other way round
+    assert queue.worst() is runs[0]
+    assert drain(queue) == [runs[3], runs[1], runs[2], runs[0]]
+    assert (len(queue), queue.peek(), queue.worst()) == (0, None, None)
+
+def test_ties():
+    queue = FairQueue()
+    runs = [run(0, 1) for _ in range(3)]
+    for r in runs:
+        queue.push(r)
+    # queued first, served first
+    assert drain(queue) == runs
+
+def test_remove_and_put_back():
+    queue = FairQueue()
+    a, b = run(0, 1), run(0, 2)
+    queue.push(a)
+    queue.push(b)
+    queue.remove(a)
+    queue.remove(a)
+    assert (len(queue), queue.peek()) == (1, b)
+    queue.put_back(a)
+    queue.put_back(a)
+    assert drain(queue) == [a, b]
+
+def test_age():
+    queue = FairQueue(aging=10)
+    old, new, high = run(0, 5, enqueued=0), run(0, 1, enqueued=15), \
+                     run(2, 9, enqueued=15)
+    for r in (old, new, high):
+        queue.push(r)
+    queue.age(25)
+    # old waited 25s: 2 levels up, level with high (lower tag first)
+    assert (old.level, new.level, high.level) == (2, 1, 3)
+    assert drain(queue) == [high, old, new]
+
+def test_compact():
+    queue = FairQueue()
+    runs = [run(0, i) for i in range(1000)]
+    for r in runs:
+        queue.push(r)
+    for r in runs[:-1]:
+        queue.remove(r)
+    queue.age(0)
+    # most entries were stale: the heaps are rebuilt
+    assert sum(len(heap) for heaps in queue._levels.values()
+               for heap in heaps) == 2
+    assert drain(queue) == runs[-1:]
+
+def test_priority_and_weight(simulated):
+    s = simulated(run_time=1, max_concurrency=1, aging=None, max_pending=50)
+    for name, weight in (("a", 2), ("b", 1), ("c", 1)):
+        s.add_job(target=job, period_in_seconds=1, job_name=name,
+                  weight=weight)
+    s.add_job(target=job, period_in_seconds=7, job_name="urgent",
+              priority=10)
+    runs = s.simulate(400)["runs"]
+    # every urgent fire runs, the rest is shared 2:1:1
+    assert runs["urgent"] == 58
+    assert abs(runs["a"] - 2 * runs["b"]) <= 2
+    assert abs(runs["b"] - runs["c"]) <= 1
+
+def test_aging(simulated):
+    runs = {}
+    for aging in (None, 30):
+        s = simulated(run_time=1, max_concurrency=1, aging=aging,
+                      max_pending=20)
+        s.add_job(target=job, period_in_seconds=1, job_name="high",
+                  priority=1)
+        s.add_job(target=job, period_in_seconds=1, job_name="low")
+        runs[aging] = s.simulate(600)["runs"].get("low", 0)
+    # without aging the low priority starves
+    assert runs[None] <= 1
+    assert runs[30] >= 10
@@ -0,0 +1,99 @@
+import time
+from threading import Event, Lock
+
+import pytest
+
+from simple_scheduler.executors import ThreadPoolExecutor
+from simple_scheduler.recurring import Recurring
+
+seen, lock = [], Lock()
+
+def square(item, offset=0):
+    with lock:
+        seen.append(item * item + offset)
+
+def odd_fails(item):
+    if item % 2:
+        raise ValueError(item)
+
+def interrupted(item):
+    if item == 3:
+        raise KeyboardInterrupt
+    if item == 5:
+        raise SystemExit(0)
+
+def inputs():
+    yield from range(4)
+    raise KeyboardInterrupt
+
+def wait_for(results, job_name, seconds=10):
+    deadline = time.monotonic() + seconds
+    while results.last(job_name) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return results.last(job_name)
+
+def test_fan_out():
+    seen.clear()
+    s = Recurring(dispatcher=True)
+    s.add_job(target=square, period_in_seconds=60, inputs=range(1000),
+              chunk_size=64, kwargs={"offset": 1},
+              executor=ThreadPoolExecutor(4), capture=True)
+    s.run()
+    try:
+        result = wait_for(s.results, "square")
+        assert result.exitcode == 0
+        assert result.value == {"inputs": 1000, "failed": 0, "chunks": 16}
+        assert sorted(seen) == [i * i + 1 for i in range(1000)]
+    finally:
+        s.clear()
+
+def test_failed_input():
+    s = Recurring(dispatcher=True)
+    s.add_job(target=odd_fails, period_in_seconds=60, inputs=lambda: range(10),
+              chunk_size=3, executor=ThreadPoolExecutor(2), capture=True)
+    s.run()
+    try:
+        result = wait_for(s.results, "odd_fails")
+        assert (result.exitcode, result.exception) == (1, ValueError)
+        assert result.value["failed"] == 5
+        assert "ValueError: 1" in result.traceback
+    finally:
+        s.clear()
+
+def test_streamed():
+    read = []
+
+    def items():
+        for i in range(100):
+            read.append(i)
+            yield i
+    gate = Event()
+    s = Recurring(dispatcher=True)
+    s.add_job(target=lambda item: gate.wait(), job_name="blocked",
+              period_in_seconds=60, inputs=items, chunk_size=5,
+              executor=ThreadPoolExecutor(1))
+    s.run()
+    try:
+        time.sleep(0.5)
+        # two chunks in flight for the single worker, and one read ahead
+        assert len(read) <= 3 * 5
+    finally:
+        gate.set()
+        s.clear()
+
+@pytest.mark.parametrize("items, failed", [(range(10), 1),
+                                           (inputs, 2)])
+def test_base_exceptions(items, failed):
+    s = Recurring(dispatcher=True)
+    s.add_job(target=interrupted, period_in_seconds=60, inputs=items,
+              chunk_size=2, executor=ThreadPoolExecutor(2), capture=True)
+    s.run()
+    try:
+        result = wait_for(s.results, "interrupted")
+        # the input 5 exited with 0: a success
+        assert result.exitcode == 1
+        assert result.exception is KeyboardInterrupt
+        assert result.value["failed"] == failed
+    finally:
+        s.clear()
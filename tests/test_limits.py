@@ -0,0 +1,45 @@
+import pytest
+
+from simple_scheduler.recurring import Recurring
+
+def job(): pass
+
+@pytest.mark.parametrize("overlap, runs, skipped", [("queue", 4, 1),
+                                                    ("skip", 3, 3)])
+def test_overlap(simulated, overlap, runs, skipped):
+    # runs take 15s, one every 10s
+    s = simulated(run_time=15)
+    s.add_job(target=job, period_in_seconds=10, job_name="j",
+              max_instances=1, overlap=overlap)
+    report = s.simulate(59)
+    assert report["fires"] == {"j": 6}
+    assert report["runs"] == {"j": runs}
+    assert report["skipped"] == {"j": skipped}
+    assert report["peak_concurrency"] == 1
+
+def test_overlap_terminate(simulated):
+    s = simulated(run_time=15)
+    s.add_job(target=job, period_in_seconds=10, job_name="j",
+              max_instances=1, overlap="terminate")
+    report = s.simulate(59)
+    assert report["runs"] == {"j": 6}
+    assert report["peak_concurrency"] == 1
+    # every run but the last is terminated by the next one
+    assert s.metrics.snapshot()["failures_total"] == \
+           {(("job", "j"), ("exitcode", "-15")): 5}
+
+def test_max_concurrency_and_max_pending(simulated):
+    s = simulated(run_time=10, max_concurrency=2, max_pending=3)
+    for i in range(6):
+        s.add_job(target=job, period_in_seconds=60, job_name=f"j{i}")
+    report = s.simulate(59)
+    # 2 run at once, 3 wait, the last one finds the queue full
+    assert report["peak_concurrency"] == 2
+    assert report["runs"] == {f"j{i}": 1 for i in range(5)}
+    assert report["skipped"] == {"j5": 1}
+
+@pytest.mark.parametrize("settings", [dict(max_concurrency=2),
+                                      dict(rate_limit=1)])
+def test_limits_require_dispatcher(settings):
+    with pytest.raises(Exception, match="require dispatcher=True"):
+        Recurring(**settings)
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from simple_scheduler.executors import ThreadPoolExecutor
+from simple_scheduler.recurring import Recurring
+from simple_scheduler.results import Result, Results, _size
+
+def answer(): return {"answer": [42] * 10}
+
+def payload(): return b"x" * 100000
+
+def broken(): raise KeyError("missing")
+
+def wait_for(results, job_name, seconds=10):
+    deadline = time.monotonic() + seconds
+    while results.last(job_name) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return results.last(job_name)
+
+def test_size():
+    strings = [str(i) * 1000 for i in range(10)]
+    assert _size(strings) >= 10 * 1000
+    assert _size({"a": strings, "b": strings}) < 2 * _size(strings)
+    assert _size(memoryview(b"x" * 1000)) == 1000
+    assert _size(None) == 0
+
+def test_ring_buffer():
+    results = Results(max_results=3, max_bytes=10000)
+    for i in range(5):
+        results.add(Result("j", 0, value=i))
+    assert [result.value for result in results.get("j")] == [2, 3, 4]
+    assert [result.value for result in results.get("j", n=1)] == [4]
+    results.add(Result("j", 0, value="x" * 20000))
+    # over max_bytes: only the latest is kept
+    assert len(results.get("j")) == 1
+    assert results.nbytes("j") == results.last("j").size
+    results.clear("j")
+    assert results.last("j") is None and results.nbytes() == 0
+
+def test_capture_fork():
+    s = Recurring(dispatcher=True)
+    s.add_job(target=answer, period_in_seconds=60, capture=True)
+    s.add_job(target=payload, period_in_seconds=60, capture=True)
+    s.run()
+    try:
+        result = wait_for(s.results, "answer")
+        assert (result.exitcode, result.value) == (0, answer())
+        assert result.duration >= 0
+        assert wait_for(s.results, "payload").value == payload()
+    finally:
+        s.clear()
+
+def test_capture_exception():
+    s = Recurring(dispatcher=True, executor=ThreadPoolExecutor(2))
+    s.add_job(target=broken, period_in_seconds=60, capture=True)
+    s.run()
+    try:
+        result = wait_for(s.results, "broken")
+        assert result.exitcode != 0
+        assert result.exception is KeyError
+        assert "missing" in result.traceback
+    finally:
+        s.clear()
+
+def test_capture_requires_dispatcher():
+    with pytest.raises(Exception, match="capture requires dispatcher=True"):
+        Recurring().add_job(target=answer, period_in_seconds=60, capture=True)
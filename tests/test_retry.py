@@ -0,0 +1,47 @@
+from itertools import repeat
+
+import pytest
+
+from simple_scheduler.retry import RetryPolicy
+
+def job(): pass
+
+def test_delay():
+    policy = RetryPolicy(backoff=1, multiplier=3, max_backoff=20, jitter=False)
+    assert [policy.delay(n) for n in range(5)] == [1, 3, 9, 20, 20]
+    policy = RetryPolicy(backoff=10, jitter=True)
+    assert all(0 <= policy.delay(0) <= 10 for _ in range(100))
+
+@pytest.mark.parametrize("retry_on, retried", [(None, True),
+                                               ([2], True),
+                                               ([1, ValueError], False),
+                                               ([KeyError], True),
+                                               (lambda exitcode, e: False,
+                                                False)])
+def test_retry_on(retry_on, retried):
+    policy = RetryPolicy(retry_on=retry_on)
+    assert (policy.should_retry(0, 2, KeyError, 0) is not None) == retried
+
+def test_backoff(simulated):
+    s = simulated(run_time=1, exitcodes=[1, 1, 1])
+    s.add_job(target=job, period_in_seconds=100, job_name="j",
+              retry=RetryPolicy(max_retries=5, backoff=2, jitter=False))
+    report = s.simulate(50)
+    # each retry waits 2, 4, then 8 seconds after the failed attempt
+    assert s.executor.started == [0, 3, 8, 17]
+    assert report["fires"] == {"j": 1}
+    snapshot = s.metrics.snapshot()
+    assert snapshot["retries_total"] == {(("job", "j"),): 3}
+    assert snapshot["successes_total"] == {(("job", "j"),): 1}
+
+def test_limits(simulated):
+    s = simulated(run_time=1, exitcodes=repeat(1))
+    s.add_job(target=job, period_in_seconds=100, job_name="retries",
+              retry=RetryPolicy(max_retries=2, backoff=1, jitter=False))
+    s.add_job(target=job, period_in_seconds=100, job_name="elapsed",
+              retry=RetryPolicy(max_retries=10, backoff=1, jitter=False,
+                                max_elapsed=10))
+    s.add_job(target=job, period_in_seconds=100, job_name="other",
+              retry=RetryPolicy(retry_on=[2]))
+    # attempts start at 0, 2, 5, 10 (elapsed: the next would start at 19)
+    assert s.simulate(50)["runs"] == {"retries": 3, "elapsed": 4, "other": 1}
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from simple_scheduler.clock import VirtualClock
+from simple_scheduler.recurring import Recurring
+from simple_scheduler.simulation import SimulatedExecutor
+
+def job(): pass
+
+def test_virtual_clock():
+    clock, calls = VirtualClock(start=datetime(2026, 1, 1)), []
+    clock.call_at(5, lambda: calls.append(clock.monotonic()))
+    clock.call_at(2, lambda: calls.append(clock.monotonic()))
+    clock.advance(3)
+    assert (calls, clock.monotonic()) == ([2], 3)
+    clock.advance(10)
+    assert (calls, clock.monotonic()) == ([2, 5], 13)
+    assert clock.time() == datetime(2026, 1, 1).timestamp() + 13
+
+def test_report(simulated):
+    s = simulated(run_time=25)
+    s.add_job(target=job, period_in_seconds=10, job_name="j")
+    report = s.simulate(100)
+    assert (report["fires"], report["runs"]) == ({"j": 10}, {"j": 10})
+    # every run overlaps the previous one, at most 3 at once
+    assert report["overlaps"] == {"j": 9}
+    assert report["peak_concurrency"] == 3
+    assert report["peak_at"] == datetime(2026, 1, 1, 0, 0, 20).timestamp()
+    # carries on from where it stopped
+    assert s.simulate(100)["fires"] == {"j": 20}
+    assert s.clock.monotonic() == 200
+
+def test_day():
+    reports = []
+    for _ in range(2):
+        clock = VirtualClock(start=0)
+        s = Recurring(dispatcher=True, clock=clock, jitter=5, stagger=30,
+                      executor=SimulatedExecutor(clock, run_time=1))
+        for i in range(100):
+            s.add_job(target=job, period_in_seconds=60 * (1 + i % 7),
+                      job_name=f"job-{i}")
+        reports.append(s.simulate(86400))
+    # every period fires from 0 until the end of the day
+    assert sum(reports[0]["fires"].values()) == \
+           sum(-(-1440 // (1 + i % 7)) for i in range(100))
+    # jitter is random, the fires are not
+    assert reports[0]["fires"] == reports[1]["fires"]
+
+@pytest.mark.parametrize("settings, error", [(dict(), "dispatcher=True"),
+                                             (dict(dispatcher=True),
+                                              "VirtualClock")])
+def test_requires(settings, error):
+    with pytest.raises(Exception, match=error):
+        Recurring(**settings).simulate(1)
@@ -0,0 +1,64 @@
+import os
+import time
+import struct
+
+import pytest
+
+from simple_scheduler.recurring import Recurring
+from simple_scheduler.status import StatusBoard, _HEADER, _ROW
+
+@pytest.fixture
+def board():
+    board = StatusBoard(f"simple_scheduler_test_{os.getpid()}", slots=16)
+    yield board
+    board.close()
+
+def job(): time.sleep(5)
+
+def seq(board, job_name, value):
+    row, _ = board._find(job_name)
+    struct.pack_into("<I", board._memory.buf, _HEADER.size + row * _ROW.size,
+                     value)
+
+def test_runs(board):
+    board.register("j")
+    board.scheduled("j", 100.0)
+    board.started("j", 10.0, 4242)
+    board.started("j", 11.0, 4243)
+    board.finished("j", 12.0, 1)
+    row = board.read("j")
+    assert (row["state"], row["in_flight"], row["pid"]) == ("active", 1, 4243)
+    assert (row["runs"], row["failures"], row["failure_streak"]) == (1, 1, 1)
+    assert (row["last_exitcode"], row["next_fire"]) == (1, 100.0)
+    assert not row["torn"]
+    board.finished("j", 13.0, 0)
+    assert board.read("j")["failure_streak"] == 0
+    assert board.read("other") is None
+    reader = StatusBoard(board.name, create=False)
+    assert [row["name"] for row in reader.snapshot()] == ["j"]
+    reader.close()
+
+def test_torn_row(board):
+    board.register("j")
+    board.started("j", 10.0, 4242)
+    # its writer died half way through a write
+    seq(board, "j", 7)
+    started = time.monotonic()
+    assert board.read("j")["torn"]
+    assert time.monotonic() - started < 1
+    board.reset("j")
+    row = board.read("j")
+    assert not row["torn"]
+    assert (row["state"], row["in_flight"], row["pid"]) == ("removed", 0, 0)
+
+def test_remove_job_resets_row(board):
+    scheduler = Recurring(status=board)
+    scheduler.add_job(target=job, period_in_seconds=1, job_name="j")
+    scheduler.run()
+    try:
+        time.sleep(1.5)
+        assert board.read("j")["in_flight"] >= 1
+    finally:
+        scheduler.remove_job("j")
+    row = board.read("j")
+    assert (row["state"], row["in_flight"], row["torn"]) == ("removed", 0, False)
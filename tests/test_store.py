@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+
+from simple_scheduler.store import SQLiteJobStore
+
+def job(): pass
+
+@pytest.mark.parametrize("policy, runs", [("fire_once", 1),
+                                          ("fire_all", 10),
+                                          ("skip", 0)])
+def test_recovery(simulated, tmp_path, policy, runs):
+    path = str(tmp_path / "jobs.db")
+    s = simulated(store=SQLiteJobStore(path))
+    s.add_jobs([dict(target=job, period_in_seconds=10, job_name=f"job-{i}",
+                     misfire_policy=policy)
+                for i in range(3)])
+    assert s.simulate(25)["runs"] == {f"job-{i}": 3 for i in range(3)}
+    s.store.flush()
+    # restarted 100 seconds later (the fires at 30, 40, ... 120 are missed)
+    restarted = simulated(store=SQLiteJobStore(path),
+                          start=datetime(2026, 1, 1, 0, 2, 0))
+    report = restarted.simulate(0.5)
+    assert sorted(restarted._specs) == ["job-0", "job-1", "job-2"]
+    assert report["runs"] == {f"job-{i}": runs for i in range(3) if runs}
+
+def test_remove(simulated, tmp_path):
+    path = str(tmp_path / "jobs.db")
+    s = simulated(store=SQLiteJobStore(path))
+    s.add_job(target=job, period_in_seconds=10, job_name="kept")
+    s.add_job(target=job, period_in_seconds=10, job_name="removed")
+    s.remove_job("removed")
+    assert [job.name for job, _, _ in SQLiteJobStore(path).load("Recurring")] \
+           == ["kept"]
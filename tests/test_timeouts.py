@@ -0,0 +1,60 @@
+import time
+import signal
+
+from simple_scheduler.recurring import Recurring
+
+def job(): pass
+
+def sleeper(): time.sleep(30)
+
+def stubborn():
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    time.sleep(30)
+
+def wait_for(scheduler, metric, seconds=10):
+    deadline = time.monotonic() + seconds
+    while not scheduler.metrics.snapshot().get(metric):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return scheduler.metrics.snapshot()[metric]
+
+def test_timeout(simulated):
+    s = simulated(run_time=30)
+    s.add_job(target=job, period_in_seconds=60, job_name="j", timeout=5)
+    report = s.simulate(50)
+    assert report["runs"] == {"j": 1}
+    assert s.metrics.snapshot()["failures_total"] == \
+           {(("job", "j"), ("exitcode", "-15")): 1}
+    assert not s._workers and not s._timeouts
+
+def test_finished_before_timeout(simulated):
+    s = simulated(run_time=1)
+    s.add_job(target=job, period_in_seconds=2, job_name="j", timeout=60)
+    s.simulate(600)
+    assert "timeouts_total" not in s.metrics.snapshot()
+    # the timeout entries of finished runs do not pile up
+    assert len(s._heap) < 100
+
+def test_terminate_process():
+    s = Recurring(dispatcher=True)
+    s.add_job(target=sleeper, period_in_seconds=60, job_name="j", timeout=0.5)
+    started = time.monotonic()
+    s.run()
+    try:
+        assert wait_for(s, "failures_total") == \
+               {(("job", "j"), ("exitcode", "-15")): 1}
+        assert time.monotonic() - started < 5
+    finally:
+        s.clear()
+
+def test_kill_process():
+    s = Recurring(dispatcher=True)
+    s.kill_after = 0.5
+    s.add_job(target=stubborn, period_in_seconds=60, job_name="j",
+              timeout=0.5)
+    s.run()
+    try:
+        assert wait_for(s, "failures_total") == \
+               {(("job", "j"), ("exitcode", "-9")): 1}
+    finally:
+        s.clear()
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from simple_scheduler.cron import Cron, fire_epochs
+from simple_scheduler.event import Event
+from simple_scheduler.timezones import get_timezone, localize, to_epoch, \
+                                       to_local
+
+BERLIN = get_timezone("Europe/Berlin")
+
+def job(): pass
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+def test_get_timezone():
+    assert get_timezone("Europe/Berlin") is BERLIN
+    with pytest.raises(Exception):
+        get_timezone("Mars/Olympus_Mons")
+
+def test_to_epoch():
+    assert to_epoch(datetime(2026, 1, 1, 12), BERLIN) == utc(2026, 1, 1, 11)
+    # skipped by the gap: moved forward by an hour
+    assert to_epoch(datetime(2026, 3, 29, 2, 30), BERLIN) == \
+           utc(2026, 3, 29, 1, 30)
+    assert to_local(utc(2026, 3, 29, 1, 30), BERLIN) == \
+           datetime(2026, 3, 29, 3, 30)
+    # twice in the overlap: the first one
+    assert to_epoch(datetime(2026, 10, 25, 2, 30), BERLIN) == \
+           utc(2026, 10, 25, 0, 30)
+    assert localize(datetime(2026, 10, 25, 2, 30), BERLIN).utcoffset() == \
+           BERLIN.utcoffset(datetime(2026, 7, 1))
+
+def test_dst_gap():
+    # 2026-03-29 02:00 -> 03:00 in Berlin: 02:30 fires at 03:30 (once)
+    cron = Cron("0 30 2 * * *")
+    assert cron.next_epoch(utc(2026, 3, 28, 12), BERLIN) == utc(2026, 3, 29, 1, 30)
+    assert cron.next_epoch(utc(2026, 3, 29, 1, 30), BERLIN) == \
+           utc(2026, 3, 30, 0, 30)
+
+def test_dst_overlap():
+    # 2026-10-25 03:00 -> 02:00 in Berlin: 02:30 fires at its first
+    # occurrence only
+    cron = Cron("0 30 2 * * *")
+    assert cron.next_epoch(utc(2026, 10, 24, 12), BERLIN) == \
+           utc(2026, 10, 25, 0, 30)
+    assert cron.next_epoch(utc(2026, 10, 25, 0, 30), BERLIN) == \
+           utc(2026, 10, 26, 1, 30)
+
+def test_fire_epochs_across_dst():
+    crons = [Cron("0 30 2 * * *"), Cron("0 0 3 * * *")]
+    after = utc(2026, 3, 27)
+    epochs = fire_epochs(crons, after, BERLIN)
+    expected, at = [], after
+    for _ in range(200):
+        at = min(cron.next_epoch(at, BERLIN) for cron in crons)
+        expected.append(at)
+    assert [next(epochs) for _ in range(200)] == expected
+
+def test_event_across_dst(simulated):
+    s = simulated(kind=Event, start=datetime(2026, 3, 27, 12,
+                                             tzinfo=timezone.utc))
+    s.add_job(target=job, when=["*|02:30"], tz="Europe/Berlin", job_name="j")
+    s.simulate(4 * 86400)
+    first, gap, after = s.executor.started[:3]
+    # 02:30 CET, 03:30 CEST (02:30 does not exist), 02:30 CEST
+    assert (gap - first, after - gap) == (24 * 3600, 23 * 3600)
@@ -0,0 +1,39 @@
+import pytest
+
+from simple_scheduler.event import Event
+
+def job(): pass
+
+@pytest.mark.parametrize("policy, runs", [("fire_once", 2),
+                                          ("fire_all", 5),
+                                          ("skip", 1)])
+def test_misfire_policy(simulated, policy, runs):
+    s = simulated()
+    s.add_job(target=job, period_in_seconds=10, job_name="j",
+              misfire_policy=policy)
+    s.simulate(5)
+    # the host is suspended: the fires at 10, 20, 30 and 40 are missed
+    s.clock.advance(35)
+    assert s.simulate(1)["runs"] == {"j": runs}
+
+@pytest.mark.parametrize("period", [0, -1, "10", None])
+def test_period(simulated, period):
+    s = simulated()
+    with pytest.raises(Exception):
+        s.add_job(target=job, period_in_seconds=period, job_name="j")
+    s.add_job(target=job, period_in_seconds=0.5, job_name="j")
+    with pytest.raises(Exception, match="positive"):
+        s.modify_job("j", period_in_seconds=period)
+    assert s.simulate(2)["runs"] == {"j": 4}
+
+@pytest.mark.parametrize("policy, runs", [("fire_once", 2),
+                                          ("fire_all", 4),
+                                          ("skip", 1)])
+def test_wall_clock_jump(simulated, policy, runs):
+    s = simulated(kind=Event)
+    s.add_job(target=job, when=["0 0 * * * *"], job_name="j",
+              misfire_policy=policy)
+    s.simulate(600)
+    # the host is suspended for 3 hours: the monotonic clock stands still
+    s.clock.start += 3 * 3600
+    assert s.simulate(s.wall_clock_check)["runs"] == {"j": runs}